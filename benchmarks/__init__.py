@@ -0,0 +1,6 @@
+"""
+Benchmarks of the library itself, run against FakeDockerDaemon and
+MockTritonServer so that they need neither docker nor tritonserver image.
+
+    python -m benchmarks.run --store benchmarks.sqlite
+"""
@@ -0,0 +1,354 @@
+"""
+This module contains the class FakeDockerDaemon, in-process stand-in for the
+subset of Docker Engine API used by ImageBuilder and TritonContainer, so that
+library overhead can be measured without docker, network or GPU.
+
+Containers are never run: published port 8000 of any container is mapped to
+given backend, e.g. MockTritonServer, other ports to unused host ports.
+"""
+import io
+import os
+import re
+import json
+import socket
+import hashlib
+import tarfile
+import itertools
+import threading
+import contextlib
+from unittest import mock
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+API_VERSION = "1.43"
+
+
+@dataclass
+class _Response:
+    status: int = 200
+    body: bytes = b""
+    headers: dict = field(default_factory=dict)
+
+
+def _json_response(payload, status: int = 200) -> _Response:
+    return _Response(status, json.dumps(payload).encode("utf-8"), {"Content-Type": "application/json"})
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("", 0))
+        return sock.getsockname()[1]
+
+
+class FakeDockerDaemon:
+    """
+    Serve Docker Engine API on `tcp://host:port`, point docker clients to it
+    with `DOCKER_HOST` (see `environment`) or `activate` in-process.
+
+    Example:
+        with MockTritonServer() as triton, FakeDockerDaemon(port_targets={8000: triton.port}) as daemon:
+            with daemon.activate():
+                TritonContainer(with_gpus=False).start()
+    """
+
+    _ROUTES: list[tuple[str, re.Pattern, str]] = [
+        ("GET", re.compile(r"^/_ping$"), "_ping"),
+        ("HEAD", re.compile(r"^/_ping$"), "_ping"),
+        ("GET", re.compile(r"^/version$"), "_version"),
+        ("GET", re.compile(r"^/info$"), "_info"),
+        ("POST", re.compile(r"^/build$"), "_build"),
+        ("POST", re.compile(r"^/images/create$"), "_pull"),
+        ("GET", re.compile(r"^/images/(?P<name>.+)/json$"), "_image_inspect"),
+        ("GET", re.compile(r"^/images/(?P<name>.+)/history$"), "_image_history"),
+        ("DELETE", re.compile(r"^/images/(?P<name>.+)$"), "_image_remove"),
+        ("GET", re.compile(r"^/containers/json$"), "_container_list"),
+        ("POST", re.compile(r"^/containers/create$"), "_container_create"),
+        ("GET", re.compile(r"^/containers/(?P<id>[^/]+)/json$"), "_container_inspect"),
+        ("POST", re.compile(r"^/containers/(?P<id>[^/]+)/(?P<action>start|stop|kill|restart)$"), "_container_action"),
+        ("POST", re.compile(r"^/containers/(?P<id>[^/]+)/wait$"), "_container_wait"),
+        ("GET", re.compile(r"^/containers/(?P<id>[^/]+)/logs$"), "_container_logs"),
+        ("DELETE", re.compile(r"^/containers/(?P<id>[^/]+)$"), "_container_remove"),
+    ]
+
+    def __init__(
+            self,
+            host: str = "127.0.0.1",
+            port: int = 0,
+            port_targets: dict[int, int] | None = None,
+            images: list[str] | None = None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.port_targets = port_targets or {}
+        self.containers: dict[str, dict] = {}
+        self.images: dict[str, dict] = {}
+        # bytes of build context received by each build
+        self.context_sizes: list[int] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+        # images that are "pulled" already, others are pulled on first use
+        for tag in images or []:
+            self._add_image(tag)
+
+    def start(self) -> "FakeDockerDaemon":
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-docker", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "FakeDockerDaemon":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        return f"tcp://{self.host}:{self.port}"
+
+    @property
+    def environment(self) -> dict[str, str]:
+        """Environment variables that point docker clients and testcontainers to the daemon"""
+        return {"DOCKER_HOST": self.url, "TESTCONTAINERS_RYUK_DISABLED": "true"}
+
+    @contextlib.contextmanager
+    def activate(self):
+        """Point docker clients created within `with` block, including shared one, to the daemon"""
+        from testcontainers.core.config import testcontainers_config
+        from triton_testcontainer.docker_session import set_docker_client
+
+        ryuk_disabled = testcontainers_config.ryuk_disabled
+        set_docker_client(None)
+        try:
+            with mock.patch.dict(os.environ, self.environment):
+                testcontainers_config.ryuk_disabled = True
+                yield self
+        finally:
+            testcontainers_config.ryuk_disabled = ryuk_disabled
+            set_docker_client(None)
+
+    # Request handling
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # headers and body are separate writes, Nagle would hold body until delayed ACK
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_HEAD(self):
+                self._dispatch("HEAD")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def do_DELETE(self):
+                self._dispatch("DELETE")
+
+            def _read_body(self) -> bytes:
+                if self.headers.get("Transfer-Encoding", "").lower() != "chunked":
+                    return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+                chunks = []
+                while True:
+                    size = int(self.rfile.readline().split(b";", 1)[0], 16)
+                    if size == 0:
+                        self.rfile.readline()
+                        return b"".join(chunks)
+                    chunks.append(self.rfile.read(size))
+                    self.rfile.readline()
+
+            def _dispatch(self, method: str):
+                body = self._read_body()
+                url = urlsplit(self.path)
+                path = re.sub(r"^/v\d+\.\d+", "", url.path)
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                response = server._handle(method, path, query, body)
+
+                self.send_response(response.status)
+                for key, value in response.headers.items():
+                    self.send_header(key, str(value))
+                self.send_header("Api-Version", API_VERSION)
+                self.send_header("Content-Length", str(len(response.body)))
+                self.end_headers()
+                if method != "HEAD":
+                    self.wfile.write(response.body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _handle(self, method: str, path: str, query: dict, body: bytes) -> _Response:
+        for route_method, pattern, handler in self._ROUTES:
+            match = pattern.match(path)
+            if match and route_method == method:
+                try:
+                    return getattr(self, handler)(query=query, body=body, **match.groupdict())
+                except KeyError as error:
+                    # docker-py picks exception class (e.g. ImageNotFound) by message
+                    return _json_response({"message": error.args[0]}, 404)
+
+        return _json_response({"message": f"page not found: {method} {path}"}, 404)
+
+    def _new_id(self, seed: str) -> str:
+        return hashlib.sha256(f"{seed}-{next(self._ids)}".encode()).hexdigest()
+
+    def _ping(self, **kwargs) -> _Response:
+        return _Response(200, b"OK", {"Content-Type": "text/plain"})
+
+    def _version(self, **kwargs) -> _Response:
+        return _json_response({
+            "Version": "24.0.0", "ApiVersion": API_VERSION, "MinAPIVersion": "1.12", "Os": "linux", "Arch": "amd64",
+        })
+
+    def _info(self, **kwargs) -> _Response:
+        return _json_response({"ID": "fake", "Containers": len(self.containers), "Images": len(self.images),
+                               "OperatingSystem": "fake", "ServerVersion": "24.0.0"})
+
+    # Images
+
+    def _add_image(self, tag: str) -> dict:
+        image_id = f"sha256:{self._new_id(tag)}"
+        image = {"Id": image_id, "RepoTags": [tag], "Size": 0, "Config": {}}
+        with self._lock:
+            self.images[image_id] = image
+            self.images[tag] = image
+        return image
+
+    def _find_image(self, name: str) -> dict:
+        with self._lock:
+            if name in self.images:
+                return self.images[name]
+            if ":" not in name.rsplit("/", 1)[-1] and f"{name}:latest" in self.images:
+                return self.images[f"{name}:latest"]
+            matches = [image for key, image in self.images.items() if key.startswith(f"sha256:{name}")]
+        if not matches:
+            raise KeyError(f"No such image: {name}")
+        return matches[0]
+
+    def _build(self, query: dict, body: bytes, **kwargs) -> _Response:
+        self.context_sizes.append(len(body))
+        dockerfile = query.get("dockerfile", "Dockerfile")
+        with tarfile.open(fileobj=io.BytesIO(body), mode="r:*") as context:
+            steps = context.extractfile(dockerfile).read().decode("utf-8").splitlines()
+
+        image = self._add_image(query.get("t", "fake:latest"))
+        events = [{"stream": f"{step}\n"} for step in steps if step and not step.startswith("#")]
+        events.append({"aux": {"ID": image["Id"]}})
+        events.append({"stream": f"Successfully built {image['Id'][len('sha256:'):][:12]}\n"})
+        payload = "".join(json.dumps(event) + "\r\n" for event in events).encode("utf-8")
+        return _Response(200, payload, {"Content-Type": "application/json"})
+
+    def _pull(self, query: dict, **kwargs) -> _Response:
+        tag = f"{query.get('fromImage')}:{query.get('tag') or 'latest'}"
+        self._add_image(tag)
+        return _Response(200, json.dumps({"status": f"Pulled {tag}"}).encode("utf-8"),
+                         {"Content-Type": "application/json"})
+
+    def _image_inspect(self, name: str, **kwargs) -> _Response:
+        return _json_response(self._find_image(name))
+
+    def _image_history(self, name: str, **kwargs) -> _Response:
+        image = self._find_image(name)
+        return _json_response([{"Id": image["Id"], "CreatedBy": "", "Size": 0, "Tags": image["RepoTags"]}])
+
+    def _image_remove(self, name: str, **kwargs) -> _Response:
+        image = self._find_image(name)
+        with self._lock:
+            for key in [key for key, value in self.images.items() if value is image]:
+                del self.images[key]
+        return _json_response([{"Untagged": tag} for tag in image["RepoTags"]] + [{"Deleted": image["Id"]}])
+
+    # Containers
+
+    def _container_create(self, query: dict, body: bytes, **kwargs) -> _Response:
+        config = json.loads(body or b"{}")
+        container_id = self._new_id(query.get("name", "container"))
+        host_config = config.get("HostConfig") or {}
+
+        ports = {}
+        for port in {**(config.get("ExposedPorts") or {}), **(host_config.get("PortBindings") or {})}:
+            container_port = int(port.split("/")[0])
+            host_port = self.port_targets.get(container_port) or _free_port()
+            ports[port] = [{"HostIp": "0.0.0.0", "HostPort": str(host_port)}]
+
+        container = {
+            "Id": container_id,
+            "Name": f"/{query.get('name', container_id[:12])}",
+            "Image": config.get("Image", ""),
+            "Config": config,
+            "HostConfig": {"NetworkMode": host_config.get("NetworkMode", "default")},
+            "State": {"Status": "created", "Running": False, "ExitCode": 0},
+            # gateway and bridge addresses resolve to daemon host too, for clients running inside container
+            "NetworkSettings": {"Ports": ports, "Networks": {"bridge": {"IPAddress": self.host, "Gateway": self.host}}},
+        }
+        with self._lock:
+            self.containers[container_id] = container
+        return _json_response({"Id": container_id, "Warnings": []}, 201)
+
+    def _find_container(self, container_id: str) -> dict:
+        with self._lock:
+            if container_id in self.containers:
+                return self.containers[container_id]
+            matches = [container for key, container in self.containers.items()
+                       if key.startswith(container_id) or container["Name"] == f"/{container_id}"]
+        if not matches:
+            raise KeyError(f"No such container: {container_id}")
+        return matches[0]
+
+    def _container_inspect(self, id: str, **kwargs) -> _Response:
+        return _json_response(self._find_container(id))
+
+    def _container_list(self, query: dict, **kwargs) -> _Response:
+        filters = json.loads(query.get("filters", "{}"))
+        wanted = filters.get("id", [])
+        with self._lock:
+            containers = [c for c in self.containers.values() if not wanted or any(c["Id"].startswith(w) for w in wanted)]
+        return _json_response([
+            {"Id": c["Id"], "Names": [c["Name"]], "Image": c["Image"], "State": c["State"]["Status"],
+             "HostConfig": c["HostConfig"], "NetworkSettings": c["NetworkSettings"]}
+            for c in containers
+        ])
+
+    def _container_action(self, id: str, action: str, **kwargs) -> _Response:
+        container = self._find_container(id)
+        running = action in ("start", "restart")
+        container["State"].update(Status="running" if running else "exited", Running=running)
+        return _Response(204)
+
+    def _container_wait(self, id: str, **kwargs) -> _Response:
+        self._find_container(id)
+        return _json_response({"StatusCode": 0})
+
+    def _container_logs(self, id: str, **kwargs) -> _Response:
+        self._find_container(id)
+        return _Response(200, b"", {"Content-Type": "application/vnd.docker.raw-stream"})
+
+    def _container_remove(self, id: str, **kwargs) -> _Response:
+        container = self._find_container(id)
+        with self._lock:
+            del self.containers[container["Id"]]
+        return _Response(204)
@@ -0,0 +1,206 @@
+"""
+Run library benchmarks and record them in ResultStore:
+
+* `TritonCommand` and `DockerfileBuilder` build throughput, a fresh builder per iteration,
+* `ImageBuilder.build` latency including packing and upload of build context,
+* `TritonContainer.start` / `stop` latency and docker API round trips.
+
+Latencies are seconds per operation. For `api calls` entries each sample is
+single docker API call of one start or stop, so `count` is number of round
+trips. Results are compared with baseline when it is set:
+
+    python -m benchmarks.run --store benchmarks.sqlite --set-baseline default
+    python -m benchmarks.run --store benchmarks.sqlite --check
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+from typing import Callable
+
+import numpy as np
+
+from triton_testcontainer.results import ResultStore, BenchmarkKey, BenchmarkResult, METRICS
+
+from .fake_docker import FakeDockerDaemon
+
+# runs are keyed by benchmark name (command) and its parameters (model)
+BENCHMARK_IMAGE = "triton-testcontainer"
+TRITON_IMAGE = "nvcr.io/nvidia/tritonserver:24.01-py3"
+
+
+def _timed(operation: Callable[[], object], iterations: int) -> tuple[np.ndarray, float]:
+    latencies = np.empty(iterations, dtype=np.float64)
+    started = time.perf_counter()
+    for index in range(iterations):
+        operation_started = time.perf_counter()
+        operation()
+        latencies[index] = time.perf_counter() - operation_started
+    return latencies, time.perf_counter() - started
+
+
+def bench_triton_command(iterations: int) -> tuple[np.ndarray, float]:
+    """Validation and build of new command, as done for each TritonContainer"""
+    from triton_testcontainer.command import TritonCommand, TraceConfig
+
+    def build() -> str:
+        return TritonCommand(
+            model_repository=["/models"],
+            model_control_mode="explicit",
+            load_model=["simple", "ensemble"],
+            strict_readiness=True,
+            log_verbose=1,
+            trace_config=TraceConfig(level=["TIMESTAMPS", "TENSORS"], rate=100, file="/tmp/trace.json"),
+        ).build()
+
+    return _timed(build, iterations)
+
+
+def bench_dockerfile_builder(iterations: int) -> tuple[np.ndarray, float]:
+    from triton_testcontainer.dockerfile_builder import DockerfileBuilder
+
+    def build() -> str:
+        return (DockerfileBuilder()
+                .from_(TRITON_IMAGE, as_name="full")
+                .from_(f"{TRITON_IMAGE}-min")
+                .env(key="DEBIAN_FRONTEND", value="noninteractive")
+                .run(user_directive="apt-get update && apt-get install -y curl && rm -rf /var/lib/apt/lists/*")
+                .copy(src="/opt/tritonserver", dest="/opt/tritonserver", from_="full")
+                .workdir("/opt/tritonserver")
+                .build())
+
+    return _timed(build, iterations)
+
+
+def bench_image_builder(iterations: int, files: int, file_size: int) -> tuple[np.ndarray, float]:
+    from triton_testcontainer.dockerfile_builder import DockerfileBuilder
+    from triton_testcontainer.image_builder import ImageBuilder
+
+    dockerfile = DockerfileBuilder().from_("ubuntu:22.04").copy(src=".", dest="/context").build()
+
+    with tempfile.TemporaryDirectory() as context:
+        for index in range(files):
+            with open(os.path.join(context, f"file-{index}.bin"), "wb") as file:
+                file.write(os.urandom(file_size))
+
+        # docker-py sends only dockerfile as context when it is given as string, so it is written to context
+        with open(os.path.join(context, "Dockerfile"), "w", encoding="utf-8") as file:
+            file.write(dockerfile)
+
+        builder = ImageBuilder(tag="localhost/benchmark:latest").from_path(context, "Dockerfile")
+
+        def build() -> None:
+            builder.build()
+            builder.remove()
+
+        return _timed(build, iterations)
+
+
+def bench_container(iterations: int) -> dict[str, tuple[np.ndarray, float]]:
+    """Latencies of start and stop, and per call latencies of docker API calls of the last start and stop"""
+    from triton_testcontainer.triton import TritonContainer
+    from triton_testcontainer.docker_session import api_stats
+
+    start_latencies, stop_latencies = np.empty(iterations), np.empty(iterations)
+    api_calls: dict[str, tuple[np.ndarray, float]] = {}
+
+    for index in range(iterations):
+        container = TritonContainer(with_gpus=False)
+
+        api_stats.reset()
+        started = time.perf_counter()
+        container.start()
+        start_latencies[index] = time.perf_counter() - started
+        api_calls["TritonContainer.start api calls"] = _api_call_latencies(api_stats, start_latencies[index])
+
+        api_stats.reset()
+        started = time.perf_counter()
+        container.stop()
+        stop_latencies[index] = time.perf_counter() - started
+        api_calls["TritonContainer.stop api calls"] = _api_call_latencies(api_stats, stop_latencies[index])
+
+    return {
+        "TritonContainer.start": (start_latencies, float(start_latencies.sum())),
+        "TritonContainer.stop": (stop_latencies, float(stop_latencies.sum())),
+        **api_calls,
+    }
+
+
+def _api_call_latencies(stats, duration: float) -> tuple[np.ndarray, float]:
+    return np.array(stats.latencies(), dtype=np.float64), duration
+
+
+def run(iterations: int = 1000, container_iterations: int = 20) -> dict[BenchmarkKey, BenchmarkResult]:
+    from triton_testcontainer.mock_server import MockTritonServer
+
+    measurements: dict[tuple[str, str], tuple[np.ndarray, float]] = {
+        ("TritonCommand.build", "-"): bench_triton_command(iterations),
+        ("DockerfileBuilder.build", "-"): bench_dockerfile_builder(iterations),
+    }
+
+    with (MockTritonServer() as triton,
+          FakeDockerDaemon(port_targets={8000: triton.port}, images=[TRITON_IMAGE]) as daemon,
+          daemon.activate()):
+        for files, file_size in ((1, 1024), (100, 64 * 1024)):
+            parameters = f"context={files}x{file_size // 1024}KB"
+            measurements[("ImageBuilder.build", parameters)] = bench_image_builder(
+                max(1, container_iterations), files, file_size
+            )
+
+        for name, measurement in bench_container(container_iterations).items():
+            measurements[(name, "-")] = measurement
+
+    results = {}
+    for (name, parameters), (latencies, duration) in measurements.items():
+        key = BenchmarkKey(image=BENCHMARK_IMAGE, command=name, model=parameters)
+        results[key] = BenchmarkResult.from_latencies(key, latencies, duration)
+    return results
+
+
+def report(store: ResultStore, results: dict[BenchmarkKey, BenchmarkResult], baseline: str) -> bool:
+    """Print results with comparison against baseline, returns False on regression"""
+    ok = True
+    for key, result in results.items():
+        print(f"{key.command} [{key.model}]: {result.throughput:,.0f} op/s, count {result.count}, "
+              f"p50 {result.p50 * 1000:.3f} ms, p99 {result.p99 * 1000:.3f} ms")
+
+        base = store.baseline(key, baseline)
+        if base is not None and key.command.endswith("api calls") and result.count > base.count:
+            print(f"  round trips: {result.count} vs baseline {base.count} REGRESSION")
+            ok = False
+
+        for comparison in store.compare(key, {metric: getattr(result, metric) for metric in METRICS},
+                                        baseline=baseline):
+            if comparison.regressed:
+                print(f"  {comparison}")
+                ok = False
+    return ok
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks of triton-testcontainer against fake docker daemon")
+    parser.add_argument("--store", default="benchmarks.sqlite", help="SQLite file of ResultStore")
+    parser.add_argument("--iterations", type=int, default=1000, help="iterations of builder benchmarks")
+    parser.add_argument("--container-iterations", type=int, default=20,
+                        help="iterations of ImageBuilder and TritonContainer benchmarks")
+    parser.add_argument("--baseline", default="default", help="baseline to compare with")
+    parser.add_argument("--set-baseline", metavar="NAME", help="make this run baseline NAME")
+    parser.add_argument("--check", action="store_true", help="exit with non-zero code on regression")
+    arguments = parser.parse_args(argv)
+
+    results = run(arguments.iterations, arguments.container_iterations)
+
+    with ResultStore(arguments.store) as store:
+        for result in results.values():
+            store.record(result)
+        ok = report(store, results, arguments.baseline)
+        if arguments.set_baseline:
+            for result in results.values():
+                store.set_baseline(result.run_id, arguments.set_baseline)
+
+    return 0 if ok or not arguments.check else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+import pytest
+
+from triton_testcontainer.mock_server import MockTritonServer
+
+pytest_plugins = ["pytester", "triton_testcontainer.pytest_plugin"]
+
+
+@pytest.fixture(scope="session")
+def mock_server():
+    """
+    Factory of MockTritonServer with models of the same tensors, `models` maps
+    model name to other arguments of `add_model`, e.g. {"simple": {"loaded": False}}.
+    Models copy inputs to outputs unless `fn` is given.
+    """
+    def make(
+            models: dict[str, dict],
+            fn=None,
+            inputs: tuple[str, ...] = ("INPUT",),
+            outputs: tuple[str, ...] = ("OUTPUT",),
+            datatype: str = "FP32",
+            shape: tuple[int, ...] = (4,),
+            unload_delay: float = 0.0,
+    ) -> MockTritonServer:
+        def identity(arrays):
+            return {output: arrays[name] for name, output in zip(inputs, outputs)}
+
+        def specs(names):
+            return [{"name": name, "datatype": datatype, "shape": list(shape)} for name in names]
+
+        server = MockTritonServer(unload_delay=unload_delay)
+        for name, options in models.items():
+            server.add_model(name, fn or identity, inputs=specs(inputs), outputs=specs(outputs), **options)
+        return server
+
+    return make
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from triton_testcontainer.batch import infer_batched
+
+
+def simple(inputs):
+    return {"OUTPUT0": inputs["INPUT0"] + inputs["INPUT1"], "OUTPUT1": inputs["INPUT0"] - inputs["INPUT1"]}
+
+
+@pytest.fixture
+def server(mock_server):
+    return mock_server({"simple": {"max_batch_size": 8}, "single": {"max_batch_size": 0}}, fn=simple,
+                       inputs=("INPUT0", "INPUT1"), outputs=("OUTPUT0", "OUTPUT1"), datatype="INT32", shape=(16,))
+
+
+@pytest.mark.parametrize("model_name, batch_size, requests", [("simple", None, 13), ("simple", 5, 20), ("single", None, 100)])
+def test_infer_batched(server, model_name, batch_size, requests):
+    input0 = np.arange(100 * 16, dtype=np.int64).reshape(100, 16)
+    input1 = np.ones([100, 16], dtype=np.int32)
+
+    with server as triton:
+        triton_client = triton.get_client(concurrency=4)
+        results = infer_batched(triton_client, model_name, {"INPUT0": input0, "INPUT1": input1},
+                                batch_size=batch_size, max_in_flight=4)
+
+        stats = triton_client.get_inference_statistics(model_name)["model_stats"][0]
+        assert stats["inference_count"] == 100
+        assert stats["execution_count"] == requests
+
+    assert results["OUTPUT0"].dtype == np.int32
+    np.testing.assert_array_equal(results["OUTPUT0"], input0 + 1)
+    np.testing.assert_array_equal(results["OUTPUT1"], input0 - 1)
+
+
+def test_infer_batched_errors(server):
+    with server as triton:
+        triton_client = triton.get_client()
+        with pytest.raises(ValueError):
+            infer_batched(triton_client, "simple", {"INPUT0": np.ones([4, 16]), "INPUT1": np.ones([3, 16])})
+        with pytest.raises(ValueError):
+            infer_batched(triton_client, "simple", {"INPUT2": np.ones([4, 16])})
+        with pytest.raises(ValueError, match="INPUT0 of int64"):
+            infer_batched(triton_client, "simple", {"INPUT0": np.full([4, 16], 2 ** 40), "INPUT1": np.ones([4, 16])})
+        with pytest.raises(ValueError, match="INPUT1 of float64"):
+            infer_batched(triton_client, "simple", {"INPUT0": np.ones([4, 16]), "INPUT1": np.full([4, 16], 0.5)})
+
+
+def test_infer_batched_empty(server):
+    with server as triton:
+        results = infer_batched(triton.get_client(), "simple",
+                                {"INPUT0": np.ones([0, 16], dtype=np.int32), "INPUT1": np.ones([0, 16], dtype=np.int32)})
+
+    assert {name: (array.shape, array.dtype) for name, array in results.items()} == {
+        "OUTPUT0": ((0, 16), np.int32), "OUTPUT1": ((0, 16), np.int32),
+    }
@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+
+from benchmarks.fake_docker import FakeDockerDaemon
+from benchmarks.run import run, report, TRITON_IMAGE
+from triton_testcontainer.docker_session import api_stats
+from triton_testcontainer.mock_server import MockTritonServer
+from triton_testcontainer.results import ResultStore, BenchmarkKey, BenchmarkResult
+
+
+def test_fake_docker_daemon():
+    with (MockTritonServer() as triton,
+          FakeDockerDaemon(port_targets={8000: triton.port}, images=[TRITON_IMAGE]) as daemon,
+          daemon.activate()):
+        from triton_testcontainer.triton import TritonContainer
+
+        assert os.environ["DOCKER_HOST"] == daemon.url
+        api_stats.reset()
+
+        container = TritonContainer(with_gpus=False).start()
+        assert container.get_client().is_server_ready()
+        assert len(daemon.containers) == 1
+        assert api_stats.calls["POST /containers/create"] == 1
+
+        container.stop()
+        assert daemon.containers == {}
+        assert api_stats.calls["DELETE /containers/{id}"] == 1
+
+    assert os.environ.get("DOCKER_HOST") != daemon.url
+
+
+def test_run(tmp_path):
+    results = run(iterations=10, container_iterations=2)
+    commands = {key.command for key in results}
+
+    assert {"TritonCommand.build", "DockerfileBuilder.build", "ImageBuilder.build",
+            "TritonContainer.start", "TritonContainer.stop", "TritonContainer.start api calls"} <= commands
+    assert all(result.count > 0 and result.p50 > 0 for result in results.values())
+
+    with ResultStore(str(tmp_path / "benchmarks.sqlite")) as store:
+        for result in results.values():
+            store.record(result)
+            store.set_baseline(result.run_id)
+        assert report(store, results, "default")
+
+
+def test_report_regression(tmp_path):
+    key = BenchmarkKey(image="triton-testcontainer", command="TritonCommand.build", model="-")
+
+    with ResultStore(str(tmp_path / "benchmarks.sqlite")) as store:
+        for _ in range(3):
+            run_id = store.record(BenchmarkResult.from_latencies(key, np.full(10, 0.010), duration=0.1))
+        store.set_baseline(run_id)
+
+        # main records results before they are reported
+        result = BenchmarkResult.from_latencies(key, np.full(10, 0.030), duration=0.3)
+        store.record(result)
+
+        assert not report(store, {key: result}, "default")
@@ -0,0 +1,156 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import numpy as np
+import tritonclient.http as tritonhttpclient
+
+from triton_testcontainer.client import LazyLoadingClient, ModelLoader
+from triton_testcontainer.mock_server import MockTritonServer
+
+
+class SlowLoadingClient:
+    def __init__(self, loads: list[str]):
+        self.loads = loads
+        self.ready: set[str] = set()
+
+    def is_model_ready(self, model_name):
+        return model_name in self.ready
+
+    def load_model(self, model_name):
+        time.sleep(0.05)
+        self.loads.append(model_name)
+        self.ready.add(model_name)
+
+    def infer(self, model_name, *args, **kwargs):
+        assert model_name in self.ready
+        return model_name
+
+
+def test_concurrent_first_requests_load_once():
+    loads: list[str] = []
+    server_state = SlowLoadingClient(loads)
+    loader = ModelLoader()
+    barrier = threading.Barrier(8)
+
+    def first_request(_):
+        client = LazyLoadingClient(server_state, loader)
+        barrier.wait()
+        return client.infer("simple")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(first_request, range(8))) == ["simple"] * 8
+
+    assert loads == ["simple"]
+
+
+class MemoryClient:
+    footprints = {"a": 100, "b": 100, "c": 120, "d": 10}
+
+    def __init__(self):
+        self.memory = 0
+        self.ready: set[str] = set()
+        self.unloaded: list[str] = []
+
+    def is_model_ready(self, model_name):
+        return model_name in self.ready
+
+    def load_model(self, model_name):
+        self.memory += self.footprints[model_name]
+        self.ready.add(model_name)
+
+    def unload_model(self, model_name):
+        self.memory -= self.footprints[model_name]
+        self.ready.discard(model_name)
+        self.unloaded.append(model_name)
+
+    def infer(self, model_name, *args, **kwargs):
+        assert model_name in self.ready
+
+    def async_infer(self, model_name, *args, **kwargs):
+        assert model_name in self.ready
+        request = Mock()
+        request.get_result.side_effect = lambda: self.infer(model_name)
+        return request
+
+
+def test_memory_budget_eviction():
+    server_state = MemoryClient()
+    loader = ModelLoader(memory_budget=250, memory_probe=lambda: server_state.memory)
+    client = LazyLoadingClient(server_state, loader)
+
+    client.infer("a")
+    client.infer("b")
+    client.infer("a")  # "b" becomes least recently used
+
+    assert loader.footprints == {"a": 100, "b": 100}
+
+    client.infer("c")  # estimated 100 bytes, doesn't fit with both
+
+    assert server_state.unloaded == ["b"]
+    assert list(loader.loaded) == ["a", "c"]
+    assert loader.memory_used == 220
+
+    client.infer("d")  # estimated as average footprint, evicts "a"
+
+    assert server_state.unloaded == ["b", "a"]
+    assert server_state.memory <= 250
+
+
+def test_memory_budget_skips_models_in_use():
+    server_state = MemoryClient()
+    loader = ModelLoader(memory_budget=250, memory_probe=lambda: server_state.memory)
+    client = LazyLoadingClient(server_state, loader)
+
+    request = client.async_infer("a")
+    client.infer("b")  # "a" is least recently used, but its request is in flight
+
+    client.infer("c")
+
+    assert server_state.unloaded == ["b"]
+    assert loader.in_use == {"a": 1}
+
+    request.get_result()
+    client.infer("d")
+
+    assert server_state.unloaded == ["b", "a"]
+    assert not loader.in_use
+
+
+def test_memory_budget_preloaded_models():
+    server_state = MemoryClient()
+    server_state.load_model("d")  # loaded on startup
+    loader = ModelLoader(memory_budget=250, memory_probe=lambda: server_state.memory)
+    client = LazyLoadingClient(server_state, loader)
+
+    for model_name in ("d", "a", "b", "c", "d"):
+        client.infer(model_name)
+
+    assert loader.preloaded == {"d"}
+    assert server_state.unloaded == ["a"]
+    assert list(loader.loaded) == ["b", "c"]
+
+
+def test_lazy_loading_mock_server():
+    spec = {"name": "INPUT0", "datatype": "FP32", "shape": [4]}
+    server = MockTritonServer().add_model(
+        "identity", lambda inputs: {"OUTPUT0": inputs["INPUT0"]},
+        inputs=[spec], outputs=[{**spec, "name": "OUTPUT0"}], max_batch_size=8, loaded=False,
+    )
+
+    with server as triton:
+        triton_client = triton.get_client(lazy_loading=True)
+
+        infer_input = tritonhttpclient.InferInput("INPUT0", [1, 4], "FP32")
+        infer_input.set_data_from_numpy(np.ones([1, 4], dtype=np.float32))
+
+        assert not triton_client.is_model_ready("identity")
+        result = triton_client.infer("identity", [infer_input])
+
+        np.testing.assert_array_equal(result.as_numpy("OUTPUT0"), np.ones([1, 4], dtype=np.float32))
+        assert list(triton.model_loader.loaded) == ["identity"]
+
+        triton_client.unload_model("identity")
+        assert not triton.model_loader.loaded
+        assert not triton_client.is_model_ready("identity")
@@ -1,6 +1,6 @@
 import re
 
-from triton_testcontainer.command import TritonCommand
+from triton_testcontainer.command import TritonCommand, TraceConfig
 
 def test_command_correct():
     cmd = TritonCommand(
@@ -78,3 +78,29 @@ def test_triton_command():
     print(cmd.build())
     
 
+def test_ports():
+    cmd = TritonCommand(http_port=9000, grpc_port=9001, metrics_port=9002).build()
+
+    assert cmd.endswith("--http-port=9000 --grpc-port=9001 --metrics-port=9002")
+
+
+def test_build_is_repeatable():
+    cmd = TritonCommand(model_repository=["/models"], load_model=["a", "b"])
+
+    assert cmd.build() == cmd.build() == (
+        "tritonserver --model-repository=/models --model-control-mode=none --load-model=a --load-model=b"
+    )
+
+
+def test_trace_config():
+    cmd = TritonCommand(
+        trace_config=TraceConfig(mode="triton", level=["TIMESTAMPS", "TENSORS"], rate=100, count=-1,
+                                 file="/tmp/trace.json", log_frequency=50),
+    ).build()
+
+    assert cmd.endswith(
+        "--trace-config mode=triton --trace-config level=TIMESTAMPS --trace-config level=TENSORS "
+        "--trace-config rate=100 --trace-config count=-1 "
+        "--trace-config triton,file=/tmp/trace.json --trace-config triton,log-frequency=50"
+    )
+    assert "--trace-config" not in TritonCommand(trace_config=TraceConfig()).build()
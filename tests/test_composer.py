@@ -0,0 +1,37 @@
+import pytest
+
+from triton_testcontainer.composer import SlimTritonImage
+
+
+def test_dockerfile():
+    slim = SlimTritonImage(backends=["onnxruntime", "python"], repository_agents=["checksum"])
+    lines = slim.dockerfile().splitlines()
+
+    assert lines[1] == "FROM nvcr.io/nvidia/tritonserver:24.01-py3 AS full"
+    assert lines[2] == "FROM nvcr.io/nvidia/tritonserver:24.01-py3-min"
+    assert "COPY --from=full /opt/tritonserver/backends/onnxruntime /opt/tritonserver/backends/onnxruntime" in lines
+    assert "COPY --from=full /opt/tritonserver/backends/python /opt/tritonserver/backends/python" in lines
+    assert "COPY --from=full /opt/tritonserver/repoagents/checksum /opt/tritonserver/repoagents/checksum" in lines
+    assert not [line for line in lines if "backends/tensorflow" in line or "backends/pytorch" in line]
+
+    install = next(line for line in lines if "apt-get install" in line)
+    assert "libpython3-dev" in install and "libgomp1" in install
+    assert "ENV LD_LIBRARY_PATH=/opt/tritonserver/backends/onnxruntime:/opt/tritonserver/lib:${LD_LIBRARY_PATH}" in lines
+    assert lines[-1] == "WORKDIR /opt/tritonserver"
+
+    assert (slim.repository, slim.tag) == ("localhost/tritonserver-slim", "24.01-py3-onnxruntime-python")
+
+
+def test_no_backends():
+    with pytest.raises(ValueError):
+        SlimTritonImage(backends=[])
+
+
+def test_image_builder_leaves_no_context(tmp_path, monkeypatch):
+    import tempfile
+
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    builder = SlimTritonImage(backends=["python"]).image_builder(docker_client_kw={"version": "1.41"})
+
+    assert builder.dockerfile() == SlimTritonImage(backends=["python"]).dockerfile()
+    assert list(tmp_path.iterdir()) == []
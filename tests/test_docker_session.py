@@ -0,0 +1,39 @@
+from types import SimpleNamespace
+from datetime import timedelta
+
+from triton_testcontainer import docker_session
+from triton_testcontainer.docker_session import DockerApiStats, get_docker_client, set_docker_client
+
+
+def response(method: str, url: str, milliseconds: int):
+    return SimpleNamespace(
+        request=SimpleNamespace(method=method, url=url),
+        elapsed=timedelta(milliseconds=milliseconds),
+    )
+
+
+def test_docker_api_stats():
+    stats = DockerApiStats()
+
+    stats(response("GET", "http+docker://localhost/v1.43/containers/abc/json", 2))
+    stats(response("GET", "http+docker://localhost/v1.43/containers/def/json", 4))
+    stats(response("POST", "http+docker://localhost/v1.43/containers/create", 10))
+
+    assert stats.calls == {"GET /containers/{id}/json": 2, "POST /containers/create": 1}
+    assert stats.total_calls == 3
+    assert stats.summary()["GET /containers/{id}/json"]["mean"] == 0.003
+    assert stats.report().splitlines()[1].startswith("POST /containers/create")
+
+    stats.reset()
+    assert stats.total_calls == 0
+
+
+def test_set_docker_client():
+    client = SimpleNamespace(client=SimpleNamespace(api=SimpleNamespace(hooks={"response": []})))
+
+    set_docker_client(client)
+    try:
+        assert get_docker_client() is client
+        assert client.client.api.hooks["response"] == [docker_session.api_stats]
+    finally:
+        set_docker_client(None)
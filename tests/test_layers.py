@@ -0,0 +1,93 @@
+import io
+import json
+import tarfile
+
+from triton_testcontainer.dockerfile_builder import DockerfileBuilder
+from triton_testcontainer.layers import analyze_image
+
+
+def tar_bytes(files: dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as archive:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+class FakeImage:
+    id = "sha256:1234"
+    tags = ["localhost/image_builder:latest"]
+
+    # newest first, as returned by docker API
+    HISTORY = [
+        {"CreatedBy": 'CMD ["/bin/sh" "-c" "echo hello"]', "Size": 0},
+        {"CreatedBy": "RUN /bin/sh -c rm -rf /opt/big # buildkit", "Size": 0},
+        {"CreatedBy": "RUN /bin/sh -c pip install numpy # buildkit", "Size": 3000},
+        {"CreatedBy": "COPY model.bin /opt/big/model.bin # buildkit", "Size": 5000},
+        {"CreatedBy": "RUN /bin/sh -c apt-get update && apt-get install -y curl # buildkit", "Size": 2000},
+        {"CreatedBy": "/bin/sh -c #(nop)  CMD [\"bash\"]", "Size": 0},
+        {"CreatedBy": "/bin/sh -c #(nop) ADD file:abc in / ", "Size": 1000},
+    ]
+
+    def history(self):
+        return self.HISTORY
+
+    def save(self):
+        config = {"history": [
+            {"created_by": "ADD file:abc in /"},
+            {"created_by": "CMD", "empty_layer": True},
+            {"created_by": "apt-get"},
+            {"created_by": "COPY"},
+            {"created_by": "pip"},
+            {"created_by": "rm"},
+            {"created_by": "CMD", "empty_layer": True},
+        ]}
+        layers = [
+            {"usr/bin/curl": b"0" * 10},
+            {"usr/bin/curl": b"1" * 20, "var/lib/apt/lists/archive": b"2" * 30},
+            {"opt/big/model.bin": b"3" * 40},
+            {"root/.cache/pip/wheel": b"4" * 50},
+            {"opt/.wh.big": b""},
+        ]
+        files = {"manifest.json": json.dumps([{"Config": "config.json", "Layers": [f"{i}/layer.tar" for i in range(5)]}]).encode(),
+                 "config.json": json.dumps(config).encode()}
+        files.update({f"{i}/layer.tar": tar_bytes(layer) for i, layer in enumerate(layers)})
+        data = tar_bytes(files)
+        return (data[i:i + 1000] for i in range(0, len(data), 1000))
+
+
+def test_analyze_image():
+    dockerfile = (DockerfileBuilder()
+                  .from_("ubuntu:20.04")
+                  .run("apt-get update && apt-get install -y curl")
+                  .copy(src="model.bin", dest="/opt/big/model.bin")
+                  .run("pip install numpy", mount="type=cache,target=/tmp")
+                  .run("rm -rf /opt/big")
+                  .cmd("echo", "hello")
+                  .build())
+
+    report = analyze_image(FakeImage(), dockerfile=dockerfile, inspect_files=True)
+
+    assert report.total_size == 11000
+    assert [layer.instruction for layer in report.layers] == [
+        None, None,
+        "RUN apt-get update && apt-get install -y curl",
+        "COPY model.bin /opt/big/model.bin",
+        "RUN --mount=type=cache,target=/tmp pip install numpy",
+        "RUN rm -rf /opt/big",
+        "CMD echo hello",
+    ]
+    assert report.top(1)[0].index == 3
+
+    findings = sorted((finding.kind, finding.layer, finding.size) for finding in report.findings)
+    assert findings == [
+        ("deleted-file", 5, 40),
+        ("duplicate-file", 2, 10),
+        ("package-cache", 2, 0),
+        ("package-cache", 2, 30),
+        ("package-cache", 4, 0),
+        ("package-cache", 4, 50),
+    ]
+    assert "deleted but still stored" in str(report)
@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+from triton_testcontainer.logs import LogFollower
+
+
+LINES = [
+    "I0419 10:00:00.000000 1 model_lifecycle.cc:469] loading: simple:1",
+    "I0419 10:00:00.100000 1 backend_manager.cc:138] TRITONBACKEND_Initialize: tensorflow",
+    "I0419 10:00:01.000000 1 model_lifecycle.cc:835] successfully loaded 'simple'",
+    "E0419 10:00:01.100000 1 model_lifecycle.cc:638] failed to load 'broken' version 1: Invalid argument: model config",
+    "I0419 10:00:02.000000 1 http_server.cc:4636] Started HTTPService at 0.0.0.0:8000",
+]
+
+
+def test_log_follower_events():
+    follower = LogFollower(maxlen=3)
+
+    for timestamp, line in enumerate(LINES):
+        follower.feed(float(timestamp), line)
+
+    assert follower.tail() == LINES[-3:]
+    assert [event.kind for event in follower.events()] == [
+        "model_loading", "backend_loaded", "model_loaded", "model_load_failed", "server_started"
+    ]
+    assert follower.events(kind="model_load_failed")[0].version == 1
+    assert follower.wait_for("server_started", timeout=0).detail == "HTTPService"
+    assert follower.load_durations() == {"simple": 2.0}
+
+
+def test_log_follower_wait_after_cursor():
+    follower = LogFollower(max_events=2)
+    follower.feed(0.0, LINES[2])
+    cursor = follower.event_count
+
+    # loaded event of startup does not satisfy wait for reload
+    with pytest.raises(TimeoutError):
+        follower.wait_for("model_loaded", "simple", timeout=0, after=cursor)
+
+    follower.feed(5.0, LINES[0])
+    follower.feed(6.0, LINES[2])
+
+    assert follower.wait_for("model_loaded", "simple", timeout=0, after=cursor).timestamp == 6.0
+    assert follower.event_count == 3
+    assert len(follower.events()) == 2
+
+
+def test_log_follower_stream(tmp_path):
+    spill_path = tmp_path / "triton.log"
+    follower = LogFollower(maxlen=2, spill_path=str(spill_path))
+
+    chunks = [f"2024-04-19T10:00:0{i}.500000000Z {line}\n".encode() for i, line in enumerate(LINES)]
+    # docker may split lines between frames
+    stream = [b"".join(chunks)[:50], b"".join(chunks)[50:]]
+
+    class Container:
+        def get_wrapped_container(self):
+            return self
+
+        def logs(self, **kwargs):
+            return iter(stream)
+
+    follower.attach(Container())
+    follower.stop()
+
+    assert spill_path.read_text().splitlines() == LINES
+    assert follower.load_durations() == {"simple": 2.0}
+
+
+def test_log_follower_stop_while_streaming(tmp_path, monkeypatch):
+    errors = []
+    monkeypatch.setattr(threading, "excepthook", errors.append)
+    done = threading.Event()
+
+    def stream():
+        while not done.is_set():
+            yield f"2024-04-19T10:00:00.500000000Z {LINES[0]}\n".encode()
+
+    class Container:
+        def get_wrapped_container(self):
+            return self
+
+        def logs(self, **kwargs):
+            return stream()
+
+    follower = LogFollower(spill_path=str(tmp_path / "triton.log")).attach(Container())
+    thread = follower._thread
+    # join times out while follower keeps writing lines
+    follower.stop(timeout=0.05)
+    done.set()
+    thread.join()
+
+    assert errors == []
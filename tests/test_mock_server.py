@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+import tritonclient.http as tritonhttpclient
+
+
+def simple(inputs):
+    return {
+        "OUTPUT0": inputs["INPUT0"] + inputs["INPUT1"],
+        "OUTPUT1": inputs["INPUT0"] - inputs["INPUT1"],
+    }
+
+
+@pytest.fixture
+def server(mock_server):
+    return mock_server({"simple": {"max_batch_size": 8}}, fn=simple, inputs=("INPUT0", "INPUT1"),
+                       outputs=("OUTPUT0", "OUTPUT1"), datatype="INT32", shape=(16,)).add_model(
+        "echo", lambda inputs: {"TEXT_OUT": inputs["TEXT"]},
+        inputs=[{"name": "TEXT", "datatype": "BYTES", "shape": [-1]}],
+        outputs=[{"name": "TEXT_OUT", "datatype": "BYTES", "shape": [-1]}],
+        loaded=False,
+    )
+
+
+@pytest.mark.parametrize("binary_data", [True, False])
+def test_mock_server_infer(server, binary_data):
+    with server as triton:
+        triton_client = triton.get_client()
+
+        inputs = [
+            tritonhttpclient.InferInput("INPUT0", [8, 16], "INT32"),
+            tritonhttpclient.InferInput("INPUT1", [8, 16], "INT32"),
+        ]
+        inputs[0].set_data_from_numpy(np.ones([8, 16], dtype=np.int32), binary_data=binary_data)
+        inputs[1].set_data_from_numpy(np.zeros([8, 16], dtype=np.int32), binary_data=binary_data)
+
+        outputs = [
+            tritonhttpclient.InferRequestedOutput("OUTPUT0", binary_data=binary_data),
+            tritonhttpclient.InferRequestedOutput("OUTPUT1", binary_data=binary_data),
+        ]
+
+        results = triton_client.infer("simple", inputs, model_version="1", outputs=outputs)
+
+        assert triton_client.is_model_ready("simple", model_version="1")
+        np.testing.assert_array_equal(results.as_numpy("OUTPUT0"), np.ones([8, 16], dtype=np.int32))
+        np.testing.assert_array_equal(results.as_numpy("OUTPUT1"), np.ones([8, 16], dtype=np.int32))
+
+
+def test_mock_server_repository(server):
+    with server as triton:
+        triton_client = triton.get_client()
+
+        assert triton_client.is_server_live()
+        assert triton_client.is_server_ready()
+        assert triton_client.get_model_metadata("simple")["inputs"][0]["shape"] == [-1, 16]
+        assert triton_client.get_model_config("simple")["max_batch_size"] == 8
+        assert not triton_client.is_model_ready("echo")
+
+        with pytest.raises(tritonhttpclient.InferenceServerException):
+            triton_client.get_model_metadata("echo")
+
+        triton_client.load_model("echo")
+
+        text = tritonhttpclient.InferInput("TEXT", [2], "BYTES")
+        text.set_data_from_numpy(np.array([b"hello", b"world"], dtype=np.object_))
+        results = triton_client.infer("echo", [text])
+
+        np.testing.assert_array_equal(results.as_numpy("TEXT_OUT"), np.array([b"hello", b"world"], dtype=np.object_))
+
+        triton_client.unload_model("echo")
+
+        index = {model["name"]: model["state"] for model in triton_client.get_model_repository_index()}
+        assert index == {"simple": "READY", "echo": "UNAVAILABLE"}
+
+
+def test_mock_server_url(server):
+    with server as triton:
+        assert triton.get_url("http") == f"127.0.0.1:{triton.port}"
+
+        with pytest.raises(ValueError, match="http only"):
+            triton.get_url("grpc")
@@ -0,0 +1,59 @@
+import time
+
+import numpy as np
+
+from triton_testcontainer.monitor import ResourceMonitor
+
+
+class FakeContainer:
+    def __init__(self):
+        self.calls = 0
+
+    def container_stats(self) -> dict:
+        self.calls += 1
+        n = self.calls
+        return {
+            "cpu_stats": {"cpu_usage": {"total_usage": n * 50}, "system_cpu_usage": n * 100, "online_cpus": 2},
+            "precpu_stats": {},
+            "memory_stats": {"usage": 0, "stats": {"anon": n * 1024, "file": 512}},
+            "networks": {"eth0": {"rx_bytes": n * 10, "tx_bytes": n * 20}},
+            "blkio_stats": {"io_service_bytes_recursive": [{"op": "read", "value": n}, {"op": "write", "value": 2 * n}]},
+        }
+
+
+def test_resource_monitor():
+    container = FakeContainer()
+    started = time.time()
+
+    with ResourceMonitor(container.container_stats, interval=0.01) as monitor:
+        time.sleep(0.2)
+    assert monitor.error is None
+
+    series = monitor.series()
+    samples = len(monitor.timestamps)
+    assert samples == container.calls > 3
+    assert np.all(np.diff(monitor.timestamps) > 0) and monitor.timestamps[0] >= started
+
+    assert np.isnan(series["cpu_percent"][0])
+    np.testing.assert_allclose(series["cpu_percent"][1:], 100.0)
+    np.testing.assert_array_equal(series["memory_rss"], np.arange(1, samples + 1) * 1024)
+
+    summary = monitor.summary()
+    assert summary["memory_rss"]["peak"] == samples * 1024
+    assert summary["memory_cache"]["mean"] == 512
+    assert summary["network_tx"]["total"] == (samples - 1) * 20
+    assert summary["block_write"]["total"] == (samples - 1) * 2
+
+    at = monitor.at([monitor.timestamps[1], monitor.timestamps[-1] + 1])
+    np.testing.assert_array_equal(at["memory_rss"], [2 * 1024, samples * 1024])
+
+
+def test_resource_monitor_stops_when_container_is_gone():
+    def stats():
+        raise RuntimeError("container is gone")
+
+    with ResourceMonitor(stats, interval=0.01) as monitor:
+        time.sleep(0.05)
+
+    assert isinstance(monitor.error, RuntimeError)
+    assert monitor.summary() == {}
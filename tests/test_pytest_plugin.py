@@ -0,0 +1,47 @@
+import pytest
+
+CONFTEST = """
+import pytest
+
+from triton_testcontainer.mock_server import MockTritonServer
+
+pytest_plugins = ["triton_testcontainer.pytest_plugin"]
+
+
+@pytest.fixture(scope="session")
+def triton_container():
+    pytest.fail("container is started")
+
+
+@pytest.fixture(scope="session")
+def triton_mock_server():
+    with MockTritonServer() as triton:
+        yield triton
+"""
+
+TEST = """
+from triton_testcontainer.mock_server import MockTritonServer
+
+
+def test_server(triton_server):
+    assert isinstance(triton_server, MockTritonServer)
+    assert triton_server.get_client().is_server_ready()
+"""
+
+
+@pytest.fixture
+def suite(pytester: pytest.Pytester, monkeypatch) -> pytest.Pytester:
+    monkeypatch.delenv("TRITON_TESTCONTAINER_MOCK", raising=False)
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile(TEST)
+    return pytester
+
+
+def test_triton_mock_option(suite: pytest.Pytester):
+    suite.runpytest("--triton-mock").assert_outcomes(passed=1)
+    suite.runpytest().assert_outcomes(errors=1)
+
+
+def test_triton_mock_environment_variable(suite: pytest.Pytester, monkeypatch):
+    monkeypatch.setenv("TRITON_TESTCONTAINER_MOCK", "1")
+    suite.runpytest().assert_outcomes(passed=1)
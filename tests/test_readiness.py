@@ -0,0 +1,57 @@
+import threading
+import time
+
+import pytest
+
+from triton_testcontainer.mock_server import MockTritonServer
+from triton_testcontainer.readiness import ModelReadiness
+
+
+MODELS = {name: {"loaded": False} for name in ("fast", "slow", "broken")}
+
+
+def load_later(triton: MockTritonServer, model: str, delay: float) -> None:
+    def load():
+        time.sleep(delay)
+        triton.get_client().load_model(model)
+
+    threading.Thread(target=load, daemon=True).start()
+
+
+def test_partial_ready(mock_server):
+    with mock_server(MODELS) as triton:
+        load_later(triton, "fast", 0.05)
+        load_later(triton, "slow", 0.5)
+
+        readiness = ModelReadiness(triton.get_client, ["fast", "slow"], poll_interval=0.01).start()
+        started = time.monotonic()
+
+        assert readiness.wait(min_ready=1) == ["fast"]
+        assert time.monotonic() - started < 0.4
+        assert not readiness.futures["slow"].done()
+
+        assert readiness.futures["slow"].result(timeout=5) == "slow"
+        assert readiness.wait() == ["fast", "slow"]
+        assert triton.get_client().is_model_ready("slow")
+
+
+def test_unreachable_min_ready(mock_server):
+    with mock_server(MODELS) as triton:
+        load_later(triton, "fast", 0.0)
+
+        readiness = ModelReadiness(triton.get_client, ["fast", "broken"], timeout=0.2, poll_interval=0.01).start()
+
+        with pytest.raises(TimeoutError):
+            readiness.wait(min_ready=2)
+        assert readiness.ready == ["fast"]
+        with pytest.raises(TimeoutError):
+            readiness.futures["broken"].result()
+
+
+def test_stop(mock_server):
+    with mock_server(MODELS) as triton:
+        readiness = ModelReadiness(triton.get_client, ["broken"], poll_interval=0.01).start()
+        readiness.stop()
+
+        with pytest.raises(TimeoutError):
+            readiness.futures["broken"].result(timeout=1)
@@ -0,0 +1,73 @@
+import pathlib
+import runpy
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from tritonclient.utils import triton_to_np_dtype
+
+from triton_testcontainer.repository import SyntheticModel, generate_repository
+
+
+SIMPLE_MODEL = pathlib.Path(__file__).parent / "test_triton_container" / "models_repository" / "simple"
+
+
+def test_config_layout():
+    model = SyntheticModel(
+        name="simple",
+        inputs=[{"name": f"INPUT{i}", "datatype": "INT32", "shape": [16]} for i in range(2)],
+    )
+    expected = (SIMPLE_MODEL / "config.pbtxt").read_text()
+    # the same layout as real model, only backend and instance group differ
+    expected = expected.replace('platform: "tensorflow_graphdef"', 'backend: "python"')
+
+    assert model.config() == expected.rstrip("\n") + "\ninstance_group [\n  {\n    count: 1\n    kind: KIND_CPU\n  }\n]\n"
+
+
+def test_generate_repository(tmp_path: pathlib.Path):
+    volume_mapping = generate_repository(tmp_path / "models", count=3, backend="identity", delay_ms=5,
+                                         dynamic_batching=True, preferred_batch_size=[4, 8], instance_count=2)
+
+    assert volume_mapping == {"host": str(tmp_path / "models"), "container": "/models", "mode": "ro"}
+    assert sorted(path.name for path in (tmp_path / "models").iterdir()) == ["model_0", "model_1", "model_2"]
+    assert (tmp_path / "models" / "model_2" / "1").is_dir()
+
+    config = (tmp_path / "models" / "model_1" / "config.pbtxt").read_text()
+    assert 'name: "model_1"' in config and 'backend: "identity"' in config
+    assert "count: 2" in config
+    assert "dynamic_batching {\n  preferred_batch_size: [ 4, 8 ]\n}" in config
+    assert 'parameters: { key: "execute_delay_ms" value: { string_value: "5" } }' in config
+
+    with pytest.raises(ValueError):
+        SyntheticModel(name="broken", max_batch_size=0, dynamic_batching=True)
+
+
+def test_python_model(tmp_path: pathlib.Path, monkeypatch):
+    model = SyntheticModel(
+        name="python_model",
+        inputs=[{"name": "INPUT0", "datatype": "INT32", "shape": [4]}],
+        outputs=[{"name": "OUTPUT0", "datatype": "FP32", "shape": [4]}, {"name": "OUTPUT1", "datatype": "INT32", "shape": [4]}],
+        delay_ms=50,
+    )
+    model_py = model.write(tmp_path) / "1" / "model.py"
+
+    pb_utils = SimpleNamespace(
+        triton_string_to_numpy=lambda datatype: triton_to_np_dtype(datatype.removeprefix("TYPE_")),
+        get_input_tensor_by_name=lambda request, name: SimpleNamespace(as_numpy=lambda: request[name]),
+        Tensor=lambda name, data: (name, data),
+        InferenceResponse=lambda output_tensors: dict(output_tensors),
+    )
+    monkeypatch.setitem(sys.modules, "triton_python_backend_utils", pb_utils)
+
+    python_model = runpy.run_path(str(model_py))["TritonPythonModel"]()
+    python_model.initialize({})
+
+    started = time.perf_counter()
+    responses = python_model.execute([{"INPUT0": np.arange(4, dtype=np.int32)}] * 2)
+
+    assert time.perf_counter() - started >= 0.05
+    assert len(responses) == 2
+    assert responses[0]["OUTPUT0"].dtype == np.float32
+    np.testing.assert_array_equal(responses[1]["OUTPUT1"], np.arange(4))
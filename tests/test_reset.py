@@ -0,0 +1,87 @@
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from triton_testcontainer.mock_server import MockTritonServer
+from triton_testcontainer.reset import ServerState, reset_server
+
+MODELS = {"first": {}, "second": {}, "third": {"loaded": False}}
+
+
+def dirty(triton: MockTritonServer) -> None:
+    triton_client = triton.get_client()
+    triton_client.load_model("third")
+    triton_client.unload_model("second")
+    triton_client.register_system_shared_memory("input", "/input", 64)
+    triton_client.update_trace_settings(settings={"trace_level": ["TIMESTAMPS"], "trace_rate": "1"})
+    triton_client.update_trace_settings(model_name="first", settings={"trace_count": "10"})
+    # settings of unloaded model are kept by server for its next load
+    triton_client.update_trace_settings(model_name="third", settings={"trace_rate": "5"})
+    triton_client.unload_model("third")
+    triton_client.update_log_settings({"log_verbose_level": 3, "log_info": False})
+
+
+def test_reset(mock_server):
+    with mock_server(MODELS, unload_delay=0.2) as triton:
+        dirty(triton)
+
+        started = time.monotonic()
+        assert triton.reset() == ["first", "second"]
+        # loads are issued only after unloads are done
+        assert time.monotonic() - started >= 0.2
+
+        triton_client = triton.get_client()
+        assert [triton_client.is_model_ready(name) for name in ("first", "second", "third")] == [True, True, False]
+        assert triton_client.get_system_shared_memory_status() == []
+        assert triton_client.get_trace_settings()["trace_level"] == ["OFF"]
+        assert triton_client.get_trace_settings(model_name="first")["trace_count"] == "-1"
+        assert triton_client.get_trace_settings(model_name="third")["trace_rate"] == "1000"
+        assert triton_client.get_log_settings()["log_verbose_level"] == 0
+        assert triton_client.get_log_settings()["log_info"] is True
+
+
+def test_reset_models(mock_server):
+    with mock_server(MODELS) as triton:
+        triton.get_client(lazy_loading=True).load_model("first")
+
+        assert triton.reset(["third"]) == ["third"]
+        assert not triton.model_loader.loaded
+        assert [triton.get_client().is_model_ready(name) for name in ("first", "second", "third")] == [False, False, True]
+
+
+def test_reset_clears_trace_settings_of_models_loaded_since_start():
+    client = Mock()
+    client.get_model_repository_index.side_effect = [
+        [{"name": "first", "state": "READY"}, {"name": "second", "state": "UNAVAILABLE"}, {"name": "third"}], [],
+    ]
+
+    reset_server(client, ServerState(trace={"trace_level": ["OFF"]}, models=["first"]))
+
+    cleared = [call.kwargs["model_name"] for call in client.update_trace_settings.call_args_list
+               if "model_name" in call.kwargs]
+    assert cleared == ["first", "second"]
+
+
+def test_reset_timeout(mock_server):
+    with mock_server(MODELS, unload_delay=10) as triton:
+        with pytest.raises(TimeoutError, match="first"):
+            triton.reset(timeout=0.1)
+
+
+@pytest.fixture(scope="session")
+def triton_container(mock_server):
+    with mock_server(MODELS) as triton:
+        yield triton
+
+
+@pytest.mark.parametrize("iteration", range(2))
+def test_triton_reset_fixture(triton_reset, iteration):
+    assert triton_reset.get_client().is_model_ready("second")
+    dirty(triton_reset)
+
+
+@pytest.mark.triton_models("third")
+def test_triton_models_marker(triton_reset):
+    assert triton_reset.get_client().is_model_ready("third")
+    assert not triton_reset.get_client().is_model_ready("first")
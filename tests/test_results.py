@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from triton_testcontainer.results import BenchmarkKey, BenchmarkResult, ResultStore, assert_no_regression
+
+
+def test_result_store(tmp_path):
+    key = BenchmarkKey(image="tritonserver:24.01-py3", command="tritonserver", model="simple", host="ci")
+
+    with ResultStore(str(tmp_path / "results.sqlite")) as store:
+        result = BenchmarkResult.from_latencies(key, np.full(100, 0.010), duration=1.0)
+        run_id = store.record(result)
+
+        assert store.get(run_id).p99 == pytest.approx(0.010)
+        assert store.history(key)[0].run_id == run_id
+
+        # no baseline yet
+        assert assert_no_regression(store, key, p99=1.0) == []
+
+        store.set_baseline(run_id, name="main")
+
+        comparisons = assert_no_regression(store, key, baseline="main", p99=0.0105, throughput=95.0, tolerance=0.1)
+        assert [comparison.metric for comparison in comparisons] == ["p99", "throughput"]
+
+        with pytest.raises(AssertionError, match="p99"):
+            assert_no_regression(store, key, baseline="main", p99=0.012, tolerance=0.1)
+
+        with pytest.raises(AssertionError, match="throughput"):
+            assert_no_regression(store, key, baseline="main", throughput=80.0, tolerance=0.1)
+
+
+def test_result_store_noise(tmp_path):
+    key = BenchmarkKey(image="tritonserver:24.01-py3", command="tritonserver", model="simple", host="ci")
+
+    with ResultStore(str(tmp_path / "results.sqlite")) as store:
+        run_ids = [
+            store.record(BenchmarkResult.from_latencies(key, np.full(10, latency), duration=1.0))
+            for latency in (0.010, 0.014, 0.008, 0.012)
+        ]
+        store.set_baseline(run_ids[-1])
+
+        # noisy history widens allowed deviation beyond 10%
+        assert_no_regression(store, key, p99=0.016, tolerance=0.1)
+
+
+def test_result_store_noise_excludes_candidate(tmp_path):
+    key = BenchmarkKey(image="tritonserver:24.01-py3", command="tritonserver", model="simple", host="ci")
+
+    with ResultStore(str(tmp_path / "results.sqlite")) as store:
+        for _ in range(3):
+            run_id = store.record(BenchmarkResult.from_latencies(key, np.full(10, 0.010), duration=1.0))
+        store.set_baseline(run_id)
+
+        # recorded before assert, regression must not widen its own threshold
+        store.record(BenchmarkResult.from_latencies(key, np.full(10, 0.030), duration=1.0))
+
+        with pytest.raises(AssertionError, match="p99"):
+            assert_no_regression(store, key, p99=0.030, tolerance=0.1)
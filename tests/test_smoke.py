@@ -1,2 +1,24 @@
+import subprocess
+import sys
+
+
 def test_smoke():
-    from triton_testcontainer import TritonContainer, VolumeMapping, TritonCommand
\ No newline at end of file
+    from triton_testcontainer import TritonContainer, VolumeMapping, TritonCommand
+
+
+def _imported_modules(statement: str) -> set[str]:
+    code = f"import sys; {statement}; print(' '.join(sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return set(output.split())
+
+
+def test_lazy_import():
+    heavy = {"docker", "testcontainers", "tritonclient", "geventhttpclient", "gevent", "pydantic"}
+
+    assert not heavy & _imported_modules("import triton_testcontainer")
+    assert not heavy & _imported_modules("from triton_testcontainer import DockerfileBuilder")
+    assert not (heavy | {"numpy"}) & _imported_modules("from triton_testcontainer import SyntheticModel")
+
+    modules = _imported_modules("from triton_testcontainer import TritonContainer")
+    assert "tritonclient" not in modules
+    assert "gevent" not in modules
@@ -0,0 +1,74 @@
+import numpy as np
+import tritonclient.http as tritonhttpclient
+
+from triton_testcontainer.mock_server import MockTritonServer
+from triton_testcontainer.stats import StatisticsProfiler
+
+
+def test_profile_mock_server():
+    spec = {"name": "INPUT0", "datatype": "FP32", "shape": [4]}
+    server = MockTritonServer().add_model(
+        "identity", lambda inputs: {"OUTPUT0": inputs["INPUT0"]},
+        inputs=[spec], outputs=[{**spec, "name": "OUTPUT0"}], max_batch_size=8,
+    )
+
+    def infer(client, batch_size):
+        infer_input = tritonhttpclient.InferInput("INPUT0", [batch_size, 4], "FP32")
+        infer_input.set_data_from_numpy(np.zeros([batch_size, 4], dtype=np.float32))
+        client.infer("identity", [infer_input])
+
+    with server as triton:
+        client = triton.get_client()
+        infer(client, 1)
+
+        with triton.profile(models=["identity"]) as profiler:
+            for batch_size in (2, 2, 4):
+                infer(client, batch_size)
+
+    delta = profiler.model("identity")
+
+    assert delta.request_count == 3
+    assert delta.inference_count == 8
+    assert delta.batch_sizes == {2: 2, 4: 1}
+    assert delta.average_ms("compute_infer") > 0
+    assert "identity" in profiler.report()
+
+
+class FakeClient:
+    def __init__(self):
+        self.count = 0
+
+    def get_model_config(self, name):
+        if name == "ensemble":
+            return {"ensemble_scheduling": {"step": [{"model_name": "preprocess"}, {"model_name": "classifier"}]}}
+        return {}
+
+    def get_inference_statistics(self):
+        def entry(name, version, count):
+            return {
+                "name": name,
+                "version": version,
+                "inference_stats": {"success": {"count": count}, "queue": {"count": count, "ns": count * 1_000_000}},
+            }
+
+        stats = {"model_stats": [
+            entry("ensemble", "1", self.count),
+            entry("preprocess", "1", self.count),
+            entry("classifier", "1", self.count),
+            entry("classifier", "2", 2 * self.count),
+            entry("unrelated", "1", self.count),
+        ]}
+        self.count += 5
+        return stats
+
+
+def test_profile_ensemble():
+    with StatisticsProfiler(FakeClient(), models=["ensemble"]) as profiler:
+        pass
+
+    assert sorted(profiler.stats) == [
+        ("classifier", "1"), ("classifier", "2"), ("ensemble", "1"), ("preprocess", "1")
+    ]
+    assert profiler.model("classifier").request_count == 15
+    assert profiler.model("classifier", version="2").average_ms("queue") == 1.0
+    assert profiler.model("ensemble").composing == ["preprocess", "classifier"]
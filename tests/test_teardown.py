@@ -0,0 +1,109 @@
+import subprocess
+import threading
+from types import SimpleNamespace
+
+import triton_testcontainer.teardown
+from triton_testcontainer.teardown import TeardownManager, _reap
+
+
+class FakeContainer:
+    def __init__(self, name: str, events: list, barrier: threading.Barrier | None = None):
+        self._name = name
+        self._container = object()
+        self.events = events
+        self.barrier = barrier
+
+    def get_container_id(self):
+        return f"id-{self._name}"
+
+    def stop(self):
+        # all containers have to be stopping at the same time to pass the barrier
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5)
+        self.events.append(("stop", self._name))
+
+    def release(self):
+        self.events.append(("release", self._name))
+
+
+class FakeImageBuilder:
+    def __init__(self, tag: str, events: list, force_remove: bool = False):
+        self.tag = tag
+        self.image = SimpleNamespace(id=f"sha256:{tag}")
+        self.force_remove = force_remove
+        self.events = events
+
+    def remove(self):
+        self.events.append(("remove", self.tag))
+        raise RuntimeError("image is in use")
+
+
+class FakeDockerApi:
+    def __init__(self):
+        self.calls = []
+
+    def remove_container(self, container_id, **kwargs):
+        self.calls.append(("remove_container", container_id, kwargs))
+
+    def remove_image(self, image, **kwargs):
+        self.calls.append(("remove_image", image, kwargs))
+
+
+def test_parallel_teardown():
+    events = []
+    barrier = threading.Barrier(4)
+    teardown = TeardownManager(max_workers=4)
+    for i in range(4):
+        teardown.add_container(FakeContainer(f"triton-{i}", events, barrier))
+    teardown.add_image(FakeImageBuilder("image", events))
+
+    report = teardown.teardown()
+
+    assert len(report.durations) == 5
+    # barrier is broken unless containers are stopped in parallel
+    assert report.errors == {"image image": "image is in use"}
+    # images are removed after all containers are stopped
+    assert [event[0] for event in events] == ["stop"] * 4 + ["remove"]
+    assert "image is in use" in str(report)
+
+
+def test_background_teardown(monkeypatch):
+    events = []
+    monkeypatch.setattr(subprocess, "Popen", lambda args, **kwargs: events.append(("spawn", args, kwargs)))
+    monkeypatch.setattr(triton_testcontainer.teardown, "_docker_host", lambda: "tcp://docker:2375")
+
+    with TeardownManager(background=True) as teardown:
+        teardown.add_container(FakeContainer("triton", events))
+        teardown.add_image(FakeImageBuilder("image", events))
+        teardown.add_image(FakeImageBuilder("forced", events, force_remove=True))
+
+    # side effects of stop run in process before removal is handed off, nothing is removed in process
+    assert [event[0] for event in events] == ["release", "spawn"]
+    _, args, kwargs = events[1]
+
+    assert args[1:3] == ["-m", "triton_testcontainer.teardown"]
+    assert args[3:] == ["--docker-host", "tcp://docker:2375", "--container", "id-triton",
+                        "--image", "image", "--force-image", "forced"]
+    assert kwargs["start_new_session"]
+
+
+def test_reap(monkeypatch):
+    import docker
+
+    api = FakeDockerApi()
+    base_urls = []
+
+    def client(base_url):
+        base_urls.append(base_url)
+        return SimpleNamespace(api=api)
+
+    monkeypatch.setattr(docker, "DockerClient", client)
+
+    _reap(["id-triton"], [("image", False), ("forced", True)], docker_host="tcp://docker:2375")
+
+    assert base_urls == ["tcp://docker:2375"]
+    assert api.calls == [
+        ("remove_container", "id-triton", {"force": True, "v": True}),
+        ("remove_image", "image", {"force": False}),
+        ("remove_image", "forced", {"force": True}),
+    ]
@@ -0,0 +1,44 @@
+import json
+
+import numpy as np
+
+from triton_testcontainer.trace import TraceAnalysis, load_traces
+
+
+def request_entries(request_id: int, start: int, queue: int, model_name: str = "simple") -> list[dict]:
+    stamps = [
+        ("HTTP_RECV_START", 0), ("HTTP_RECV_END", 10_000), ("REQUEST_START", 10_000), ("QUEUE_START", 11_000),
+        ("COMPUTE_START", 11_000 + queue), ("COMPUTE_INPUT_END", 12_000 + queue),
+        ("COMPUTE_OUTPUT_START", 20_000 + queue), ("COMPUTE_END", 21_000 + queue), ("REQUEST_END", 22_000 + queue),
+        ("HTTP_SEND_START", 22_000 + queue), ("HTTP_SEND_END", 25_000 + queue),
+    ]
+    return [
+        {"id": request_id, "model_name": model_name, "model_version": 1},
+        {"id": request_id, "timestamps": [{"name": name, "ns": start + ns} for name, ns in stamps[4:]]},
+        {"id": request_id, "timestamps": [{"name": name, "ns": start + ns} for name, ns in stamps[:4]]},
+    ]
+
+
+def test_trace_analysis(tmp_path):
+    entries = [entry for i in range(99) for entry in request_entries(i, i * 100_000, queue=1_000)]
+    # files written with log frequency hold separate arrays
+    (tmp_path / "trace.json.0").write_text(json.dumps(entries))
+    (tmp_path / "trace.json.1").write_text(json.dumps(request_entries(99, 10**8, queue=1_000_000)) + "\n" +
+                                           json.dumps(request_entries(100, 10**9, queue=0, model_name="other")))
+
+    traces = load_traces(tmp_path / "trace.json.0", tmp_path / "trace.json.1")
+    assert len(traces) == 101
+    assert traces[0].model_version == "1"
+
+    analysis = TraceAnalysis(traces).for_model("simple")
+
+    assert len(analysis) == 100
+    np.testing.assert_allclose(analysis["receive"], 10.0)
+    np.testing.assert_allclose(analysis["compute_infer"], 8.0)
+    assert analysis.summary()["queue"]["p50"] == 1.0
+    assert analysis.summary()["total"]["p50"] == 26.0
+
+    tail = analysis.tail_attribution(99)
+    assert tail["queue"] == 1000.0
+    assert tail["send"] == 3.0
+    assert "compute_infer" in analysis.report()
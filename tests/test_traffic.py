@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+import tritonclient.http as tritonhttpclient
+
+from triton_testcontainer.mock_server import MockTritonServer
+from triton_testcontainer.traffic import TrafficRecorder, TrafficRecording, RecordingClient, replay
+
+
+def test_record_and_read(tmp_path):
+    requests = [
+        {"INPUT0": np.full([2, 4], i, dtype=np.float32), "TEXT": np.array([b"a" * i, b"b"], dtype=np.object_)}
+        for i in range(5)
+    ]
+
+    with TrafficRecorder(tmp_path) as recorder:
+        for i, inputs in enumerate(requests):
+            recorder.record("model", inputs, outputs=["OUTPUT0"], timestamp=10.0 + i * 0.5)
+
+    recording = TrafficRecording(tmp_path)
+
+    assert len(recording) == 5
+    assert recording.duration == 2.0
+    assert isinstance(np.load(tmp_path / "FP32.npy", mmap_mode="r"), np.memmap)
+
+    for expected, request in zip(requests, recording):
+        assert request.model_name == "model"
+        assert request.outputs == ["OUTPUT0"]
+        np.testing.assert_array_equal(request.inputs["INPUT0"], expected["INPUT0"])
+        np.testing.assert_array_equal(request.inputs["TEXT"], expected["TEXT"])
+
+
+def test_record_empty_bytes(tmp_path):
+    with TrafficRecorder(tmp_path) as recorder:
+        recorder.record("model", {"TEXT": np.empty([2, 0], dtype=np.object_)})
+
+    assert TrafficRecording(tmp_path)[0].inputs["TEXT"].shape == (2, 0)
+
+
+def test_replay(tmp_path):
+    spec = {"name": "INPUT0", "datatype": "FP32", "shape": [4]}
+    server = MockTritonServer().add_model(
+        "identity", lambda inputs: {"OUTPUT0": inputs["INPUT0"]},
+        inputs=[spec], outputs=[{**spec, "name": "OUTPUT0"}], max_batch_size=8,
+    )
+
+    with TrafficRecorder(tmp_path) as recorder:
+        for i in range(20):
+            recorder.record("identity", {"INPUT0": np.ones([2, 4], dtype=np.float32)}, timestamp=i * 0.01)
+        recorder.record("unknown", {"INPUT0": np.ones([2, 4], dtype=np.float32)}, timestamp=0.2)
+
+    with server:
+        report = replay(TrafficRecording(tmp_path), server, speed=2.0, concurrency=4)
+
+    assert report.error_count == 1
+    assert report.duration >= 0.1
+    assert np.all(report.latency > 0)
+    assert set(report.latency_percentiles("identity")) == {"p50", "p90", "p95", "p99"}
+    assert "identity" in report.summary()
+
+
+@pytest.mark.parametrize("binary_data", [True, False])
+def test_recording_client(tmp_path, binary_data):
+    spec = {"name": "TEXT", "datatype": "BYTES", "shape": [-1]}
+    server = MockTritonServer().add_model(
+        "echo", lambda inputs: {"TEXT_OUT": inputs["TEXT"]}, inputs=[spec], outputs=[{**spec, "name": "TEXT_OUT"}],
+    )
+    text = np.array([b"a", b"bc"], dtype=np.object_)
+
+    with server, TrafficRecorder(tmp_path) as recorder:
+        triton_client = RecordingClient(server.get_client(), recorder)
+        infer_input = tritonhttpclient.InferInput("TEXT", [2], "BYTES")
+        infer_input.set_data_from_numpy(text, binary_data=binary_data)
+        outputs = [tritonhttpclient.InferRequestedOutput("TEXT_OUT")]
+
+        result = triton_client.infer("echo", [infer_input], outputs=outputs)
+        assert triton_client.is_server_ready()
+
+    np.testing.assert_array_equal(result.as_numpy("TEXT_OUT"), text)
+    request = TrafficRecording(tmp_path)[0]
+    assert (request.model_name, request.outputs) == ("echo", ["TEXT_OUT"])
+    np.testing.assert_array_equal(request.inputs["TEXT"], text)
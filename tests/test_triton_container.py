@@ -1,10 +1,20 @@
+import io
+import os
 import pathlib
+import tarfile
+import posixpath
+
+import pytest
+import docker.errors
 
 import tritonclient.http as tritonhttpclient
 import numpy as np
 
 from triton_testcontainer import TritonContainer
-from triton_testcontainer.command import TritonCommand
+from triton_testcontainer.command import TritonCommand, TraceConfig
+from triton_testcontainer.repository import generate_repository
+from triton_testcontainer.trace import TraceAnalysis
+from triton_testcontainer.triton import resolve_resource_limits, format_cpuset
 
 
 def test_triton_container(datadir: pathlib.Path):
@@ -74,4 +84,199 @@ def test_get_url():
     with TritonContainer(with_gpus=False) as triton_container:
         assert triton_container.get_url("http") == f"localhost:{triton_container.get_exposed_port(8000)}"
         assert triton_container.get_url("grpc") == f"localhost:{triton_container.get_exposed_port(8001)}"
-        assert triton_container.get_url("metrics") == f"localhost:{triton_container.get_exposed_port(8002)}"
\ No newline at end of file
+        assert triton_container.get_url("metrics") == f"localhost:{triton_container.get_exposed_port(8002)}"
+
+def test_resolve_resource_limits():
+    limits = resolve_resource_limits("ci-small", shm_size="1g", cpuset_cpus=None)
+
+    assert limits["shm_size"] == "1g"
+    assert limits["ulimits"] == {"memlock": -1, "stack": 67_108_864}
+    assert "cpuset_cpus" not in limits
+
+    limits = resolve_resource_limits(mem_limit="2g")
+
+    assert limits == {"mem_limit": "2g", "memswap_limit": "2g"}
+    assert resolve_resource_limits(mem_limit="2g", memswap_limit="3g")["memswap_limit"] == "3g"
+
+    # pinned to CPUs of the process unless given explicitly
+    assert resolve_resource_limits("benchmark-pinned")["cpuset_cpus"] == format_cpuset(os.sched_getaffinity(0))
+    assert resolve_resource_limits("benchmark-pinned", cpuset_cpus="4-7")["cpuset_cpus"] == "4-7"
+
+    with pytest.raises(ValueError):
+        resolve_resource_limits("unknown")
+
+
+def test_container_kwargs():
+    # known api version keeps docker client from connecting to daemon
+    docker_client_kw = {"version": "1.41"}
+    container = TritonContainer(with_gpus=True, preset="ci-small", mem_limit="2g", privileged=True,
+                                docker_client_kw=docker_client_kw)
+    kwargs = container._kwargs
+
+    assert kwargs["privileged"] is True
+    assert kwargs["device_requests"][0]["Capabilities"] == [["gpu"]]
+    assert kwargs["mem_limit"] == kwargs["memswap_limit"] == "2g"
+    assert [ulimit["Name"] for ulimit in kwargs["ulimits"]] == ["memlock", "stack"]
+
+    container = TritonContainer(with_gpus=False, privileged=True, docker_client_kw=docker_client_kw)
+
+    assert container._kwargs == {"privileged": True}
+
+
+def test_host_network_kwargs():
+    command = TritonCommand(model_repository=["/home"])
+    container = TritonContainer(host_network=True, preset="ci-small", command=command,
+                                docker_client_kw={"version": "1.41"})
+
+    assert container._kwargs["network_mode"] == "host"
+    assert "device_requests" in container._kwargs
+    assert container._command.count("--http-port=") == 1
+    # command of the caller is left as it is
+    assert command.http_port is None
+    assert command.build() == "tritonserver --model-repository=/home --model-control-mode=none"
+
+
+def test_host_network():
+    with TritonContainer(with_gpus=False, host_network=True, command=TritonCommand(model_repository=["/home"])) as triton_container:
+        http_port = triton_container.get_exposed_port(8000)
+
+        assert f"--http-port={http_port}" in triton_container._command
+        assert triton_container.get_url("http") == f"localhost:{http_port}"
+        assert triton_container.get_client().is_server_ready()
+
+
+def test_trace_collection(datadir: pathlib.Path, tmp_path: pathlib.Path):
+    cmd = TritonCommand(
+        model_repository=["/models"],
+        model_control_mode="explicit",
+        load_model="simple",
+        trace_config=TraceConfig(level="TIMESTAMPS", rate=1, file="/tmp/trace.json"),
+    )
+
+    volume_mapping = [{"host": datadir / "models_repository", "container": "/models"}]
+
+    with TritonContainer(with_gpus=False, volume_mapping=volume_mapping, command=cmd,
+                         trace_output=str(tmp_path)) as triton:
+        inputs = [tritonhttpclient.InferInput(name, [1, 16], "INT32") for name in ("INPUT0", "INPUT1")]
+        for infer_input in inputs:
+            infer_input.set_data_from_numpy(np.ones([1, 16], dtype=np.int32))
+        triton.get_client().infer("simple", inputs)
+
+    analysis = TraceAnalysis.from_files(*triton.trace_files)
+
+    assert len(analysis.for_model("simple")) == 1
+
+
+def test_wait_for_models(datadir: pathlib.Path):
+    cmd = TritonCommand(model_repository=["/models"], model_control_mode="explicit", load_model="simple")
+    volume_mapping = [{"host": datadir / "models_repository", "container": "/models"}]
+
+    triton = TritonContainer(with_gpus=False, volume_mapping=volume_mapping, command=cmd)
+    try:
+        triton.start(wait_for_models=["simple"], min_ready=1)
+
+        assert triton.model_futures["simple"].done()
+        triton.wait_for_model("simple")
+        assert triton.get_client().is_model_ready("simple")
+    finally:
+        triton.stop()
+
+
+def test_synthetic_repository(tmp_path: pathlib.Path):
+    volume_mapping = generate_repository(tmp_path, count=3, inputs=[{"name": "INPUT0", "datatype": "FP32", "shape": [4]}])
+    cmd = TritonCommand(model_repository=["/models"], model_control_mode="explicit", load_model="*")
+
+    with TritonContainer(with_gpus=False, volume_mapping=[volume_mapping], command=cmd) as triton:
+        triton_client = triton.get_client()
+        infer_input = tritonhttpclient.InferInput("INPUT0", [2, 4], "FP32")
+        infer_input.set_data_from_numpy(np.ones([2, 4], dtype=np.float32))
+
+        assert all(triton_client.is_model_ready(f"model_{index}") for index in range(3))
+        np.testing.assert_array_equal(triton_client.infer("model_2", [infer_input]).as_numpy("OUTPUT0"), np.ones([2, 4]))
+
+
+def test_reset(datadir: pathlib.Path):
+    cmd = TritonCommand(model_repository=["/models"], model_control_mode="explicit", load_model="simple")
+    volume_mapping = [{"host": datadir / "models_repository", "container": "/models"}]
+
+    with TritonContainer(with_gpus=False, volume_mapping=volume_mapping, command=cmd) as triton:
+        triton_client = triton.get_client()
+        triton_client.update_log_settings({"log_verbose_level": 2})
+        triton_client.unload_model("simple")
+
+        assert triton.reset() == ["simple"]
+        assert triton_client.is_model_ready("simple")
+        assert triton_client.get_log_settings()["log_verbose_level"] == 0
+
+
+def test_stop_when_trace_collection_fails(tmp_path: pathlib.Path, monkeypatch):
+    calls = []
+
+    class Container:
+        def stop(self):
+            calls.append("stop")
+
+        def remove(self, **kwargs):
+            calls.append("remove")
+
+    class Follower:
+        def stop(self):
+            calls.append("follower")
+
+    def collect_traces(destination):
+        raise FileNotFoundError("trace.json")
+
+    cmd = TritonCommand(trace_config=TraceConfig(level=["TIMESTAMPS"], file="/tmp/trace.json"))
+    triton = TritonContainer(with_gpus=False, command=cmd, trace_output=str(tmp_path), log_follower=Follower(),
+                             docker_client_kw={"version": "1.41"})
+    triton._container = Container()
+    monkeypatch.setattr(triton, "collect_traces", collect_traces)
+
+    with pytest.raises(FileNotFoundError):
+        triton.stop()
+
+    assert calls == ["stop", "remove", "follower"]
+
+
+def test_release():
+    stopped = []
+
+    class Follower:
+        def stop(self, timeout=5.0):
+            stopped.append(timeout)
+
+    triton = TritonContainer(with_gpus=False, log_follower=Follower(), docker_client_kw={"version": "1.41"})
+    triton._container = object()
+    triton.release()
+
+    assert triton._container is None
+    assert stopped == [0]
+
+
+def test_collect_traces(tmp_path: pathlib.Path, monkeypatch):
+    files = {"/tmp/trace.json.0": b"[1]", "/tmp/trace.json.1": b"[2]", "/tmp/other.json": b"[3]"}
+    requested = []
+
+    class Container:
+        def get_archive(self, path):
+            requested.append(path)
+            if path not in files:
+                raise docker.errors.NotFound(path)
+            buffer = io.BytesIO()
+            with tarfile.open(fileobj=buffer, mode="w") as archive:
+                info = tarfile.TarInfo(posixpath.basename(path))
+                info.size = len(files[path])
+                archive.addfile(info, io.BytesIO(files[path]))
+            data = buffer.getvalue()
+            # archive is streamed in chunks
+            return (data[index:index + 100] for index in range(0, len(data), 100)), {}
+
+    cmd = TritonCommand(trace_config=TraceConfig(level=["TIMESTAMPS"], file="/tmp/trace.json", log_frequency=10))
+    triton = TritonContainer(with_gpus=False, command=cmd, docker_client_kw={"version": "1.41"})
+    monkeypatch.setattr(triton, "get_wrapped_container", Container)
+
+    collected = triton.collect_traces(str(tmp_path))
+
+    assert [path.name for path in collected] == ["trace.json.0", "trace.json.1"]
+    assert (tmp_path / "trace.json.1").read_bytes() == b"[2]"
+    assert requested == ["/tmp/trace.json", "/tmp/trace.json.0", "/tmp/trace.json.1", "/tmp/trace.json.2"]
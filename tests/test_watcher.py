@@ -0,0 +1,42 @@
+import pathlib
+import shutil
+
+import pytest
+
+from triton_testcontainer.repository import generate_repository
+from triton_testcontainer.watcher import RepositoryWatcher
+
+
+MODELS = {f"model_{index}": {"loaded": index != 1} for index in range(3)}
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_repository_watcher(tmp_path: pathlib.Path, use_inotify: bool, mock_server):
+    generate_repository(tmp_path, count=3)
+    (tmp_path / "README.md").write_text("not a model")
+
+    with mock_server(MODELS, inputs=("INPUT0",), outputs=("OUTPUT0",), shape=(16,)) as triton:
+        loads = []
+
+        with RepositoryWatcher(triton.get_client, tmp_path, debounce=0.05, poll_interval=0.05,
+                               use_inotify=use_inotify, on_reload=loads.append) as watcher:
+            assert watcher.inotify == use_inotify
+
+            # several edits of one model within debounce window are one reload
+            for _ in range(3):
+                with open(tmp_path / "model_1" / "config.pbtxt", "a") as config:
+                    config.write("\n")
+            (tmp_path / "README.md").write_text("still not a model")
+
+            event = watcher.wait_for_reload("model_1", timeout=5)
+            assert event.action == "load" and event.error is None
+            assert 0 <= event.latency <= event.delay
+            assert triton.get_client().is_model_ready("model_1")
+
+            shutil.rmtree(tmp_path / "model_2")
+            event = watcher.wait_for_reload("model_2", timeout=5)
+            assert event.action == "unload"
+            assert not triton.get_client().is_model_ready("model_2")
+
+        assert [event.model for event in watcher.reloads] == ["model_1", "model_2"]
+        assert loads == watcher.reloads
@@ -1,5 +1,71 @@
-from .triton import TritonContainer, VolumeMapping
-from .command import TritonCommand
+"""
+Public names are loaded lazily on first access, so that importing the package
+does not pull docker, testcontainers, tritonclient and pydantic for users of
+e.g. `DockerfileBuilder` only.
+"""
+import importlib
+from typing import TYPE_CHECKING
 
-from .dockerfile_builder import DockerfileBuilder
-from .image_builder import ImageBuilder, BuildOptions, ContainerLimits
\ No newline at end of file
+_LAZY_ATTRIBUTES = {
+    "TritonContainer": ".triton",
+    "VolumeMapping": ".triton",
+    "ResourceLimits": ".triton",
+    "RESOURCE_PRESETS": ".triton",
+    "TritonCommand": ".command",
+    "TraceConfig": ".command",
+    "TraceAnalysis": ".trace",
+    "LogFollower": ".logs",
+    "LogEvent": ".logs",
+    "MockTritonServer": ".mock_server",
+    "SyntheticModel": ".repository",
+    "TrafficRecorder": ".traffic",
+    "TrafficRecording": ".traffic",
+    "RecordingClient": ".traffic",
+    "ResultStore": ".results",
+    "StatisticsProfiler": ".stats",
+    "ResourceMonitor": ".monitor",
+    "LazyLoadingClient": ".client",
+    "TeardownManager": ".teardown",
+    "RepositoryWatcher": ".watcher",
+    "SlimTritonImage": ".composer",
+    "BenchmarkKey": ".results",
+    "BenchmarkResult": ".results",
+    "DockerfileBuilder": ".dockerfile_builder",
+    "ImageBuilder": ".image_builder",
+    "BuildOptions": ".image_builder",
+    "ContainerLimits": ".image_builder",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+if TYPE_CHECKING:
+    from .triton import TritonContainer, VolumeMapping, ResourceLimits, RESOURCE_PRESETS
+    from .command import TritonCommand, TraceConfig
+    from .trace import TraceAnalysis
+    from .logs import LogFollower, LogEvent
+    from .mock_server import MockTritonServer
+    from .repository import SyntheticModel
+    from .traffic import TrafficRecorder, TrafficRecording, RecordingClient
+    from .results import ResultStore, BenchmarkKey, BenchmarkResult
+    from .stats import StatisticsProfiler
+    from .monitor import ResourceMonitor
+    from .client import LazyLoadingClient
+    from .teardown import TeardownManager
+    from .watcher import RepositoryWatcher
+    from .composer import SlimTritonImage
+
+    from .dockerfile_builder import DockerfileBuilder
+    from .image_builder import ImageBuilder, BuildOptions, ContainerLimits
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
@@ -0,0 +1,158 @@
+"""
+This module contains batched inference over large numpy arrays: arrays are
+split into chunks of model `max_batch_size`, several requests are kept in
+flight with `async_infer` and outputs are written into preallocated arrays
+in order of rows.
+"""
+import collections
+
+import numpy as np
+
+
+def _datatype(config_type: str) -> str:
+    """
+    Tensor datatype of inference protocol by data type of model configuration
+
+    >>> _datatype("TYPE_FP32"), _datatype("TYPE_STRING")
+    ('FP32', 'BYTES')
+    """
+    datatype = config_type.removeprefix("TYPE_")
+    return "BYTES" if datatype == "STRING" else datatype
+
+
+def _cast(name: str, array, dtype: np.dtype) -> np.ndarray:
+    """
+    Array converted to datatype of model input, raises ValueError when values change
+
+    >>> _cast("INPUT0", np.array([1, 2], dtype=np.int64), np.dtype(np.int32)).dtype
+    dtype('int32')
+    >>> _cast("INPUT0", np.array([2 ** 40]), np.dtype(np.int32))
+    Traceback (most recent call last):
+    ...
+    ValueError: Input INPUT0 of int64 can't be converted to int32 of model without loss of data
+    """
+    array = np.asarray(array)
+    if np.can_cast(array.dtype, dtype, casting="safe"):
+        return array.astype(dtype, copy=False)
+
+    # narrower types are accepted as long as values survive conversion, e.g. int64 array of small integers
+    converted = array.astype(dtype)
+    with np.errstate(invalid="ignore", over="ignore"):
+        restored = converted.astype(array.dtype)
+    equal_nan = array.dtype.kind in "fc" and dtype.kind in "fc"
+    if not np.array_equal(restored, array, equal_nan=equal_nan):
+        raise ValueError(f"Input {name} of {array.dtype} can't be converted to {dtype} of model without loss of data")
+    return converted
+
+
+def _allocate(spec: dict, total: int, batching: bool) -> np.ndarray | None:
+    """
+    Array for all rows of output by its model metadata, None when shape is variable
+
+    >>> _allocate({"name": "OUTPUT0", "datatype": "FP32", "shape": [-1, 4]}, 3, batching=True).shape
+    (3, 4)
+    >>> _allocate({"name": "OUTPUT0", "datatype": "BYTES", "shape": [-1]}, 0, batching=False).dtype
+    dtype('O')
+    """
+    from tritonclient.utils import triton_to_np_dtype
+
+    shape = [int(dim) for dim in spec["shape"]]
+    if batching:
+        shape = shape[1:]
+    if any(dim < 0 for dim in shape):
+        if total:
+            return None
+        # no rows to infer variable dimensions from
+        shape = [max(dim, 0) for dim in shape]
+    return np.empty((total, *shape), dtype=triton_to_np_dtype(spec["datatype"]))
+
+
+def infer_batched(
+        client,
+        model_name: str,
+        inputs: dict[str, np.ndarray],
+        outputs: list[str] | None = None,
+        model_version: str = "",
+        batch_size: int | None = None,
+        max_in_flight: int = 4,
+        binary_data: bool = True,
+) -> dict[str, np.ndarray]:
+    """
+    Run inference over all rows of `inputs` (first axis), returns outputs with
+    the same number of rows. Batch size is `max_batch_size` of model config
+    unless smaller `batch_size` is given, models without batching get one
+    request per row. `outputs` defaults to all outputs of model config.
+    Inputs are converted to datatypes of model config, ValueError is raised
+    when conversion would change values (overflow, lost precision). Outputs
+    are allocated by model metadata, inputs without rows give empty outputs.
+
+    Client should be created with `concurrency` not less than `max_in_flight`,
+    otherwise requests are queued by client, e.g.
+        infer_batched(triton.get_client(concurrency=8), "simple", inputs, max_in_flight=8)
+    """
+    import tritonclient.http as tritonhttpclient
+    from tritonclient.utils import triton_to_np_dtype
+
+    config = client.get_model_config(model_name, model_version)
+    max_batch_size = config.get("max_batch_size", 0)
+    datatypes = {spec["name"]: _datatype(spec["data_type"]) for spec in config.get("input", [])}
+    output_names = outputs or [spec["name"] for spec in config.get("output", [])]
+    output_specs = {spec["name"]: spec for spec in client.get_model_metadata(model_name, model_version)["outputs"]}
+
+    unknown = set(inputs) - set(datatypes)
+    if unknown:
+        raise ValueError(f"Model {model_name} has no inputs {sorted(unknown)}")
+    unknown = set(output_names) - set(output_specs)
+    if unknown:
+        raise ValueError(f"Model {model_name} has no outputs {sorted(unknown)}")
+
+    rows = {len(array) for array in inputs.values()}
+    if len(rows) != 1:
+        raise ValueError(f"All inputs must have the same number of rows, got {sorted(rows)}")
+    total = rows.pop()
+
+    batching = max_batch_size > 0
+    chunk = min(batch_size or max_batch_size, max_batch_size) if batching else 1
+    arrays = {
+        name: _cast(name, array, np.dtype(triton_to_np_dtype(datatypes[name]))) for name, array in inputs.items()
+    }
+    requested = [tritonhttpclient.InferRequestedOutput(name, binary_data=binary_data) for name in output_names]
+
+    # outputs of variable shape are allocated by first result
+    results = {
+        name: array for name in output_names
+        if (array := _allocate(output_specs[name], total, batching)) is not None
+    }
+    pending: collections.deque = collections.deque()
+
+    def collect() -> None:
+        start, stop, request = pending.popleft()
+        result = request.get_result()
+        for name in output_names:
+            value = result.as_numpy(name)
+            if not batching:
+                value = value[np.newaxis]
+            if name not in results:
+                results[name] = np.empty((total, *value.shape[1:]), dtype=value.dtype)
+            results[name][start:stop] = value
+
+    for start in range(0, total, chunk):
+        stop = min(start + chunk, total)
+
+        request_inputs = []
+        for name, array in arrays.items():
+            data = array[start:stop] if batching else np.asarray(array[start])
+            infer_input = tritonhttpclient.InferInput(name, list(data.shape), datatypes[name])
+            infer_input.set_data_from_numpy(data, binary_data=binary_data)
+            request_inputs.append(infer_input)
+
+        if len(pending) >= max_in_flight:
+            collect()
+
+        request = client.async_infer(model_name, request_inputs, model_version=model_version, outputs=requested)
+        pending.append((start, stop, request))
+
+    while pending:
+        collect()
+
+    return results
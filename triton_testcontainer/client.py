@@ -0,0 +1,211 @@
+"""
+This module contains the class LazyLoadingClient, a proxy of tritonclient
+that loads model through repository API transparently on first use.
+Intended for servers started in explicit model control mode.
+"""
+import threading
+import collections
+from typing import Callable
+
+
+class ModelLoader:
+    """
+    State of models loaded on demand, shared by all lazy clients of a server,
+    so that concurrent first requests wait on a single load.
+
+    With `memory_budget` (bytes) memory footprint of each model is sampled
+    with `memory_probe` before and after load, and least recently used models
+    are unloaded when loading another one would exceed the budget. Loads are
+    serialized in this case to keep samples accurate. Models with requests in
+    flight are not unloaded. Models found loaded (on startup or by other
+    clients) are used as is: their footprint is unknown, so they are not
+    counted against the budget and never unloaded to make room.
+    """
+
+    def __init__(self, memory_budget: int | None = None, memory_probe: Callable[[], int] | None = None) -> None:
+        if memory_budget is not None and memory_probe is None:
+            raise ValueError("memory_probe is required when memory_budget is set")
+
+        self.memory_budget = memory_budget
+        self.memory_probe = memory_probe
+        # model name -> memory footprint in bytes, least recently used first
+        self.loaded: collections.OrderedDict[str, int] = collections.OrderedDict()
+        self.footprints: dict[str, int] = {}
+        # models found loaded, not managed by loader
+        self.preloaded: set[str] = set()
+        # model name -> number of requests in flight
+        self.in_use: collections.Counter[str] = collections.Counter()
+        self.evicted: list[str] = []
+        self._locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def _model_lock(self, model_name: str) -> threading.Lock:
+        if self.memory_budget is not None:
+            return self._load_lock
+        with self._lock:
+            return self._locks.setdefault(model_name, threading.Lock())
+
+    def _touch(self, model_name: str, acquire: bool = False) -> bool:
+        with self._lock:
+            if model_name in self.loaded:
+                self.loaded.move_to_end(model_name)
+            elif model_name not in self.preloaded:
+                return False
+            if acquire:
+                self.in_use[model_name] += 1
+            return True
+
+    @property
+    def memory_used(self) -> int:
+        with self._lock:
+            return sum(self.loaded.values())
+
+    def estimate(self, model_name: str) -> int:
+        """Footprint of previous load, or average footprint of known models"""
+        if model_name in self.footprints:
+            return self.footprints[model_name]
+        if self.footprints:
+            return sum(self.footprints.values()) // len(self.footprints)
+        return 0
+
+    def ensure_loaded(self, client, model_name: str, acquire: bool = False) -> None:
+        """Load model unless it is loaded, with `acquire` it is marked in use until `release`"""
+        if self._touch(model_name, acquire):
+            return
+
+        with self._model_lock(model_name):
+            if self._touch(model_name, acquire):
+                return
+            if client.is_model_ready(model_name):
+                with self._lock:
+                    self.preloaded.add(model_name)
+            else:
+                self._load(client, model_name)
+            self._touch(model_name, acquire)
+
+    def release(self, model_name: str) -> None:
+        with self._lock:
+            self.in_use[model_name] -= 1
+            if self.in_use[model_name] <= 0:
+                del self.in_use[model_name]
+
+    def _load(self, client, model_name: str, *args, **kwargs) -> None:
+        if self.memory_budget is None:
+            client.load_model(model_name, *args, **kwargs)
+            with self._lock:
+                self.loaded[model_name] = 0
+            return
+
+        self._make_room(client, model_name, self.estimate(model_name))
+
+        before = self.memory_probe()
+        client.load_model(model_name, *args, **kwargs)
+        footprint = max(0, self.memory_probe() - before)
+
+        with self._lock:
+            self.footprints[model_name] = footprint
+            self.loaded[model_name] = footprint
+            self.loaded.move_to_end(model_name)
+
+    def _make_room(self, client, model_name: str, required: int) -> None:
+        while self.memory_used + required > self.memory_budget:
+            with self._lock:
+                candidates = [name for name in self.loaded if name != model_name and not self.in_use[name]]
+                if not candidates:
+                    return
+                victim = candidates[0]
+                del self.loaded[victim]
+            client.unload_model(victim)
+            self.evicted.append(victim)
+
+    def clear(self) -> None:
+        """Forget loaded models, e.g. after server reset, footprints are kept as estimates"""
+        with self._lock:
+            self.loaded.clear()
+            self.preloaded.clear()
+
+    def load(self, client, model_name: str, *args, **kwargs) -> None:
+        with self._model_lock(model_name):
+            self._load(client, model_name, *args, **kwargs)
+
+    def unload(self, client, model_name: str, *args, **kwargs) -> None:
+        with self._model_lock(model_name):
+            client.unload_model(model_name, *args, **kwargs)
+            with self._lock:
+                self.loaded.pop(model_name, None)
+                self.preloaded.discard(model_name)
+
+
+class _InUseRequest:
+    """Async request that calls `release` once its result is collected"""
+
+    def __init__(self, request, release: Callable[[], None]) -> None:
+        self._request = request
+        self._release: Callable[[], None] | None = release
+
+    def get_result(self, *args, **kwargs):
+        try:
+            result = self._request.get_result(*args, **kwargs)
+        except Exception:
+            # request is still in flight when result is not received in timeout
+            greenlet = getattr(self._request, "_greenlet", None)
+            if greenlet is None or greenlet.ready():
+                self._release_once()
+            raise
+        self._release_once()
+        return result
+
+    def _release_once(self) -> None:
+        if self._release is not None:
+            release, self._release = self._release, None
+            release()
+
+    def __getattr__(self, name: str):
+        return getattr(self._request, name)
+
+
+class LazyLoadingClient:
+    """
+    Wraps `tritonclient.http.InferenceServerClient`, `infer` and `async_infer`
+    load model first if it is not loaded yet and mark it as recently used.
+    Model is kept in use until `infer` returns, or until `get_result` of the
+    request returned by `async_infer` returns. Other methods are delegated.
+
+    Example:
+        triton_client = triton.get_client(lazy_loading=True)
+        triton_client.infer("simple", inputs)  # loads "simple" before first inference
+    """
+
+    def __init__(self, client, loader: ModelLoader | None = None) -> None:
+        self._client = client
+        self._loader = loader if loader is not None else ModelLoader()
+
+    @property
+    def client(self):
+        return self._client
+
+    def infer(self, model_name: str, *args, **kwargs):
+        self._loader.ensure_loaded(self._client, model_name, acquire=True)
+        try:
+            return self._client.infer(model_name, *args, **kwargs)
+        finally:
+            self._loader.release(model_name)
+
+    def async_infer(self, model_name: str, *args, **kwargs):
+        self._loader.ensure_loaded(self._client, model_name, acquire=True)
+        try:
+            request = self._client.async_infer(model_name, *args, **kwargs)
+        except BaseException:
+            self._loader.release(model_name)
+            raise
+        return _InUseRequest(request, lambda: self._loader.release(model_name))
+
+    def load_model(self, model_name: str, *args, **kwargs) -> None:
+        self._loader.load(self._client, model_name, *args, **kwargs)
+
+    def unload_model(self, model_name: str, *args, **kwargs) -> None:
+        self._loader.unload(self._client, model_name, *args, **kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
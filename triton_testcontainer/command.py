@@ -7,6 +7,37 @@ from pydantic import BaseModel, Field, ConfigDict
 
 FlagType = TypeVar("FlagType", None, Literal[True])
 
+TraceLevel: TypeAlias = Literal["OFF", "TIMESTAMPS", "TENSORS"]
+
+
+class TraceConfig(BaseModel):
+    """
+    Options of `--trace-config`, `file` and `log_frequency` are settings of triton trace mode
+
+    >>> TraceConfig(level="TIMESTAMPS", rate=1, file="/tmp/trace.json").build()
+    '--trace-config level=TIMESTAMPS --trace-config rate=1 --trace-config triton,file=/tmp/trace.json'
+    """
+    mode: None | Literal["triton", "opentelemetry"] = None
+    level: None | TraceLevel | list[TraceLevel] = None
+    rate: None | int = None
+    count: None | int = None
+    file: None | str = None
+    log_frequency: None | int = None
+
+    def build(self) -> str:
+        settings = []
+
+        for fld, val in iter(self):
+            if val is None:
+                continue
+            name = fld.replace("_", "-")
+            prefix = "triton," if fld in ("file", "log_frequency") else ""
+            values = val if isinstance(val, list) else [val]
+            settings.extend(f"--trace-config {prefix}{name}={value}" for value in values)
+
+        return " ".join(settings)
+
+
 class TritonCommand(BaseModel):
     """
     This class implements generation of valid tritonserver cli command using
@@ -49,9 +80,11 @@ class TritonCommand(BaseModel):
 
     # HTTP
     # allow_http: None | Literal[True] = None
+    http_port: None | int = None
 
     # GRPS
     # allow_grpc: None | Literal[True] = None
+    grpc_port: None | int = None
 
     # Sagemaker
 
@@ -59,8 +92,10 @@ class TritonCommand(BaseModel):
 
     # Metrics
     allow_metrics: None | bool = None
+    metrics_port: None | int = None
 
     # Tracing
+    trace_config: None | TraceConfig = None
 
     # Backend
 
@@ -74,6 +109,8 @@ class TritonCommand(BaseModel):
 
 
     def build(self):
+        # options are appended to fresh command, so that instance can be built again
+        self._command = "tritonserver"
         for fld, val in iter(self):
             annotation = str(type(self).model_fields[fld].annotation)
             self._append_option(fld, val, annotation)
@@ -87,6 +124,10 @@ class TritonCommand(BaseModel):
                 option = f"--{_name}" if "FlagType" in annotation else f"--{_name}={int(value)}"
             case str() | int():
                 option = f"--{_name}={value}"
+            case TraceConfig():
+                option = value.build()
+                if not option:
+                    return
             case list():
                 option = " ".join([f"--{_name}={v}" for v in value])
             case None:
@@ -0,0 +1,120 @@
+"""
+This module contains the class SlimTritonImage that composes custom
+tritonserver image with selected backends and repository agents only, in the
+spirit of `compose.py` of tritonserver repository: `/opt/tritonserver` of
+full image is copied into minimal runtime stage without unused backends.
+"""
+
+from .dockerfile_builder import DockerfileBuilder
+from .image_builder import ImageBuilder, BuildOptions
+
+TRITONSERVER_DIR = "/opt/tritonserver"
+
+# runtime dependencies of tritonserver core, build tools of tritonserver `build.py` are omitted
+CORE_PACKAGES = [
+    "curl",
+    "libb64-0d",
+    "libcurl4-openssl-dev",
+    "libgoogle-perftools-dev",
+    "libjemalloc-dev",
+    "libnuma-dev",
+    "libre2-9",
+    "libssl-dev",
+]
+
+BACKEND_PACKAGES: dict[str, list[str]] = {
+    "python": ["python3", "libarchive-dev", "python3-pip", "libpython3-dev"],
+    "onnxruntime": ["libgomp1"],
+    "pytorch": ["libgomp1"],
+}
+
+
+class SlimTritonImage:
+    """
+    Compose and build tritonserver image with selected backends.
+
+    Example:
+        slim = SlimTritonImage(backends=["onnxruntime", "python"], repository_agents=["checksum"])
+        slim.build()
+        with TritonContainer(repository=slim.repository, tag=slim.tag) as triton:
+            ...
+    """
+
+    def __init__(
+            self,
+            backends: list[str],
+            repository_agents: list[str] | None = None,
+            base_repository: str = "nvcr.io/nvidia/tritonserver",
+            base_tag: str = "24.01-py3",
+            runtime_image: str | None = None,
+            runtime_packages: list[str] | None = None,
+            repository: str = "localhost/tritonserver-slim",
+            tag: str | None = None,
+    ) -> None:
+        if not backends:
+            raise ValueError("At least one backend is required")
+
+        self.backends = list(backends)
+        self.repository_agents = list(repository_agents or [])
+        self.base_image = f"{base_repository}:{base_tag}"
+        # `-min` image is the base that full tritonserver image is built from
+        self.runtime_image = runtime_image or f"{base_repository}:{base_tag}-min"
+        self.runtime_packages = runtime_packages if runtime_packages is not None else self._default_packages()
+        self.repository = repository
+        self.tag = tag or "-".join([base_tag, *sorted(self.backends)])
+
+    def _default_packages(self) -> list[str]:
+        packages = list(CORE_PACKAGES)
+        for backend in self.backends:
+            packages.extend(package for package in BACKEND_PACKAGES.get(backend, []) if package not in packages)
+        return packages
+
+    def dockerfile(self) -> str:
+        dockerfile = (DockerfileBuilder()
+                      .from_(self.base_image, as_name="full")
+                      .from_(self.runtime_image)
+                      .env(key="DEBIAN_FRONTEND", value="noninteractive"))
+
+        if self.runtime_packages:
+            dockerfile.run(user_directive=(
+                "apt-get update && apt-get install -y --no-install-recommends "
+                f"{' '.join(self.runtime_packages)} && rm -rf /var/lib/apt/lists/*"
+            ))
+
+        if "python" in self.backends:
+            dockerfile.run(user_directive="pip3 install --no-cache-dir --upgrade numpy")
+
+        for directory in ("bin", "lib", "caches"):
+            dockerfile.copy(src=f"{TRITONSERVER_DIR}/{directory}", dest=f"{TRITONSERVER_DIR}/{directory}", from_="full")
+
+        for backend in self.backends:
+            path = f"{TRITONSERVER_DIR}/backends/{backend}"
+            dockerfile.copy(src=path, dest=path, from_="full")
+
+        for agent in self.repository_agents:
+            path = f"{TRITONSERVER_DIR}/repoagents/{agent}"
+            dockerfile.copy(src=path, dest=path, from_="full")
+
+        library_path = f"{TRITONSERVER_DIR}/lib"
+        if "onnxruntime" in self.backends:
+            library_path = f"{TRITONSERVER_DIR}/backends/onnxruntime:{library_path}"
+
+        return (dockerfile
+                .env(key="PATH", value=f"{TRITONSERVER_DIR}/bin:${{PATH}}")
+                .env(key="LD_LIBRARY_PATH", value=f"{library_path}:${{LD_LIBRARY_PATH}}")
+                .workdir(TRITONSERVER_DIR)
+                .build())
+
+    @property
+    def image(self) -> str:
+        return f"{self.repository}:{self.tag}"
+
+    def image_builder(self, options: BuildOptions = BuildOptions(), **kwargs) -> ImageBuilder:
+        """ImageBuilder of composed image, without build context since all files come from base image"""
+        # docker sends only dockerfile given as string as build context, directory would be left unused
+        return ImageBuilder(tag=self.image, **kwargs).from_string(
+            context=None, string_dockerfile=self.dockerfile(), options=options
+        )
+
+    def build(self, options: BuildOptions = BuildOptions(), **kwargs):
+        return self.image_builder(options, **kwargs).build()
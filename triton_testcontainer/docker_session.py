@@ -0,0 +1,136 @@
+"""
+This module contains process-wide docker client shared by ImageBuilder and
+TritonContainer, so that they reuse single connection pool to the daemon,
+and instrumentation of docker API calls made through it.
+"""
+import re
+import threading
+import collections
+from urllib.parse import urlsplit
+
+from testcontainers.core.docker_client import DockerClient
+
+# collections whose second path segment is object id, e.g. /containers/{id}/json
+_ID_COLLECTIONS = {"containers", "exec", "networks", "volumes", "plugins", "services", "tasks", "secrets", "configs",
+                   "nodes", "distribution"}
+_COLLECTION_ENDPOINTS = {"json", "create", "prune", "load", "search", "get"}
+_IMAGE_ENDPOINTS = {"json", "history", "push", "tag", "get"}
+
+
+def normalize_endpoint(method: str, url: str) -> str:
+    """
+    Docker API endpoint of request with api version and object ids stripped
+
+    >>> normalize_endpoint("GET", "http+docker://localhost/v1.43/containers/4f2c/json?size=0")
+    'GET /containers/{id}/json'
+    >>> normalize_endpoint("POST", "http+docker://localhost/v1.43/containers/create?name=tritonserver")
+    'POST /containers/create'
+    >>> normalize_endpoint("GET", "http+docker://localhost/v1.43/images/localhost/image_builder:latest/json")
+    'GET /images/{name}/json'
+    >>> normalize_endpoint("DELETE", "http+docker://localhost/v1.43/images/sha256:1234")
+    'DELETE /images/{name}'
+    """
+    path = re.sub(r"^/v\d+\.\d+", "", urlsplit(url).path)
+    parts = path.strip("/").split("/")
+
+    if len(parts) >= 2 and parts[1] not in _COLLECTION_ENDPOINTS:
+        if parts[0] == "images":
+            tail = [parts[-1]] if len(parts) > 2 and parts[-1] in _IMAGE_ENDPOINTS else []
+            parts = ["images", "{name}", *tail]
+        elif parts[0] in _ID_COLLECTIONS:
+            parts[1] = "{id}"
+
+    return f"{method} /{'/'.join(parts)}"
+
+
+class DockerApiStats:
+    """
+    Count and latency (time until response headers) of docker API calls by
+    endpoint, installed as `requests` response hook of docker client.
+    """
+
+    def __init__(self) -> None:
+        self._latencies: dict[str, list[float]] = collections.defaultdict(list)
+        self._lock = threading.Lock()
+
+    def __call__(self, response, *args, **kwargs):
+        request = response.request
+        self.record(normalize_endpoint(request.method, request.url), response.elapsed.total_seconds())
+        return response
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        with self._lock:
+            self._latencies[endpoint].append(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._latencies.clear()
+
+    @property
+    def calls(self) -> dict[str, int]:
+        with self._lock:
+            return {endpoint: len(latencies) for endpoint, latencies in self._latencies.items()}
+
+    def latencies(self, endpoint: str | None = None) -> list[float]:
+        """Seconds of each call to `endpoint`, or of all calls in order of endpoints"""
+        with self._lock:
+            if endpoint is not None:
+                return list(self._latencies.get(endpoint, []))
+            return [latency for latencies in self._latencies.values() for latency in latencies]
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {
+                endpoint: {
+                    "count": len(latencies),
+                    "total": sum(latencies),
+                    "mean": sum(latencies) / len(latencies),
+                    "max": max(latencies),
+                }
+                for endpoint, latencies in self._latencies.items()
+            }
+
+    def report(self) -> str:
+        lines = [f"{'endpoint':<48} {'count':>6} {'total ms':>10} {'mean ms':>10} {'max ms':>10}"]
+        for endpoint, stats in sorted(self.summary().items(), key=lambda item: -item[1]["total"]):
+            lines.append(f"{endpoint:<48} {stats['count']:>6} {stats['total'] * 1000:>10.2f} "
+                         f"{stats['mean'] * 1000:>10.2f} {stats['max'] * 1000:>10.2f}")
+        return "\n".join(lines)
+
+
+api_stats = DockerApiStats()
+
+_shared_client: DockerClient | None = None
+_shared_lock = threading.Lock()
+
+
+def instrument(client: DockerClient, stats: DockerApiStats = api_stats) -> DockerApiStats:
+    hooks = client.client.api.hooks.setdefault("response", [])
+    if stats not in hooks:
+        hooks.append(stats)
+    return stats
+
+
+def get_docker_client() -> DockerClient:
+    """Process-wide docker client, created on first use and instrumented with `api_stats`"""
+    global _shared_client
+
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = DockerClient()
+            instrument(_shared_client)
+        return _shared_client
+
+
+def set_docker_client(client: DockerClient | None) -> None:
+    """Override process-wide docker client, None resets it to default one"""
+    global _shared_client
+
+    with _shared_lock:
+        _shared_client = client
+        if client is not None:
+            instrument(client)
@@ -1,5 +1,6 @@
 from typing import Optional, Any, TypedDict
 import io
+import os
 import functools
 from contextlib import contextmanager
 
@@ -7,6 +8,9 @@ from dataclasses import dataclass, asdict, field
 from docker.models.images import ImageCollection, Image
 from testcontainers.core.docker_client import DockerClient
 
+from .docker_session import get_docker_client
+from .layers import ImageLayerReport, analyze_image
+
 
 class ContainerLimits(TypedDict):
     memory: int
@@ -54,7 +58,8 @@ class ImageBuilder:
             reuse: bool = False,
             **kwargs: dict
     ):
-        self._docker = DockerClient(**(docker_client_kw or {}))
+        # own client only when explicitly configured, otherwise process-wide one is reused
+        self._docker = DockerClient(**docker_client_kw) if docker_client_kw else get_docker_client()
         self._image = None
         self._context = None
         self._dockerfile_path = None
@@ -114,11 +119,27 @@ class ImageBuilder:
 
         return self.image
 
+    def dockerfile(self) -> str | None:
+        """Text of dockerfile image is built from"""
+        if self._string_dockerfile is not None:
+            return self._string_dockerfile.getvalue().decode("utf-8")
+        if self._dockerfile_path is not None:
+            with open(os.path.join(self._context, self._dockerfile_path), encoding="utf-8") as file:
+                return file.read()
+        return None
+
+    def layer_report(self, inspect_files: bool = False) -> ImageLayerReport:
+        """Sizes of layers of built image matched to dockerfile instructions, see `layers.analyze_image`"""
+        return analyze_image(self.image, dockerfile=self.dockerfile(), inspect_files=inspect_files)
+
+    @property
+    def force_remove(self) -> bool:
+        """Whether image is removed with `force`, as given by `force` keyword argument"""
+        return bool(self._kwargs.get("force", False))
+
     @functools.wraps(Image.remove)
     def remove(self):
-        force = False
-        if "force" in self._kwargs:
-            force = self._kwargs.get("force")
+        force = self.force_remove
 
         no_prune = False
         if "noprune" in self._kwargs:
@@ -0,0 +1,298 @@
+"""
+This module contains layer size analysis of docker images: size of each
+layer, Dockerfile instruction that created it and likely waste such as
+package caches, files overwritten or deleted by later layers.
+"""
+import io
+import re
+import json
+import tarfile
+import posixpath
+from dataclasses import dataclass, field
+from typing import Iterator
+
+# (pattern of command, pattern of cleanup in the same layer, message)
+_CACHE_RULES: list[tuple[re.Pattern, re.Pattern, str]] = [
+    (re.compile(r"apt-get (?:-\S+ )*install"), re.compile(r"rm -rf /var/lib/apt/lists"),
+     "apt lists are kept, add `rm -rf /var/lib/apt/lists/*` to the same RUN"),
+    (re.compile(r"pip3? install"), re.compile(r"--no-cache-dir|PIP_NO_CACHE_DIR|pip3? cache purge"),
+     "pip cache is kept, use `pip install --no-cache-dir`"),
+    (re.compile(r"conda (?:install|create|env)"), re.compile(r"conda clean"),
+     "conda packages cache is kept, add `conda clean -afy` to the same RUN"),
+    (re.compile(r"(?:yum|dnf) install"), re.compile(r"(?:yum|dnf) clean all"),
+     "package manager cache is kept, add `yum clean all` to the same RUN"),
+    (re.compile(r"apk add"), re.compile(r"--no-cache"),
+     "apk cache is kept, use `apk add --no-cache`"),
+]
+
+_CACHE_DIRECTORIES = ("var/lib/apt/lists/", "var/cache/apt/", "root/.cache/", "var/cache/yum/", "var/cache/dnf/",
+                      "opt/conda/pkgs/", "tmp/")
+
+# files smaller than that are read into memory while reading `docker save` archive
+_IN_MEMORY_LIMIT = 16 * 1024 * 1024
+
+
+@dataclass
+class LayerInfo:
+    index: int
+    created_by: str
+    size: int
+    share: float
+    instruction: str | None = None
+
+
+@dataclass
+class WasteFinding:
+    kind: str
+    message: str
+    layer: int | None = None
+    size: int = 0
+
+
+@dataclass
+class ImageLayerReport:
+    image: str
+    layers: list[LayerInfo]
+    findings: list[WasteFinding] = field(default_factory=list)
+
+    @property
+    def total_size(self) -> int:
+        return sum(layer.size for layer in self.layers)
+
+    @property
+    def wasted_size(self) -> int:
+        return sum(finding.size for finding in self.findings)
+
+    def top(self, n: int = 5) -> list[LayerInfo]:
+        return sorted(self.layers, key=lambda layer: -layer.size)[:n]
+
+    def __str__(self) -> str:
+        lines = [f"{self.image}: {_human(self.total_size)} in {len(self.layers)} layers"]
+        for layer in self.top(len(self.layers)):
+            if not layer.size:
+                continue
+            source = layer.instruction or layer.created_by
+            lines.append(f"  #{layer.index:<3} {_human(layer.size):>10} {layer.share:>6.1%}  {source[:100]}")
+
+        if self.findings:
+            lines.append(f"likely waste, {_human(self.wasted_size)} at least:")
+            for finding in sorted(self.findings, key=lambda finding: -finding.size):
+                layer = f"#{finding.layer} " if finding.layer is not None else ""
+                lines.append(f"  [{finding.kind}] {layer}{_human(finding.size)}: {finding.message}")
+
+        return "\n".join(lines)
+
+
+def _human(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def parse_dockerfile(dockerfile: str) -> list[str]:
+    """
+    Instructions of the last stage of dockerfile, continuation lines are joined
+
+    >>> parse_dockerfile("# syntax=docker/dockerfile:1\\nFROM a AS b\\nRUN x\\nFROM c\\nRUN apt-get update \\\\\\n  && y")
+    ['FROM c', 'RUN apt-get update && y']
+    """
+    instructions, current = [], ""
+    for line in dockerfile.splitlines():
+        stripped = line.strip()
+        if not current and (not stripped or stripped.startswith("#")):
+            continue
+        if stripped.endswith("\\"):
+            current += stripped[:-1].strip() + " "
+            continue
+        instructions.append(" ".join((current + stripped).split()))
+        current = ""
+
+    last_stage = max((i for i, line in enumerate(instructions) if line.upper().startswith("FROM ")), default=0)
+    return instructions[last_stage:]
+
+
+def _matches(instruction: str, created_by: str) -> bool:
+    keyword, _, args = instruction.partition(" ")
+    keyword = keyword.upper()
+    created_by = " ".join(created_by.split())
+
+    if keyword == "RUN":
+        # flags of RUN (--mount, --network) are not recorded in history
+        command = " ".join(token for token in args.split() if not token.startswith("--"))
+        return command in created_by
+
+    if not re.search(rf"\b{keyword}\b", created_by):
+        return False
+
+    if keyword in ("COPY", "ADD"):
+        return args.split()[-1] in created_by if args else True
+
+    return not args or args in created_by or args.split()[0].split("=")[0] in created_by
+
+
+def match_instructions(history: list[dict], instructions: list[str]) -> list[str | None]:
+    """Instruction for each history entry (oldest first), None for base image layers"""
+    matched: list[str | None] = [None] * len(history)
+    candidates = [line for line in instructions if not line.upper().startswith("FROM ")]
+    position = len(candidates) - 1
+
+    for index in range(len(history) - 1, -1, -1):
+        if position < 0:
+            break
+        for candidate in range(position, -1, -1):
+            if _matches(candidates[candidate], history[index].get("CreatedBy", "")):
+                matched[index] = candidates[candidate]
+                position = candidate - 1
+                break
+
+    return matched
+
+
+def find_cache_waste(layers: list[LayerInfo]) -> list[WasteFinding]:
+    findings = []
+    for layer in layers:
+        command = layer.created_by
+        for pattern, cleanup, message in _CACHE_RULES:
+            if pattern.search(command) and not cleanup.search(command):
+                findings.append(WasteFinding(kind="package-cache", message=message, layer=layer.index))
+        if re.search(r"apt-get update", command) and not re.search(r"apt-get (?:-\S+ )*install", command):
+            findings.append(WasteFinding(
+                kind="package-cache", layer=layer.index,
+                message="`apt-get update` in separate layer, combine it with install and cleanup",
+            ))
+    return findings
+
+
+class _ChunkReader(io.RawIOBase):
+    """File-like view of iterator of bytes chunks, e.g. result of `Image.save()`"""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+def _layer_files(fileobj) -> dict[str, int]:
+    files = {}
+    with tarfile.open(fileobj=fileobj, mode="r|*") as layer:
+        for member in layer:
+            if member.isfile() or member.issym() or member.islnk() or member.isdir():
+                name = member.name[2:] if member.name.startswith("./") else member.name
+                files[name.strip("/")] = member.size
+    return files
+
+
+def read_saved_image(chunks: Iterator[bytes]) -> tuple[list[dict], list[dict[str, int]]]:
+    """
+    Read `docker save` archive as stream, returns config history (oldest first,
+    with `empty_layer` flags) and file listing (path -> size) of each layer.
+    """
+    documents: dict[str, bytes] = {}
+    listings: dict[str, dict[str, int]] = {}
+
+    with tarfile.open(fileobj=io.BufferedReader(_ChunkReader(chunks)), mode="r|") as archive:
+        for member in archive:
+            if not member.isfile():
+                continue
+            file = archive.extractfile(member)
+            if member.size > _IN_MEMORY_LIMIT:
+                listings[member.name] = _layer_files(file)
+                continue
+            content = file.read()
+            try:
+                listings[member.name] = _layer_files(io.BytesIO(content))
+            except tarfile.TarError:
+                documents[member.name] = content
+
+    manifest = json.loads(documents["manifest.json"])[0]
+    config = json.loads(documents[manifest["Config"]])
+    return config.get("history", []), [listings.get(name, {}) for name in manifest["Layers"]]
+
+
+def find_file_waste(history: list[dict], listings: list[dict[str, int]]) -> list[WasteFinding]:
+    """Files overwritten or deleted by later layers and package caches left in layers"""
+    layer_of = [index for index, entry in enumerate(history) if not entry.get("empty_layer")]
+    findings = []
+    seen: dict[str, tuple[int, int]] = {}
+
+    for position, files in enumerate(listings):
+        index = layer_of[position] if position < len(layer_of) else None
+        cache_size = 0
+
+        for path, size in files.items():
+            directory, name = posixpath.split(path)
+            if name.startswith(".wh."):
+                # opaque whiteout hides whole content of directory
+                opaque = name == ".wh..wh..opq"
+                removed = directory if opaque else posixpath.join(directory, name[len(".wh."):])
+                hidden = [p for p in seen if (p == removed and not opaque) or p.startswith(removed + "/")]
+                removed_size = sum(seen.pop(p)[1] for p in hidden)
+                if removed_size:
+                    findings.append(WasteFinding(
+                        kind="deleted-file", layer=index, size=removed_size,
+                        message=f"/{removed} is deleted but still stored in earlier layer",
+                    ))
+                continue
+
+            if path in seen and seen[path][1] and size:
+                findings.append(WasteFinding(
+                    kind="duplicate-file", layer=index, size=seen[path][1],
+                    message=f"/{path} overwrites file of layer #{seen[path][0]}",
+                ))
+            seen[path] = (index, size)
+
+            if path.startswith(_CACHE_DIRECTORIES):
+                cache_size += size
+
+        if cache_size:
+            findings.append(WasteFinding(
+                kind="package-cache", layer=index, size=cache_size,
+                message="package manager caches or temporary files are stored in layer",
+            ))
+
+    return findings
+
+
+def analyze_image(image, dockerfile: str | None = None, inspect_files: bool = False) -> ImageLayerReport:
+    """
+    Build report of docker `Image`. When `dockerfile` is given, layers are matched
+    to its instructions. `inspect_files` reads whole image with `Image.save()`
+    to find overwritten, deleted and cache files, which is slow for big images.
+    """
+    history = list(reversed(image.history()))
+    total = sum(entry.get("Size", 0) for entry in history) or 1
+    instructions = match_instructions(history, parse_dockerfile(dockerfile)) if dockerfile else [None] * len(history)
+
+    layers = [
+        LayerInfo(
+            index=index,
+            created_by=" ".join(entry.get("CreatedBy", "").split()),
+            size=entry.get("Size", 0),
+            share=entry.get("Size", 0) / total,
+            instruction=instruction,
+        )
+        for index, (entry, instruction) in enumerate(zip(history, instructions))
+    ]
+
+    findings = find_cache_waste(layers)
+    if inspect_files:
+        config_history, listings = read_saved_image(image.save())
+        findings.extend(find_file_waste(config_history, listings))
+
+    name = image.tags[0] if image.tags else image.id
+    return ImageLayerReport(image=name, layers=layers, findings=findings)
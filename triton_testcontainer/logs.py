@@ -0,0 +1,211 @@
+"""
+This module contains the class LogFollower that follows tritonserver logs in
+background thread, keeps the most recent lines in bounded ring buffer and
+parses well known lines into timestamped events.
+"""
+import re
+import time
+import threading
+import collections
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Iterable, Literal, TextIO
+
+EventKind = Literal[
+    "model_loading",
+    "model_loaded",
+    "model_load_failed",
+    "model_unloaded",
+    "backend_loaded",
+    "server_started",
+]
+
+_EVENT_PATTERNS: list[tuple[EventKind, re.Pattern]] = [
+    ("model_loading", re.compile(r"\] loading: (?P<model>[^:\s]+):(?P<version>\d+)")),
+    ("model_loaded", re.compile(r"successfully loaded '(?P<model>[^']+)'(?: version (?P<version>\d+))?")),
+    ("model_load_failed", re.compile(r"failed to load '(?P<model>[^']+)'(?: version (?P<version>\d+))?: (?P<detail>.*)")),
+    ("model_unloaded", re.compile(r"successfully unloaded '(?P<model>[^']+)'(?: version (?P<version>\d+))?")),
+    ("backend_loaded", re.compile(r"TRITONBACKEND_Initialize: (?P<detail>\S+)")),
+    ("server_started", re.compile(r"Started (?P<detail>\w+(?: \w+)?) at \S+")),
+]
+
+
+@dataclass
+class LogEvent:
+    kind: EventKind
+    timestamp: float
+    line: str
+    model: str | None = None
+    version: int | None = None
+    detail: str | None = None
+
+
+def parse_log_line(line: str, timestamp: float) -> LogEvent | None:
+    """
+    Parse tritonserver log line into event, returns None for lines that are not recognized
+
+    >>> parse_log_line("I0419 model_lifecycle.cc:469] loading: simple:1", 0.0).kind
+    'model_loading'
+    >>> parse_log_line("I0419 model_lifecycle.cc:835] successfully loaded 'simple'", 0.0).model
+    'simple'
+    >>> parse_log_line("I0419 grpc_server.cc:2495] Started GRPCInferenceService at 0.0.0.0:8001", 0.0).detail
+    'GRPCInferenceService'
+    >>> parse_log_line("I0419 server.cc:677] Waiting for in-flight requests to complete.", 0.0) is None
+    True
+    """
+    for kind, pattern in _EVENT_PATTERNS:
+        match = pattern.search(line)
+        if match is None:
+            continue
+
+        groups = match.groupdict()
+        version = groups.get("version")
+
+        return LogEvent(
+            kind=kind,
+            timestamp=timestamp,
+            line=line,
+            model=groups.get("model"),
+            version=int(version) if version else None,
+            detail=groups.get("detail"),
+        )
+
+    return None
+
+
+def _split_docker_timestamp(line: str) -> tuple[float, str]:
+    # docker prefixes lines with RFC3339Nano timestamp when `timestamps=True`
+    stamp, _, text = line.partition(" ")
+    seconds, _, fraction = stamp.rstrip("Z").partition(".")
+    try:
+        parsed = datetime.fromisoformat(f"{seconds}+00:00")
+    except ValueError:
+        return time.time(), line
+    return parsed.timestamp() + float(f"0.{fraction or 0}"), text
+
+
+class LogFollower:
+    """
+    Follow container logs in background thread.
+
+    Last `maxlen` lines and `max_events` events are kept.
+
+    Example:
+        follower = LogFollower(maxlen=1000, spill_path="triton.log")
+        with TritonContainer(log_follower=follower) as triton:
+            print(follower.load_durations())
+            cursor = follower.event_count
+            triton.get_client().load_model("simple")
+            follower.wait_for("model_loaded", "simple", after=cursor)
+    """
+
+    def __init__(self, maxlen: int = 10_000, spill_path: str | None = None, max_events: int = 10_000) -> None:
+        self._lines: collections.deque[str] = collections.deque(maxlen=maxlen)
+        self._events: collections.deque[LogEvent] = collections.deque(maxlen=max_events)
+        # number of events observed, including ones dropped from `_events`
+        self._event_count = 0
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._spill_path = spill_path
+        self._spill: TextIO | None = None
+
+    def attach(self, container) -> "LogFollower":
+        """Start following logs of started testcontainers container"""
+        stream = container.get_wrapped_container().logs(stream=True, follow=True, timestamps=True)
+
+        if self._spill_path:
+            self._spill = open(self._spill_path, "a", encoding="utf-8")
+
+        self._thread = threading.Thread(
+            target=self._follow, args=(stream,), name="triton-log-follower", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Wait until log stream is exhausted, stream ends when container is removed"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+        # follower thread may still be in `feed` when join times out
+        with self._condition:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+    def _follow(self, stream: Iterable[bytes]) -> None:
+        pending = b""
+        for chunk in stream:
+            pending += chunk
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                self.feed(*_split_docker_timestamp(line.decode("utf-8", errors="replace")))
+
+        if pending:
+            self.feed(*_split_docker_timestamp(pending.decode("utf-8", errors="replace")))
+
+    def feed(self, timestamp: float, line: str) -> LogEvent | None:
+        """Consume single log line"""
+        line = line.rstrip("\r")
+        event = parse_log_line(line, timestamp)
+
+        with self._condition:
+            self._lines.append(line)
+            if self._spill is not None:
+                self._spill.write(line + "\n")
+            if event is not None:
+                self._events.append(event)
+                self._event_count += 1
+                self._condition.notify_all()
+
+        return event
+
+    def tail(self, n: int | None = None) -> list[str]:
+        """Return last `n` lines kept in buffer"""
+        with self._condition:
+            lines = list(self._lines)
+        return lines if n is None else lines[-n:]
+
+    def events(self, kind: EventKind | None = None, model: str | None = None) -> list[LogEvent]:
+        with self._condition:
+            return [
+                event for event in self._events
+                if (kind is None or event.kind == kind) and (model is None or event.model == model)
+            ]
+
+    @property
+    def event_count(self) -> int:
+        """Number of events observed so far, cursor for `wait_for(after=...)`"""
+        with self._condition:
+            return self._event_count
+
+    def wait_for(
+            self, kind: EventKind, model: str | None = None, timeout: float | None = None, after: int = 0
+    ) -> LogEvent:
+        """Block until event is observed, only events after `after` observed ones match. Raises TimeoutError"""
+        with self._condition:
+            found = self._condition.wait_for(lambda: self._find(kind, model, after), timeout)
+        if not found:
+            raise TimeoutError(f"Event {kind} was not observed within {timeout} seconds")
+        return found
+
+    def _find(self, kind: EventKind, model: str | None, after: int) -> LogEvent | None:
+        first = self._event_count - len(self._events)
+        for index, event in enumerate(self._events, start=first):
+            if index >= after and event.kind == kind and (model is None or event.model == model):
+                return event
+        return None
+
+    def load_durations(self) -> dict[str, float]:
+        """Seconds between first `loading` and following `loaded` events of each model"""
+        started: dict[str, float] = {}
+        durations: dict[str, float] = {}
+
+        for event in self.events():
+            if event.kind == "model_loading":
+                started.setdefault(event.model, event.timestamp)
+            elif event.kind == "model_loaded" and event.model in started:
+                durations[event.model] = event.timestamp - started.pop(event.model)
+
+        return durations
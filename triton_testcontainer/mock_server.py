@@ -0,0 +1,540 @@
+"""
+This module contains the class MockTritonServer: in-process server that
+implements KServe v2 HTTP endpoints used by `tritonclient.http`. Models are
+plain python callables, so tests that only need the protocol can run without
+docker.
+"""
+import re
+import gzip
+import json
+import time
+import zlib
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Literal, TYPE_CHECKING
+
+import numpy as np
+from tritonclient.utils import (
+    triton_to_np_dtype,
+    serialize_byte_tensor,
+    deserialize_bytes_tensor,
+)
+
+from .stats import StatisticsProfiler
+from .tensor import TensorSpec
+from .client import ModelLoader, LazyLoadingClient
+from .reset import ServerState, capture_state, reset_server
+
+if TYPE_CHECKING:
+    import tritonclient.http as tritonhttpclient
+
+
+ModelFunction = Callable[[dict[str, np.ndarray]], dict[str, np.ndarray]]
+
+
+class MockServerError(Exception):
+    def __init__(self, message: str, status: int = 400) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class MockModel:
+    name: str
+    fn: ModelFunction
+    inputs: list[TensorSpec]
+    outputs: list[TensorSpec]
+    max_batch_size: int = 0
+    version: str = "1"
+    platform: str = "python"
+    loaded: bool = True
+    # monotonic time until which unloaded model is reported as UNLOADING, 0 for models never loaded
+    unloading_until: float = 0.0
+    inference_count: int = 0
+    execution_count: int = 0
+    inference_stats: dict[str, dict[str, int]] = field(default_factory=dict)
+    batch_stats: dict[int, dict[str, int]] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, stage: str, batch_size: int, ns: int) -> None:
+        with self._lock:
+            if stage == "success":
+                self.inference_count += batch_size
+                self.execution_count += 1
+                batch = self.batch_stats.setdefault(batch_size, {"count": 0, "ns": 0})
+                batch["count"] += 1
+                batch["ns"] += ns
+            stats = self.inference_stats.setdefault(stage, {"count": 0, "ns": 0})
+            stats["count"] += 1
+            stats["ns"] += ns
+
+    def statistics(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "version": self.version,
+                "inference_count": self.inference_count,
+                "execution_count": self.execution_count,
+                "inference_stats": {stage: dict(stats) for stage, stats in self.inference_stats.items()},
+                "batch_stats": [
+                    {"batch_size": batch_size, "compute_infer": dict(stats)}
+                    for batch_size, stats in sorted(self.batch_stats.items())
+                ],
+            }
+
+    def _shape(self, spec: TensorSpec) -> list[int]:
+        return [-1, *spec["shape"]] if self.max_batch_size > 0 else list(spec["shape"])
+
+    def metadata(self) -> dict:
+        return {
+            "name": self.name,
+            "versions": [self.version],
+            "platform": self.platform,
+            "inputs": [{**spec, "shape": self._shape(spec)} for spec in self.inputs],
+            "outputs": [{**spec, "shape": self._shape(spec)} for spec in self.outputs],
+        }
+
+    def config(self) -> dict:
+        def tensor_config(spec: TensorSpec) -> dict:
+            return {"name": spec["name"], "data_type": f"TYPE_{spec['datatype']}", "dims": list(spec["shape"])}
+
+        return {
+            "name": self.name,
+            "platform": self.platform,
+            "backend": self.platform,
+            "max_batch_size": self.max_batch_size,
+            "input": [tensor_config(spec) for spec in self.inputs],
+            "output": [tensor_config(spec) for spec in self.outputs],
+        }
+
+
+@dataclass
+class _Response:
+    status: int = 200
+    body: bytes = b""
+    headers: dict = field(default_factory=dict)
+
+
+def _json_response(payload, status: int = 200) -> _Response:
+    return _Response(status, json.dumps(payload).encode("utf-8"), {"Content-Type": "application/json"})
+
+
+def _decode_input(tensor: dict, binary: memoryview, offset: int) -> tuple[np.ndarray, int]:
+    datatype, shape = tensor["datatype"], tensor["shape"]
+    size = tensor.get("parameters", {}).get("binary_data_size")
+
+    if size is None:
+        dtype = np.object_ if datatype == "BYTES" else triton_to_np_dtype(datatype)
+        data = tensor["data"]
+        if datatype == "BYTES":
+            data = [item.encode("utf-8") if isinstance(item, str) else item for item in np.ravel(data)]
+        return np.array(data, dtype=dtype).reshape(shape), offset
+
+    raw = bytes(binary[offset:offset + size])
+    if datatype == "BYTES":
+        array = deserialize_bytes_tensor(raw)
+    else:
+        array = np.frombuffer(raw, dtype=triton_to_np_dtype(datatype))
+    return array.reshape(shape), offset + size
+
+
+def _encode_output(spec: TensorSpec, array: np.ndarray, binary: bool) -> tuple[dict, bytes]:
+    datatype = spec["datatype"]
+    output = {"name": spec["name"], "datatype": datatype, "shape": list(array.shape)}
+
+    if datatype == "BYTES":
+        array = np.asarray(array, dtype=np.object_)
+    else:
+        array = np.ascontiguousarray(array, dtype=triton_to_np_dtype(datatype))
+
+    if not binary:
+        data = array.ravel().tolist()
+        if datatype == "BYTES":
+            data = [item.decode("utf-8") if isinstance(item, bytes) else item for item in data]
+        output["data"] = data
+        return output, b""
+
+    raw = serialize_byte_tensor(array).item() if datatype == "BYTES" else array.tobytes()
+    output["parameters"] = {"binary_data_size": len(raw)}
+    return output, raw
+
+
+DEFAULT_TRACE_SETTINGS = {
+    "trace_file": "",
+    "trace_level": ["OFF"],
+    "trace_rate": "1000",
+    "trace_count": "-1",
+    "log_frequency": "0",
+    "trace_mode": "triton",
+}
+
+DEFAULT_LOG_SETTINGS = {
+    "log_file": "",
+    "log_info": True,
+    "log_warning": True,
+    "log_error": True,
+    "log_verbose_level": 0,
+    "log_format": "default",
+}
+
+
+class MockTritonServer:
+    """
+    In-process stand-in for TritonContainer, serves HTTP endpoints only:
+    `get_url` raises ValueError for "grpc" and "metrics" port names.
+
+    Example:
+        server = MockTritonServer().add_model(
+            "identity", lambda inputs: {"OUTPUT0": inputs["INPUT0"]},
+            inputs=[{"name": "INPUT0", "datatype": "FP32", "shape": [4]}],
+            outputs=[{"name": "OUTPUT0", "datatype": "FP32", "shape": [4]}],
+            max_batch_size=8,
+        )
+        with server as triton:
+            triton.get_client().infer("identity", ...)
+    """
+
+    _ROUTES: list[tuple[str, re.Pattern, str]] = [
+        ("GET", re.compile(r"^/v2/health/live$"), "_health_live"),
+        ("GET", re.compile(r"^/v2/health/ready$"), "_health_ready"),
+        ("GET", re.compile(r"^/v2$"), "_server_metadata"),
+        ("POST", re.compile(r"^/v2/repository/index$"), "_repository_index"),
+        ("POST", re.compile(r"^/v2/repository/models/(?P<name>[^/]+)/load$"), "_load"),
+        ("POST", re.compile(r"^/v2/repository/models/(?P<name>[^/]+)/unload$"), "_unload"),
+        ("GET", re.compile(r"^/v2/trace/setting$"), "_trace_settings"),
+        ("POST", re.compile(r"^/v2/trace/setting$"), "_update_trace_settings"),
+        ("GET", re.compile(r"^/v2/models/(?P<name>[^/]+)/trace/setting$"), "_trace_settings"),
+        ("POST", re.compile(r"^/v2/models/(?P<name>[^/]+)/trace/setting$"), "_update_trace_settings"),
+        ("GET", re.compile(r"^/v2/logging$"), "_log_settings"),
+        ("POST", re.compile(r"^/v2/logging$"), "_update_log_settings"),
+        ("GET", re.compile(r"^/v2/(?P<kind>system|cuda)sharedmemory(?:/region/(?P<region>[^/]+))?/status$"),
+         "_shared_memory_status"),
+        ("POST", re.compile(r"^/v2/(?P<kind>system|cuda)sharedmemory/region/(?P<region>[^/]+)/register$"),
+         "_register_shared_memory"),
+        ("POST", re.compile(r"^/v2/(?P<kind>system|cuda)sharedmemory(?:/region/(?P<region>[^/]+))?/unregister$"),
+         "_unregister_shared_memory"),
+        ("GET", re.compile(r"^/v2/models/stats$"), "_statistics"),
+        ("GET", re.compile(r"^/v2/models/(?P<name>[^/]+)(?:/versions/(?P<version>[^/]+))?/stats$"), "_statistics"),
+        ("GET", re.compile(r"^/v2/models/(?P<name>[^/]+)(?:/versions/(?P<version>[^/]+))?/ready$"), "_model_ready"),
+        ("GET", re.compile(r"^/v2/models/(?P<name>[^/]+)(?:/versions/(?P<version>[^/]+))?/config$"), "_model_config"),
+        ("POST", re.compile(r"^/v2/models/(?P<name>[^/]+)(?:/versions/(?P<version>[^/]+))?/infer$"), "_infer"),
+        ("GET", re.compile(r"^/v2/models/(?P<name>[^/]+)(?:/versions/(?P<version>[^/]+))?$"), "_model_metadata"),
+    ]
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, unload_delay: float = 0.0) -> None:
+        self.host = host
+        self.port = port
+        self.unload_delay = unload_delay
+        self.models: dict[str, MockModel] = {}
+        self.trace_settings: dict = dict(DEFAULT_TRACE_SETTINGS)
+        # model name -> settings that override global ones
+        self.model_trace_settings: dict[str, dict] = {}
+        self.log_settings: dict = dict(DEFAULT_LOG_SETTINGS)
+        # "system" | "cuda" -> region name -> status
+        self.shared_memory: dict[str, dict[str, dict]] = {"system": {}, "cuda": {}}
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+        self.model_loader = ModelLoader()
+        self.initial_state: ServerState | None = None
+
+    def add_model(
+            self,
+            name: str,
+            fn: ModelFunction,
+            inputs: list[TensorSpec],
+            outputs: list[TensorSpec],
+            max_batch_size: int = 0,
+            version: str = "1",
+            loaded: bool = True,
+    ) -> "MockTritonServer":
+        with self._lock:
+            self.models[name] = MockModel(
+                name=name,
+                fn=fn,
+                inputs=inputs,
+                outputs=outputs,
+                max_batch_size=max_batch_size,
+                version=version,
+                loaded=loaded,
+            )
+        return self
+
+    def start(self) -> "MockTritonServer":
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-triton", daemon=True)
+        self._thread.start()
+        self.initial_state = capture_state(self.get_client())
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "MockTritonServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def get_url(self, port_name: Literal["http"] | Literal["grpc"] | Literal["metrics"] = "http") -> str:
+        match port_name:
+            case "http":
+                return f"{self.host}:{self.port}"
+            case "grpc" | "metrics":
+                raise ValueError(f"Port name {port_name} is not served, MockTritonServer serves http only")
+            case _:
+                raise ValueError(f"Unknown port name {port_name}")
+
+    def get_client(
+            self, lazy_loading: bool = False, **kwargs
+    ) -> "tritonhttpclient.InferenceServerClient | LazyLoadingClient":
+        import tritonclient.http as tritonhttpclient
+
+        client = tritonhttpclient.InferenceServerClient(url=self.get_url("http"), verbose=False, **kwargs)
+
+        if lazy_loading:
+            return LazyLoadingClient(client, self.model_loader)
+
+        return client
+
+    def profile(self, models: list[str] | None = None) -> StatisticsProfiler:
+        return StatisticsProfiler(self.get_client(), models)
+
+    def reset(self, models: list[str] | None = None, timeout: float = 60.0) -> list[str]:
+        if self.initial_state is None:
+            raise RuntimeError("Server is not started")
+        loaded = reset_server(self.get_client(), self.initial_state, models, timeout=timeout)
+        self.model_loader.clear()
+        return loaded
+
+    # Request handling
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def _dispatch(self, method: str):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                match self.headers.get("Content-Encoding"):
+                    case "gzip":
+                        body = gzip.decompress(body)
+                    case "deflate":
+                        body = zlib.decompress(body)
+
+                path = self.path.split("?", 1)[0]
+                response = server._handle(method, path, dict(self.headers), body)
+
+                self.send_response(response.status)
+                for key, value in response.headers.items():
+                    self.send_header(key, str(value))
+                self.send_header("Content-Length", str(len(response.body)))
+                self.end_headers()
+                self.wfile.write(response.body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _handle(self, method: str, path: str, headers: dict, body: bytes) -> _Response:
+        for route_method, pattern, handler in self._ROUTES:
+            match = pattern.match(path)
+            if match and route_method == method:
+                try:
+                    return getattr(self, handler)(body=body, headers=headers, **match.groupdict())
+                except MockServerError as error:
+                    return _json_response({"error": str(error)}, error.status)
+                except Exception as error:
+                    return _json_response({"error": f"{type(error).__name__}: {error}"}, 500)
+
+        return _json_response({"error": f"Not found: {method} {path}"}, 404)
+
+    def _get_model(self, name: str, version: str | None = None, ready: bool = True) -> MockModel:
+        with self._lock:
+            model = self.models.get(name)
+        if model is None or (version and version != model.version):
+            raise MockServerError(f"Request for unknown model: '{name}' is not found")
+        if ready and not model.loaded:
+            raise MockServerError(f"Request for unknown model: '{name}' is not ready", 400)
+        return model
+
+    def _health_live(self, **kwargs) -> _Response:
+        return _Response()
+
+    def _health_ready(self, **kwargs) -> _Response:
+        return _Response()
+
+    def _server_metadata(self, **kwargs) -> _Response:
+        return _json_response({"name": "triton", "version": "mock", "extensions": ["model_repository"]})
+
+    def _repository_index(self, **kwargs) -> _Response:
+        with self._lock:
+            models = list(self.models.values())
+        # like server, state is reported only for models loaded since start
+        return _json_response([
+            {"name": model.name, "version": model.version, "state": self._state(model)}
+            if model.loaded or model.unloading_until else {"name": model.name, "version": model.version}
+            for model in models
+        ])
+
+    @staticmethod
+    def _state(model: MockModel) -> str:
+        if model.loaded:
+            return "READY"
+        return "UNLOADING" if time.monotonic() < model.unloading_until else "UNAVAILABLE"
+
+    def _load(self, name: str, **kwargs) -> _Response:
+        self._get_model(name, ready=False).loaded = True
+        return _Response()
+
+    def _unload(self, name: str, **kwargs) -> _Response:
+        model = self._get_model(name, ready=False)
+        if model.loaded:
+            model.unloading_until = time.monotonic() + self.unload_delay
+        model.loaded = False
+        return _Response()
+
+    def _trace_settings(self, name: str | None = None, **kwargs) -> _Response:
+        with self._lock:
+            overrides = self.model_trace_settings.get(name, {}) if name is not None else {}
+            return _json_response({**self.trace_settings, **overrides})
+
+    def _update_trace_settings(self, body: bytes, name: str | None = None, **kwargs) -> _Response:
+        if name is not None:
+            self._get_model(name, ready=False)
+
+        with self._lock:
+            for key, value in json.loads(body or b"{}").items():
+                if key not in DEFAULT_TRACE_SETTINGS:
+                    raise MockServerError(f"Unknown trace setting '{key}'")
+                if name is None:
+                    # null restores default of global setting
+                    self.trace_settings[key] = DEFAULT_TRACE_SETTINGS[key] if value is None else value
+                elif value is None:
+                    # null of model setting makes it follow global one again
+                    self.model_trace_settings.get(name, {}).pop(key, None)
+                else:
+                    self.model_trace_settings.setdefault(name, {})[key] = value
+        return self._trace_settings(name)
+
+    def _log_settings(self, **kwargs) -> _Response:
+        with self._lock:
+            return _json_response(dict(self.log_settings))
+
+    def _update_log_settings(self, body: bytes, **kwargs) -> _Response:
+        with self._lock:
+            for key, value in json.loads(body or b"{}").items():
+                if key not in DEFAULT_LOG_SETTINGS:
+                    raise MockServerError(f"Unknown log setting '{key}'")
+                self.log_settings[key] = value
+        return self._log_settings()
+
+    def _shared_memory_status(self, kind: str, region: str | None = None, **kwargs) -> _Response:
+        with self._lock:
+            regions = self.shared_memory[kind]
+            if region is not None and region not in regions:
+                raise MockServerError(f"Unable to find shared memory region: '{region}'")
+            return _json_response([status for name, status in regions.items() if region in (None, name)])
+
+    def _register_shared_memory(self, kind: str, region: str, body: bytes, **kwargs) -> _Response:
+        with self._lock:
+            if region in self.shared_memory[kind]:
+                raise MockServerError(f"shared memory region '{region}' already in manager")
+            self.shared_memory[kind][region] = {"name": region, **json.loads(body)}
+        return _Response()
+
+    def _unregister_shared_memory(self, kind: str, region: str | None = None, **kwargs) -> _Response:
+        with self._lock:
+            if region is None:
+                self.shared_memory[kind].clear()
+            else:
+                self.shared_memory[kind].pop(region, None)
+        return _Response()
+
+    def _model_ready(self, name: str, version: str | None = None, **kwargs) -> _Response:
+        try:
+            self._get_model(name, version)
+        except MockServerError:
+            return _Response(400)
+        return _Response()
+
+    def _statistics(self, name: str | None = None, version: str | None = None, **kwargs) -> _Response:
+        if name is None:
+            with self._lock:
+                models = list(self.models.values())
+        else:
+            models = [self._get_model(name, version)]
+        return _json_response({"model_stats": [model.statistics() for model in models]})
+
+    def _model_metadata(self, name: str, version: str | None = None, **kwargs) -> _Response:
+        return _json_response(self._get_model(name, version).metadata())
+
+    def _model_config(self, name: str, version: str | None = None, **kwargs) -> _Response:
+        return _json_response(self._get_model(name, version).config())
+
+    def _infer(self, name: str, body: bytes, headers: dict, version: str | None = None) -> _Response:
+        model = self._get_model(name, version)
+
+        header_length = headers.get("Inference-Header-Content-Length")
+        header_length = int(header_length) if header_length is not None else len(body)
+        request = json.loads(body[:header_length])
+        binary = memoryview(body)[header_length:]
+
+        inputs, offset = {}, 0
+        for tensor in request.get("inputs", []):
+            inputs[tensor["name"]], offset = _decode_input(tensor, binary, offset)
+
+        expected = {spec["name"] for spec in model.inputs}
+        if set(inputs) != expected:
+            raise MockServerError(f"expected inputs {sorted(expected)} for model '{name}', got {sorted(inputs)}")
+
+        batch_size = len(next(iter(inputs.values()))) if model.max_batch_size > 0 and inputs else 1
+        started = time.perf_counter_ns()
+        try:
+            results = model.fn(inputs)
+        except Exception:
+            model.record("fail", batch_size, time.perf_counter_ns() - started)
+            raise
+        elapsed = time.perf_counter_ns() - started
+        model.record("compute_infer", batch_size, elapsed)
+        model.record("success", batch_size, elapsed)
+
+        binary_default = request.get("parameters", {}).get("binary_data_output", False)
+        requested = request.get("outputs") or [{"name": spec["name"]} for spec in model.outputs]
+        specs = {spec["name"]: spec for spec in model.outputs}
+
+        outputs, buffers = [], []
+        for output in requested:
+            if output["name"] not in specs:
+                raise MockServerError(f"unexpected inference output '{output['name']}' for model '{name}'")
+            binary_output = output.get("parameters", {}).get("binary_data", binary_default)
+            encoded, raw = _encode_output(specs[output["name"]], np.asarray(results[output["name"]]), binary_output)
+            outputs.append(encoded)
+            buffers.append(raw)
+
+        payload = {"model_name": name, "model_version": model.version, "outputs": outputs}
+        if "id" in request:
+            payload["id"] = request["id"]
+
+        header = json.dumps(payload).encode("utf-8")
+        response = _Response(body=header + b"".join(buffers), headers={"Content-Type": "application/octet-stream"})
+        if any("parameters" in output for output in outputs):
+            response.headers["Inference-Header-Content-Length"] = len(header)
+        return response
@@ -0,0 +1,165 @@
+"""
+This module contains the class ResourceMonitor that samples docker stats of
+a container in background thread into numpy time series: CPU usage, memory
+RSS and page cache, network and block I/O bytes. Timestamps are `time.time()`
+so samples line up with client side request timestamps.
+"""
+import threading
+import time
+from typing import Callable
+
+import numpy as np
+
+METRICS = ("cpu_percent", "memory_rss", "memory_cache", "network_rx", "network_tx", "block_read", "block_write")
+
+# cumulative counters of docker stats, summary reports their growth within monitoring
+COUNTERS = ("network_rx", "network_tx", "block_read", "block_write")
+
+
+def _memory(memory_stats: dict) -> tuple[int, int]:
+    """
+    RSS and page cache in bytes, cgroup v1 and v2 stats are supported
+
+    >>> _memory({"stats": {"anon": 10, "file": 5}}), _memory({"stats": {"total_rss": 7, "total_cache": 3}})
+    ((10, 5), (7, 3))
+    """
+    stats = memory_stats.get("stats", {})
+    rss = stats.get("anon", stats.get("total_rss", stats.get("rss", 0)))
+    cache = stats.get("file", stats.get("total_cache", stats.get("cache", 0)))
+    return rss, cache
+
+
+def _network(stats: dict) -> tuple[int, int]:
+    networks = (stats.get("networks") or {}).values()
+    return sum(network.get("rx_bytes", 0) for network in networks), sum(network.get("tx_bytes", 0) for network in networks)
+
+
+def _block_io(stats: dict) -> tuple[int, int]:
+    entries = (stats.get("blkio_stats") or {}).get("io_service_bytes_recursive") or []
+    read = sum(entry.get("value", 0) for entry in entries if entry.get("op", "").lower() == "read")
+    write = sum(entry.get("value", 0) for entry in entries if entry.get("op", "").lower() == "write")
+    return read, write
+
+
+def _cpu_usage(cpu_stats: dict) -> tuple[int, int, int]:
+    """Container CPU time, host CPU time (both ns) and number of CPUs"""
+    total = cpu_stats.get("cpu_usage", {}).get("total_usage", 0)
+    system = cpu_stats.get("system_cpu_usage", 0)
+    cpus = cpu_stats.get("online_cpus") or len(cpu_stats.get("cpu_usage", {}).get("percpu_usage") or []) or 1
+    return total, system, cpus
+
+
+def cpu_percent(previous: dict, current: dict) -> float:
+    """
+    CPU usage between two `cpu_stats` as in `docker stats`, 100% is one CPU
+
+    >>> cpu_percent({"cpu_usage": {"total_usage": 100}, "system_cpu_usage": 1000},
+    ...             {"cpu_usage": {"total_usage": 150}, "system_cpu_usage": 1400, "online_cpus": 4})
+    50.0
+    """
+    total, system, cpus = _cpu_usage(current)
+    previous_total, previous_system, _ = _cpu_usage(previous)
+    if not previous_system or system <= previous_system:
+        return float("nan")
+    return (total - previous_total) / (system - previous_system) * cpus * 100.0
+
+
+class ResourceMonitor:
+    """
+    Sample `stats_source` (single docker stats sample, e.g.
+    `TritonContainer.container_stats`) every `interval` seconds within `with`
+    block. One-shot samples are polled since stats stream is fixed to one
+    sample per second, CPU usage is computed between consecutive samples.
+
+    Example:
+        with triton.resource_monitor(interval=0.2) as monitor:
+            ...
+        print(monitor.summary()["memory_rss"]["peak"])
+    """
+
+    def __init__(self, stats_source: Callable[[], dict], interval: float = 0.5) -> None:
+        self.stats_source = stats_source
+        self.interval = interval
+        self.error: Exception | None = None
+        self._timestamps: list[float] = []
+        self._samples: list[tuple[float, ...]] = []
+        self._previous_cpu: dict | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "ResourceMonitor":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="resource-monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "ResourceMonitor":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.sample()
+            except Exception as error:
+                # container is gone, keep samples collected so far
+                self.error = error
+                return
+            if self._stop.wait(self.interval):
+                return
+
+    def sample(self) -> None:
+        started = time.time()
+        stats = self.stats_source()
+        timestamp = (started + time.time()) / 2
+
+        cpu_stats = stats.get("cpu_stats", {})
+        previous = self._previous_cpu if self._previous_cpu is not None else stats.get("precpu_stats", {})
+        self._previous_cpu = cpu_stats
+
+        values = (
+            cpu_percent(previous, cpu_stats),
+            *_memory(stats.get("memory_stats", {})),
+            *_network(stats),
+            *_block_io(stats),
+        )
+
+        with self._lock:
+            self._timestamps.append(timestamp)
+            self._samples.append(values)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        with self._lock:
+            return np.array(self._timestamps, dtype=np.float64)
+
+    def series(self) -> dict[str, np.ndarray]:
+        """Time series of each metric, aligned with `timestamps`"""
+        with self._lock:
+            samples = np.array(self._samples, dtype=np.float64).reshape(-1, len(METRICS))
+        return {metric: samples[:, index] for index, metric in enumerate(METRICS)}
+
+    def at(self, timestamps) -> dict[str, np.ndarray]:
+        """Metrics linearly interpolated at `timestamps`, e.g. request start times"""
+        sampled_at = self.timestamps
+        return {metric: np.interp(timestamps, sampled_at, values) for metric, values in self.series().items()}
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Peak and mean of each metric, counters also report growth within monitoring"""
+        summary = {}
+        for metric, values in self.series().items():
+            if not np.any(~np.isnan(values)):
+                continue
+            summary[metric] = {"peak": float(np.nanmax(values)), "mean": float(np.nanmean(values))}
+            if metric in COUNTERS:
+                summary[metric]["total"] = float(values[-1] - values[0])
+        return summary
@@ -0,0 +1,68 @@
+"""
+This module contains pytest fixtures on top of session scoped server
+fixtures defined by the test suite:
+
+* `triton_server`: `triton_mock_server` (MockTritonServer) when suite runs
+  with `--triton-mock` or `TRITON_TESTCONTAINER_MOCK=1`, `triton_container`
+  (TritonContainer) otherwise. Only the chosen fixture is set up. Mock
+  serves HTTP only, so tests that switch have to use `get_client()`.
+* `triton_reset`: `triton_server` reset before each test that requests it,
+  instead of starting a new container per test.
+
+Example (conftest.py):
+    pytest_plugins = ["triton_testcontainer.pytest_plugin"]
+
+    @pytest.fixture(scope="session")
+    def triton_container():
+        with TritonContainer(command=TritonCommand(model_control_mode="explicit", load_model="*")) as triton:
+            yield triton
+
+    @pytest.fixture(scope="session")
+    def triton_mock_server():
+        with MockTritonServer().add_model("simple", ...) as triton:
+            yield triton
+
+    @pytest.mark.triton_models("simple")
+    def test_simple(triton_reset):
+        triton_reset.get_client().infer("simple", ...)
+"""
+import os
+
+import pytest
+
+MOCK_ENVIRONMENT_VARIABLE = "TRITON_TESTCONTAINER_MOCK"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--triton-mock", action="store_true", default=False,
+        help=f"run tests against triton_mock_server fixture instead of triton_container, "
+             f"same as {MOCK_ENVIRONMENT_VARIABLE}=1",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "triton_models(*names): models loaded by triton_reset fixture instead of models loaded at start"
+    )
+
+
+def use_mock(config: pytest.Config) -> bool:
+    # option is only known when plugin is loaded before command line is parsed (root conftest.py)
+    if config.getoption("triton_mock", default=False):
+        return True
+    return os.environ.get(MOCK_ENVIRONMENT_VARIABLE, "").lower() in ("1", "true", "yes")
+
+
+@pytest.fixture(scope="session")
+def triton_server(request: pytest.FixtureRequest):
+    """`triton_mock_server` or `triton_container` fixture, see `use_mock`"""
+    return request.getfixturevalue("triton_mock_server" if use_mock(request.config) else "triton_container")
+
+
+@pytest.fixture
+def triton_reset(request: pytest.FixtureRequest, triton_server):
+    """`triton_server` reset to the state after start, or with models of `triton_models` marker loaded"""
+    marker = request.node.get_closest_marker("triton_models")
+    triton_server.reset(list(marker.args) if marker is not None else None)
+    return triton_server
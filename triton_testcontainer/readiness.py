@@ -0,0 +1,97 @@
+"""
+This module contains the class ModelReadiness that watches readiness of
+several models at the same time, so that tests can start as soon as a
+critical subset (or their own model) is ready while others keep loading.
+"""
+import time
+import threading
+from typing import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+class ModelReadiness:
+    """
+    Polls `is_model_ready` of each model in its own thread with its own
+    client from `client_factory` (tritonclient is not thread-safe). Each model
+    has a future resolved with model name once it is ready, or failed with
+    TimeoutError after `timeout` seconds.
+
+    Example:
+        readiness = ModelReadiness(triton.get_client, ["simple", "ensemble"]).start()
+        readiness.wait(min_ready=1)
+        readiness.futures["ensemble"].result()
+    """
+
+    def __init__(
+            self,
+            client_factory: Callable[[], object],
+            models: list[str],
+            timeout: float = 120.0,
+            poll_interval: float = 0.1,
+    ) -> None:
+        if not models:
+            raise ValueError("At least one model is required")
+
+        self.client_factory = client_factory
+        self.models = list(models)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.futures: dict[str, Future] = {}
+        self._stop = threading.Event()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def start(self) -> "ModelReadiness":
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=len(self.models), thread_name_prefix="model-readiness")
+        deadline = time.monotonic() + self.timeout
+        self.futures = {model: self._executor.submit(self._poll, model, deadline) for model in self.models}
+        # threads exit on their own once models are ready or deadline passes
+        self._executor.shutdown(wait=False)
+        return self
+
+    def stop(self) -> None:
+        """Stop polling, futures of models that are not ready yet fail with TimeoutError"""
+        self._stop.set()
+
+    def _poll(self, model: str, deadline: float) -> str:
+        client = self.client_factory()
+        last_error: Exception | None = None
+
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            try:
+                if client.is_model_ready(model):
+                    return model
+            except Exception as error:
+                # server may drop connections while it is starting
+                last_error = error
+            self._stop.wait(self.poll_interval)
+
+        raise TimeoutError(f"Model {model} is not ready" + (f": {last_error}" if last_error else ""))
+
+    @property
+    def ready(self) -> list[str]:
+        return [model for model, future in self.futures.items() if future.done() and future.exception() is None]
+
+    def wait(self, min_ready: int | None = None, timeout: float | None = None) -> list[str]:
+        """
+        Block until `min_ready` models (all by default) are ready, returns ready
+        models. Raises TimeoutError if it can't be reached anymore or in `timeout`.
+        """
+        required = len(self.models) if min_ready is None else min_ready
+        if required > len(self.models):
+            raise ValueError(f"min_ready={required} exceeds number of models {len(self.models)}")
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        pending = set(self.futures.values())
+
+        while len(self.ready) < required:
+            failed = [model for model, future in self.futures.items() if future.done() and future.exception()]
+            if len(self.models) - len(failed) < required:
+                raise TimeoutError(f"Only {len(self.ready)} of {required} models are ready, failed: {failed}")
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError(f"Only {len(self.ready)} of {required} models are ready")
+            _, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+
+        return self.ready
@@ -0,0 +1,166 @@
+"""
+This module contains generator of synthetic model repositories: any number
+of python backend or identity backend models with configurable tensors,
+batching, instance count and artificial compute delay, without weights.
+Layout is the same as of `tests/test_triton_container/models_repository`.
+
+Example:
+    volume_mapping = generate_repository(tmp_path, count=200, delay_ms=5, max_batch_size=8)
+    TritonContainer(volume_mapping=[volume_mapping], command=TritonCommand(model_repository=["/models"]))
+"""
+import pathlib
+from dataclasses import dataclass, field
+from typing import Literal, TYPE_CHECKING
+
+from .tensor import TensorSpec
+
+if TYPE_CHECKING:
+    from .triton import VolumeMapping
+
+_MODEL_PY = '''\
+import time
+
+import triton_python_backend_utils as pb_utils
+
+# generated by triton_testcontainer.repository, outputs are copies of inputs
+DELAY_S = {delay_s!r}
+OUTPUTS = {outputs!r}
+
+
+class TritonPythonModel:
+    def initialize(self, args):
+        self.dtypes = {{name: pb_utils.triton_string_to_numpy(datatype) for name, (_, datatype) in OUTPUTS.items()}}
+
+    def execute(self, requests):
+        if DELAY_S:
+            time.sleep(DELAY_S)
+
+        responses = []
+        for request in requests:
+            tensors = [
+                pb_utils.Tensor(name, pb_utils.get_input_tensor_by_name(request, source).as_numpy().astype(self.dtypes[name]))
+                for name, (source, _) in OUTPUTS.items()
+            ]
+            responses.append(pb_utils.InferenceResponse(output_tensors=tensors))
+        return responses
+'''
+
+
+def _data_type(datatype: str) -> str:
+    """
+    Data type of model configuration by tensor datatype of inference protocol
+
+    >>> _data_type("FP32"), _data_type("BYTES")
+    ('TYPE_FP32', 'TYPE_STRING')
+    """
+    return "TYPE_STRING" if datatype == "BYTES" else f"TYPE_{datatype}"
+
+
+def _default_inputs() -> list[TensorSpec]:
+    return [{"name": "INPUT0", "datatype": "FP32", "shape": [16]}]
+
+
+@dataclass
+class SyntheticModel:
+    """
+    Model whose outputs are copies of inputs (output `i` of input `i` modulo
+    number of inputs), outputs default to `OUTPUT{i}` of the same shape and
+    datatype as inputs. `delay_ms` is slept on each execution (batch).
+    Identity backend has to be present in the image, python backend is in
+    stock tritonserver images.
+    """
+    name: str
+    backend: Literal["python", "identity"] = "python"
+    inputs: list[TensorSpec] = field(default_factory=_default_inputs)
+    outputs: list[TensorSpec] | None = None
+    max_batch_size: int = 8
+    dynamic_batching: bool = False
+    preferred_batch_size: list[int] = field(default_factory=list)
+    max_queue_delay_microseconds: int = 0
+    instance_count: int = 1
+    instance_kind: Literal["KIND_CPU", "KIND_GPU", "KIND_AUTO"] = "KIND_CPU"
+    delay_ms: float = 0.0
+    version: str = "1"
+
+    def __post_init__(self) -> None:
+        if not self.inputs:
+            raise ValueError(f"Model {self.name} needs at least one input")
+        if self.dynamic_batching and self.max_batch_size <= 0:
+            raise ValueError(f"Model {self.name}: dynamic batching requires max_batch_size > 0")
+        if self.outputs is None:
+            self.outputs = [{**spec, "name": f"OUTPUT{index}"} for index, spec in enumerate(self.inputs)]
+
+    def config(self) -> str:
+        """Text of `config.pbtxt`"""
+        def tensors(specs: list[TensorSpec]) -> str:
+            entries = [
+                f'  {{\n    name: "{spec["name"]}"\n    data_type: {_data_type(spec["datatype"])}\n'
+                f'    dims: [ {", ".join(str(dim) for dim in spec["shape"])} ]\n  }}'
+                for spec in specs
+            ]
+            return "[\n" + ",\n".join(entries) + "\n]"
+
+        lines = [
+            f'name: "{self.name}"',
+            f'backend: "{self.backend}"',
+            f"max_batch_size: {self.max_batch_size}",
+            f"input {tensors(self.inputs)}",
+            f"output {tensors(self.outputs)}",
+            f"instance_group [\n  {{\n    count: {self.instance_count}\n    kind: {self.instance_kind}\n  }}\n]",
+        ]
+
+        if self.dynamic_batching:
+            options = []
+            if self.preferred_batch_size:
+                options.append(f"  preferred_batch_size: [ {', '.join(map(str, self.preferred_batch_size))} ]")
+            if self.max_queue_delay_microseconds:
+                options.append(f"  max_queue_delay_microseconds: {self.max_queue_delay_microseconds}")
+            lines.append("dynamic_batching {\n" + "\n".join(options) + ("\n" if options else "") + "}")
+
+        if self.backend == "identity" and self.delay_ms:
+            lines.append(f'parameters: {{ key: "execute_delay_ms" value: {{ string_value: "{int(self.delay_ms)}" }} }}')
+
+        return "\n".join(lines) + "\n"
+
+    def model_py(self) -> str:
+        """Source of `model.py` of python backend"""
+        outputs = {
+            spec["name"]: (self.inputs[index % len(self.inputs)]["name"], _data_type(spec["datatype"]))
+            for index, spec in enumerate(self.outputs)
+        }
+        return _MODEL_PY.format(delay_s=self.delay_ms / 1000, outputs=outputs)
+
+    def write(self, repository: str | pathlib.Path) -> pathlib.Path:
+        """Write model directory into repository, returns it"""
+        directory = pathlib.Path(repository) / self.name
+        version = directory / self.version
+        version.mkdir(parents=True, exist_ok=True)
+
+        (directory / "config.pbtxt").write_text(self.config())
+        if self.backend == "python":
+            (version / "model.py").write_text(self.model_py())
+
+        return directory
+
+
+def write_repository(
+        path: str | pathlib.Path, models: list[SyntheticModel], container: str = "/models"
+) -> "VolumeMapping":
+    """Write models into repository at `path`, returns its mapping to `container` path"""
+    path = pathlib.Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    for model in models:
+        model.write(path)
+    return {"host": str(path), "container": container, "mode": "ro"}
+
+
+def generate_repository(
+        path: str | pathlib.Path,
+        count: int,
+        container: str = "/models",
+        name_format: str = "model_{index}",
+        **model_options,
+) -> "VolumeMapping":
+    """Write `count` models with the same `model_options` (see SyntheticModel), named by `name_format`"""
+    models = [SyntheticModel(name=name_format.format(index=index), **model_options) for index in range(count)]
+    return write_repository(path, models, container)
@@ -0,0 +1,125 @@
+"""
+This module contains soft reset of running server between tests: models
+are unloaded through repository API, shared memory registrations are
+cleared, trace and log settings are restored, and models loaded at start
+are loaded again. Requires explicit model control mode.
+
+Example:
+    state = capture_state(client)  # right after start
+    ...
+    reset_server(client, state)
+"""
+import time
+import logging
+from dataclasses import dataclass, field
+
+logger = logging.getLogger("triton_testcontainer")
+
+# `trace_file` and `log_file` can't be changed at runtime by recent servers
+TRACE_SETTINGS = ("trace_level", "trace_rate", "trace_count", "log_frequency")
+LOG_SETTINGS = ("log_info", "log_warning", "log_error", "log_verbose_level", "log_format")
+
+_BUSY_STATES = ("READY", "LOADING", "UNLOADING")
+# index reports no state for models never loaded since server start
+_SEEN_STATES = (*_BUSY_STATES, "UNAVAILABLE")
+
+
+@dataclass
+class ServerState:
+    """Trace and log settings and models loaded, as captured after start"""
+    trace: dict = field(default_factory=dict)
+    log: dict = field(default_factory=dict)
+    models: list[str] = field(default_factory=list)
+
+
+def _loaded_models(index: list[dict], states: tuple[str, ...] | None = ("READY",)) -> list[str]:
+    """
+    Names of models of repository index in any of `states` (any state with None), once per model
+
+    >>> index = [{"name": "a", "state": "READY"}, {"name": "a", "version": "2", "state": "READY"},
+    ...          {"name": "b", "state": "UNAVAILABLE"}, {"name": "c"}]
+    >>> _loaded_models(index), _loaded_models(index, states=None)
+    (['a'], ['a', 'b', 'c'])
+    """
+    return list(dict.fromkeys(entry["name"] for entry in index if states is None or entry.get("state") in states))
+
+
+def _clear_trace_settings(client, models: list[str]) -> list[str]:
+    """Clear trace settings of `models`, returns models server refused to clear"""
+    from tritonclient.utils import InferenceServerException
+
+    cleared = {key: None for key in TRACE_SETTINGS}
+    refused = []
+    for model in models:
+        try:
+            client.update_trace_settings(model_name=model, settings=cleared)
+        except InferenceServerException as error:
+            # servers may accept trace settings of loaded models only, these are cleared after load
+            logger.debug(f"Trace settings of model {model} are not cleared: {error}")
+            refused.append(model)
+    return refused
+
+
+def capture_state(client) -> ServerState:
+    """State of server to return to on reset, settings a server does not report are left out"""
+    state = ServerState(models=_loaded_models(client.get_model_repository_index()))
+
+    for name, getter, keys in (("trace", "get_trace_settings", TRACE_SETTINGS),
+                               ("log", "get_log_settings", LOG_SETTINGS)):
+        try:
+            settings = getattr(client, getter)()
+        except Exception as error:
+            logger.info(f"Server does not report {name} settings, they won't be reset: {error}")
+            continue
+        setattr(state, name, {key: settings[key] for key in keys if key in settings})
+
+    return state
+
+
+def reset_server(
+        client,
+        state: ServerState,
+        models: list[str] | None = None,
+        timeout: float = 60.0,
+        poll_interval: float = 0.1,
+) -> list[str]:
+    """
+    Bring server back to `state`, `models` to load default to models of
+    `state`. Returns loaded models. Raises TimeoutError when models are
+    not unloaded in `timeout` seconds.
+    """
+    from tritonclient.utils import InferenceServerException
+
+    index = client.get_model_repository_index()
+
+    # server keeps trace settings of model by name across unloads, so they are cleared for all models
+    # loaded since start, models never loaded can't have them
+    refused = _clear_trace_settings(client, _loaded_models(index, _SEEN_STATES)) if state.trace else []
+
+    for model in _loaded_models(index):
+        client.unload_model(model)
+
+    # unload returns before model is released, server reports it as UNLOADING meanwhile
+    deadline = time.monotonic() + timeout
+    while busy := _loaded_models(client.get_model_repository_index(), _BUSY_STATES):
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Models are not unloaded: {busy}")
+        time.sleep(poll_interval)
+
+    client.unregister_system_shared_memory()
+    try:
+        client.unregister_cuda_shared_memory()
+    except InferenceServerException as error:
+        # servers built without GPU support reject CUDA shared memory requests
+        logger.debug(f"CUDA shared memory is not cleared: {error}")
+
+    if state.trace:
+        client.update_trace_settings(settings=state.trace)
+    if state.log:
+        client.update_log_settings(state.log)
+
+    models = state.models if models is None else models
+    for model in models:
+        client.load_model(model)
+    _clear_trace_settings(client, [model for model in models if model in refused])
+    return list(models)
@@ -0,0 +1,241 @@
+"""
+This module contains local SQLite store of benchmark results with comparison
+against named baselines, so that performance regressions fail tests the same
+way as functional ones.
+
+Example:
+    store = ResultStore("benchmarks.sqlite")
+    key = BenchmarkKey(image="nvcr.io/nvidia/tritonserver:24.01-py3", command=cmd, model="simple")
+    run_id = store.record(BenchmarkResult.from_latencies(key, latencies, duration))
+    assert_no_regression(store, key, p99=0.012, tolerance=0.05)
+"""
+import time
+import socket
+import sqlite3
+import statistics
+from dataclasses import dataclass, field, astuple
+from typing import Literal
+
+import numpy as np
+
+Metric = Literal["throughput", "mean", "p50", "p90", "p95", "p99"]
+METRICS: tuple[Metric, ...] = ("throughput", "mean", "p50", "p90", "p95", "p99")
+
+# metrics for which bigger value is better, for the rest (latencies) it is worse
+HIGHER_IS_BETTER = {"throughput"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    image TEXT NOT NULL,
+    command TEXT NOT NULL,
+    model TEXT NOT NULL,
+    host TEXT NOT NULL,
+    created REAL NOT NULL,
+    count INTEGER NOT NULL,
+    throughput REAL,
+    mean REAL,
+    p50 REAL,
+    p90 REAL,
+    p95 REAL,
+    p99 REAL
+);
+CREATE INDEX IF NOT EXISTS runs_key ON runs (image, command, model, host);
+CREATE TABLE IF NOT EXISTS baselines (
+    name TEXT NOT NULL,
+    image TEXT NOT NULL,
+    command TEXT NOT NULL,
+    model TEXT NOT NULL,
+    host TEXT NOT NULL,
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    PRIMARY KEY (name, image, command, model, host)
+);
+"""
+
+
+@dataclass(frozen=True)
+class BenchmarkKey:
+    image: str
+    command: str
+    model: str
+    host: str = field(default_factory=socket.gethostname)
+
+
+@dataclass
+class BenchmarkResult:
+    """Throughput in infer/sec, latencies in seconds"""
+    key: BenchmarkKey
+    count: int
+    throughput: float
+    mean: float
+    p50: float
+    p90: float
+    p95: float
+    p99: float
+    created: float = field(default_factory=time.time)
+    run_id: int | None = None
+
+    @classmethod
+    def from_latencies(cls, key: BenchmarkKey, latencies: np.ndarray, duration: float) -> "BenchmarkResult":
+        latencies = np.asarray(latencies, dtype=np.float64)
+        p50, p90, p95, p99 = np.percentile(latencies, [50, 90, 95, 99])
+        return cls(
+            key=key,
+            count=latencies.size,
+            throughput=latencies.size / duration,
+            mean=float(latencies.mean()),
+            p50=float(p50),
+            p90=float(p90),
+            p95=float(p95),
+            p99=float(p99),
+        )
+
+
+@dataclass
+class MetricComparison:
+    metric: Metric
+    current: float
+    baseline: float
+    threshold: float
+
+    @property
+    def regressed(self) -> bool:
+        if self.metric in HIGHER_IS_BETTER:
+            return self.current < self.baseline - self.threshold
+        return self.current > self.baseline + self.threshold
+
+    def __str__(self) -> str:
+        change = (self.current - self.baseline) / self.baseline * 100 if self.baseline else float("inf")
+        status = "REGRESSION" if self.regressed else "ok"
+        return (f"{self.metric}: {self.current:.6g} vs baseline {self.baseline:.6g} "
+                f"({change:+.1f}%, allowed ±{self.threshold:.6g}) {status}")
+
+
+class ResultStore:
+
+    def __init__(self, path: str = "benchmarks.sqlite") -> None:
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def record(self, result: BenchmarkResult) -> int:
+        with self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO runs (image, command, model, host, created, count, throughput, mean, p50, p90, p95, p99)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (*astuple(result.key), result.created, result.count,
+                 *(getattr(result, metric) for metric in METRICS)),
+            )
+        result.run_id = cursor.lastrowid
+        return result.run_id
+
+    def _result(self, row: sqlite3.Row) -> BenchmarkResult:
+        return BenchmarkResult(
+            key=BenchmarkKey(image=row["image"], command=row["command"], model=row["model"], host=row["host"]),
+            count=row["count"],
+            created=row["created"],
+            run_id=row["id"],
+            **{metric: row[metric] for metric in METRICS},
+        )
+
+    def get(self, run_id: int) -> BenchmarkResult:
+        row = self._connection.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown run {run_id}")
+        return self._result(row)
+
+    def history(self, key: BenchmarkKey, limit: int = 20, until: int | None = None) -> list[BenchmarkResult]:
+        """Most recent runs first, with `until` runs recorded after that run are left out"""
+        rows = self._connection.execute(
+            "SELECT * FROM runs WHERE image = ? AND command = ? AND model = ? AND host = ?"
+            + ("" if until is None else " AND id <= ?")
+            + " ORDER BY id DESC LIMIT ?",
+            (*astuple(key), *(() if until is None else (until,)), limit),
+        )
+        return [self._result(row) for row in rows]
+
+    def set_baseline(self, run_id: int, name: str = "default") -> None:
+        result = self.get(run_id)
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO baselines (name, image, command, model, host, run_id) VALUES (?, ?, ?, ?, ?, ?)",
+                (name, *astuple(result.key), run_id),
+            )
+
+    def baseline(self, key: BenchmarkKey, name: str = "default") -> BenchmarkResult | None:
+        row = self._connection.execute(
+            "SELECT runs.* FROM baselines JOIN runs ON runs.id = baselines.run_id"
+            " WHERE baselines.name = ? AND baselines.image = ? AND baselines.command = ?"
+            " AND baselines.model = ? AND baselines.host = ?",
+            (name, *astuple(key)),
+        ).fetchone()
+        return self._result(row) if row is not None else None
+
+    def compare(
+            self,
+            key: BenchmarkKey,
+            metrics: dict[Metric, float],
+            baseline: str = "default",
+            tolerance: float = 0.1,
+            noise_window: int = 10,
+            noise_sigmas: float = 3.0,
+    ) -> list[MetricComparison]:
+        """
+        Compare metric values against baseline run. Allowed deviation is
+        `tolerance` relative to baseline value, widened to `noise_sigmas`
+        standard deviations of the metric over last `noise_window` runs of the key
+        up to the baseline run, so that compared run does not widen its own threshold.
+        Returns empty list when baseline is not set.
+        """
+        base = self.baseline(key, baseline)
+        if base is None:
+            return []
+
+        history = self.history(key, noise_window, until=base.run_id)
+        comparisons = []
+        for metric, current in metrics.items():
+            if metric not in METRICS:
+                raise ValueError(f"Unknown metric {metric}")
+
+            baseline_value = getattr(base, metric)
+            values = [getattr(result, metric) for result in history]
+            noise = statistics.stdev(values) if len(values) > 1 else 0.0
+
+            comparisons.append(MetricComparison(
+                metric=metric,
+                current=current,
+                baseline=baseline_value,
+                threshold=max(abs(baseline_value) * tolerance, noise * noise_sigmas),
+            ))
+
+        return comparisons
+
+
+def assert_no_regression(
+        store: ResultStore,
+        key: BenchmarkKey,
+        baseline: str = "default",
+        tolerance: float = 0.1,
+        **metrics: float,
+) -> list[MetricComparison]:
+    """
+    Assert helper for tests, e.g. `assert_no_regression(store, key, p99=result.p99, tolerance=0.05)`.
+    Passes when baseline is not set yet.
+    """
+    comparisons = store.compare(key, metrics, baseline=baseline, tolerance=tolerance)
+    regressions = [comparison for comparison in comparisons if comparison.regressed]
+
+    assert not regressions, f"Performance regression of {key.model} against baseline '{baseline}':\n" + \
+        "\n".join(str(comparison) for comparison in regressions)
+
+    return comparisons
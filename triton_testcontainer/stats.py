@@ -0,0 +1,163 @@
+"""
+This module contains the class StatisticsProfiler that snapshots
+tritonserver statistics API (`/v2/models/stats`) before and after a block of
+code and reports per model and version deltas.
+"""
+from dataclasses import dataclass, field
+
+STAGES = ("queue", "compute_input", "compute_infer", "compute_output")
+
+
+@dataclass
+class ModelStatsDelta:
+    name: str
+    version: str
+    request_count: int = 0
+    failure_count: int = 0
+    inference_count: int = 0
+    execution_count: int = 0
+    stage_ns: dict[str, int] = field(default_factory=dict)
+    stage_count: dict[str, int] = field(default_factory=dict)
+    batch_sizes: dict[int, int] = field(default_factory=dict)
+    composing: list[str] = field(default_factory=list)
+
+    def average_ms(self, stage: str) -> float:
+        """Average time per request spent in stage, milliseconds"""
+        count = self.stage_count.get(stage, 0)
+        return self.stage_ns.get(stage, 0) / count / 1e6 if count else 0.0
+
+
+def _stat(stats: dict, *path: str) -> int:
+    for key in path:
+        stats = stats.get(key, {})
+    return int(stats or 0)
+
+
+def stats_delta(before: dict, after: dict) -> ModelStatsDelta:
+    """Difference of two entries of `model_stats` of the same model and version"""
+    delta = ModelStatsDelta(name=after["name"], version=after.get("version", ""))
+
+    delta.request_count = _stat(after, "inference_stats", "success", "count") - \
+        _stat(before, "inference_stats", "success", "count")
+    delta.failure_count = _stat(after, "inference_stats", "fail", "count") - \
+        _stat(before, "inference_stats", "fail", "count")
+    delta.inference_count = _stat(after, "inference_count") - _stat(before, "inference_count")
+    delta.execution_count = _stat(after, "execution_count") - _stat(before, "execution_count")
+
+    for stage in STAGES:
+        delta.stage_ns[stage] = _stat(after, "inference_stats", stage, "ns") - \
+            _stat(before, "inference_stats", stage, "ns")
+        delta.stage_count[stage] = _stat(after, "inference_stats", stage, "count") - \
+            _stat(before, "inference_stats", stage, "count")
+
+    batches_before = {int(batch["batch_size"]): batch for batch in before.get("batch_stats", [])}
+    for batch in after.get("batch_stats", []):
+        batch_size = int(batch["batch_size"])
+        count = _stat(batch, "compute_infer", "count") - \
+            _stat(batches_before.get(batch_size, {}), "compute_infer", "count")
+        if count:
+            delta.batch_sizes[batch_size] = count
+
+    return delta
+
+
+class StatisticsProfiler:
+    """
+    Context manager that reports statistics deltas of models, composing
+    models of ensembles are included automatically.
+
+    Example:
+        with triton.profile(models=["ensemble"]) as profiler:
+            triton_client.infer("ensemble", inputs)
+        print(profiler.report())
+    """
+
+    def __init__(self, client, models: list[str] | None = None, include_composing: bool = True) -> None:
+        self._client = client
+        self._requested = models
+        self._include_composing = include_composing
+        self._before: dict[tuple[str, str], dict] = {}
+        self.composing: dict[str, list[str]] = {}
+        self.stats: dict[tuple[str, str], ModelStatsDelta] = {}
+
+    def _resolve_models(self) -> set[str] | None:
+        if self._requested is None:
+            return None
+
+        models: set[str] = set()
+        pending = list(self._requested)
+        while pending:
+            name = pending.pop()
+            if name in models:
+                continue
+            models.add(name)
+
+            if not self._include_composing:
+                continue
+
+            config = self._client.get_model_config(name)
+            steps = config.get("ensemble_scheduling", {}).get("step", [])
+            if steps:
+                self.composing[name] = [step["model_name"] for step in steps]
+                pending.extend(self.composing[name])
+
+        return models
+
+    def _snapshot(self, models: set[str] | None) -> dict[tuple[str, str], dict]:
+        statistics = self._client.get_inference_statistics()
+        return {
+            (entry["name"], entry.get("version", "")): entry
+            for entry in statistics.get("model_stats", [])
+            if models is None or entry["name"] in models
+        }
+
+    def __enter__(self) -> "StatisticsProfiler":
+        self._models = self._resolve_models()
+        self._before = self._snapshot(self._models)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        after = self._snapshot(self._models)
+        self.stats = {
+            key: stats_delta(self._before.get(key, {}), entry) for key, entry in after.items()
+        }
+        for (name, _), delta in self.stats.items():
+            delta.composing = self.composing.get(name, [])
+
+    def model(self, name: str, version: str | None = None) -> ModelStatsDelta:
+        """Delta of model, versions are summed when version is not specified"""
+        deltas = [delta for (model, model_version), delta in self.stats.items()
+                  if model == name and version in (None, model_version)]
+        if not deltas:
+            raise KeyError(f"No statistics for model {name}")
+
+        total = ModelStatsDelta(name=name, version=version or "", composing=deltas[0].composing)
+        for delta in deltas:
+            total.request_count += delta.request_count
+            total.failure_count += delta.failure_count
+            total.inference_count += delta.inference_count
+            total.execution_count += delta.execution_count
+            for stage in STAGES:
+                total.stage_ns[stage] = total.stage_ns.get(stage, 0) + delta.stage_ns.get(stage, 0)
+                total.stage_count[stage] = total.stage_count.get(stage, 0) + delta.stage_count.get(stage, 0)
+            for batch_size, count in delta.batch_sizes.items():
+                total.batch_sizes[batch_size] = total.batch_sizes.get(batch_size, 0) + count
+        return total
+
+    def report(self) -> str:
+        header = f"{'model':<24} {'version':>7} {'requests':>8} {'failed':>6} {'exec':>6} " + \
+            " ".join(f"{stage + ' ms':>17}" for stage in STAGES) + "  batch sizes"
+        lines = [header]
+
+        for (name, version), delta in sorted(self.stats.items()):
+            if not delta.request_count and not delta.failure_count:
+                continue
+            label = f"{name} ({', '.join(delta.composing)})" if delta.composing else name
+            batches = ", ".join(f"{size}x{count}" for size, count in sorted(delta.batch_sizes.items()))
+            lines.append(
+                f"{label:<24} {version:>7} {delta.request_count:>8} {delta.failure_count:>6} "
+                f"{delta.execution_count:>6} " +
+                " ".join(f"{delta.average_ms(stage):>17.3f}" for stage in STAGES) + f"  {batches}"
+            )
+
+        return "\n".join(lines)
@@ -0,0 +1,189 @@
+"""
+This module contains the class TeardownManager that stops containers and
+removes images in parallel, or hands their removal to background reaper
+process that outlives the test process.
+
+Reaper is started as `python -m triton_testcontainer.teardown --container ID --image TAG`
+after in-process side effects of containers (see `TritonContainer.release`) are done.
+"""
+import os
+import sys
+import time
+import argparse
+import subprocess
+from typing import Callable
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+
+
+@dataclass
+class TeardownReport:
+    """Seconds spent per teardown item and total wall time"""
+    durations: dict[str, float] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+    wall_time: float = 0.0
+    background: bool = False
+
+    def __str__(self) -> str:
+        mode = "handed to background reaper" if self.background else "done"
+        lines = [f"teardown of {len(self.durations)} items {mode} in {self.wall_time:.2f} s"]
+        for item, duration in sorted(self.durations.items(), key=lambda entry: -entry[1]):
+            error = f" ({self.errors[item]})" if item in self.errors else ""
+            lines.append(f"  {item}: {duration:.2f} s{error}")
+        return "\n".join(lines)
+
+
+def _label(kind: str, obj) -> str:
+    return f"{kind} {getattr(obj, '_name', None) or getattr(obj, 'tag', None) or id(obj)}"
+
+
+class TeardownManager:
+    """
+    Collects containers and image builders, tears them down at once.
+    Containers are stopped first, images are removed afterwards since
+    image can't be removed while container of it exists.
+
+    Example:
+        teardown = TeardownManager()
+        triton = teardown.add_container(TritonContainer()).start()
+        ...
+        print(teardown.teardown())
+    """
+
+    def __init__(self, max_workers: int = 8, background: bool = False) -> None:
+        self.max_workers = max_workers
+        self.background = background
+        self._containers: list = []
+        self._images: list = []
+
+    def add_container(self, container):
+        """Register container (e.g. TritonContainer), returns it for chaining"""
+        self._containers.append(container)
+        return container
+
+    def add_image(self, image_builder):
+        """Register ImageBuilder whose image is removed on teardown, returns it for chaining"""
+        self._images.append(image_builder)
+        return image_builder
+
+    def __enter__(self) -> "TeardownManager":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.teardown()
+
+    def _run_parallel(self, items: list[tuple[str, Callable[[], None]]], report: TeardownReport) -> None:
+        def run(label: str, action) -> None:
+            started = time.perf_counter()
+            try:
+                action()
+            except Exception as error:
+                report.errors[label] = str(error)
+            report.durations[label] = time.perf_counter() - started
+
+        if not items:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for future in [executor.submit(run, label, action) for label, action in items]:
+                future.result()
+
+    def teardown(self) -> TeardownReport:
+        started = time.perf_counter()
+        report = TeardownReport(background=self.background)
+
+        if self.background:
+            self._spawn_reaper(report)
+        else:
+            self._run_parallel([(_label("container", c), c.stop) for c in self._containers], report)
+            self._run_parallel([(_label("image", i), i.remove) for i in self._images], report)
+
+        self._containers.clear()
+        self._images.clear()
+        report.wall_time = time.perf_counter() - started
+        return report
+
+    def _spawn_reaper(self, report: TeardownReport) -> None:
+        args = [sys.executable, "-m", "triton_testcontainer.teardown"]
+
+        docker_host = _docker_host()
+        if docker_host:
+            args.extend(["--docker-host", docker_host])
+
+        containers = [container for container in self._containers
+                      if getattr(container, "_container", None) is not None]
+        container_ids = [container.get_container_id() for container in containers]
+
+        # readiness polling, trace collection and log followers are stopped in process,
+        # containers without `release` hook (e.g. plain DockerContainer) have nothing to do
+        self._run_parallel([(_label("container", container), container.release) for container in containers
+                            if hasattr(container, "release")], report)
+
+        for container, container_id in zip(containers, container_ids):
+            args.extend(["--container", container_id])
+            report.durations.setdefault(_label("container", container), 0.0)
+
+        for builder in self._images:
+            if builder.image is not None:
+                # image is removed by tag of builder, so that other tags of the same image are kept
+                option = "--force-image" if getattr(builder, "force_remove", False) else "--image"
+                args.extend([option, builder.tag])
+                report.durations[_label("image", builder)] = 0.0
+
+        subprocess.Popen(
+            args,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+
+def _docker_host() -> str | None:
+    """Daemon configured for testcontainers (`DOCKER_HOST` or `~/.testcontainers.properties`)"""
+    from testcontainers.core.docker_client import get_docker_host
+
+    return get_docker_host() or os.environ.get("DOCKER_HOST")
+
+
+def _reap(
+        containers: list[str],
+        images: list[tuple[str, bool]],
+        docker_host: str | None = None,
+        max_workers: int = 8,
+) -> None:
+    import docker
+
+    client = docker.DockerClient(base_url=docker_host) if docker_host else docker.from_env()
+
+    def remove_container(container_id: str) -> None:
+        client.api.remove_container(container_id, force=True, v=True)
+
+    def remove_image(image: tuple[str, bool]) -> None:
+        tag, force = image
+        client.api.remove_image(tag, force=force)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(lambda c: _ignore_errors(remove_container, c), containers))
+        list(executor.map(lambda i: _ignore_errors(remove_image, i), images))
+
+
+def _ignore_errors(action, argument) -> None:
+    try:
+        action(argument)
+    except Exception:
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Remove docker containers and images in background")
+    parser.add_argument("--docker-host", help="daemon address, DOCKER_HOST environment variable by default")
+    parser.add_argument("--container", action="append", default=[])
+    parser.add_argument("--image", action="append", default=[], help="tag of image to remove")
+    parser.add_argument("--force-image", action="append", default=[], help="tag of image to remove with force")
+    arguments = parser.parse_args()
+    _reap(
+        arguments.container,
+        [(tag, False) for tag in arguments.image] + [(tag, True) for tag in arguments.force_image],
+        arguments.docker_host,
+    )
@@ -0,0 +1,11 @@
+"""
+This module contains tensor description shared by mock server and synthetic
+model repositories, kept free of tritonclient and numpy imports.
+"""
+from typing import TypedDict
+
+
+class TensorSpec(TypedDict):
+    name: str
+    datatype: str
+    shape: list[int]
@@ -0,0 +1,140 @@
+"""
+This module contains parsing of tritonserver trace files (triton trace mode,
+`TIMESTAMPS` level) into per request stage timings.
+"""
+import json
+import pathlib
+from dataclasses import dataclass, field
+
+import numpy as np
+
+# stage: (start timestamps, end timestamps), first present timestamp wins
+STAGE_TIMESTAMPS: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    "receive": (("HTTP_RECV_START", "GRPC_WAITREAD_START"), ("HTTP_RECV_END", "GRPC_WAITREAD_END")),
+    "queue": (("QUEUE_START",), ("COMPUTE_START",)),
+    "compute": (("COMPUTE_START",), ("COMPUTE_END",)),
+    "compute_input": (("COMPUTE_START",), ("COMPUTE_INPUT_END",)),
+    "compute_infer": (("COMPUTE_INPUT_END",), ("COMPUTE_OUTPUT_START",)),
+    "compute_output": (("COMPUTE_OUTPUT_START",), ("COMPUTE_END",)),
+    "send": (("HTTP_SEND_START", "GRPC_SEND_START"), ("HTTP_SEND_END", "GRPC_SEND_END")),
+    "total": (("HTTP_RECV_START", "GRPC_WAITREAD_START", "REQUEST_START"),
+              ("HTTP_SEND_END", "GRPC_SEND_END", "REQUEST_END")),
+}
+
+
+@dataclass
+class RequestTrace:
+    id: int
+    model_name: str = ""
+    model_version: str = ""
+    request_id: str = ""
+    parent_id: int | None = None
+    timestamps: dict[str, int] = field(default_factory=dict)
+
+    def duration_us(self, stage: str) -> float:
+        starts, ends = STAGE_TIMESTAMPS[stage]
+        start = next((self.timestamps[name] for name in starts if name in self.timestamps), None)
+        end = next((self.timestamps[name] for name in ends if name in self.timestamps), None)
+        if start is None or end is None:
+            return np.nan
+        return (end - start) / 1e3
+
+
+def _decode_entries(text: str) -> list[dict]:
+    # trace file is json array, files written with log frequency may hold several arrays
+    decoder = json.JSONDecoder()
+    entries, position = [], 0
+    while True:
+        while position < len(text) and text[position] in " \t\r\n,":
+            position += 1
+        if position >= len(text):
+            return entries
+        value, position = decoder.raw_decode(text, position)
+        entries.extend(value if isinstance(value, list) else [value])
+
+
+def load_traces(*paths: str | pathlib.Path) -> list[RequestTrace]:
+    """Merge trace entries of the same request id from one or more trace files"""
+    traces: dict[int, RequestTrace] = {}
+
+    for path in paths:
+        for entry in _decode_entries(pathlib.Path(path).read_text()):
+            if "id" not in entry:
+                continue
+            trace = traces.setdefault(entry["id"], RequestTrace(id=entry["id"]))
+
+            if "model_name" in entry:
+                trace.model_name = entry["model_name"]
+                trace.model_version = str(entry.get("model_version", ""))
+                trace.request_id = entry.get("request_id", "")
+                trace.parent_id = entry.get("parent_id")
+
+            for timestamp in entry.get("timestamps", []):
+                trace.timestamps[timestamp["name"]] = int(timestamp["ns"])
+
+    return list(traces.values())
+
+
+class TraceAnalysis:
+    """
+    Stage timings of traced requests as arrays of microseconds,
+    NaN marks stages that are missing in the trace (e.g. `receive` of
+    composing models of ensemble).
+
+    Example:
+        analysis = TraceAnalysis(load_traces("trace.json"))
+        analysis.summary()["queue"]["p99"]
+    """
+
+    def __init__(self, traces: list[RequestTrace]) -> None:
+        self.traces = traces
+        self.models = np.array([trace.model_name for trace in traces])
+        self.stages: dict[str, np.ndarray] = {
+            stage: np.array([trace.duration_us(stage) for trace in traces], dtype=np.float64)
+            for stage in STAGE_TIMESTAMPS
+        }
+
+    @classmethod
+    def from_files(cls, *paths: str | pathlib.Path) -> "TraceAnalysis":
+        return cls(load_traces(*paths))
+
+    def __len__(self) -> int:
+        return len(self.traces)
+
+    def __getitem__(self, stage: str) -> np.ndarray:
+        return self.stages[stage]
+
+    def for_model(self, model_name: str) -> "TraceAnalysis":
+        return TraceAnalysis([trace for trace in self.traces if trace.model_name == model_name])
+
+    def summary(self, percentiles: tuple[float, ...] = (50, 90, 99)) -> dict[str, dict[str, float]]:
+        summary = {}
+        for stage, values in self.stages.items():
+            values = values[~np.isnan(values)]
+            if values.size == 0:
+                continue
+            summary[stage] = {"mean": float(values.mean())}
+            summary[stage].update(
+                {f"p{q:g}": float(value) for q, value in zip(percentiles, np.percentile(values, percentiles))}
+            )
+        return summary
+
+    def tail_attribution(self, percentile: float = 99) -> dict[str, float]:
+        """Mean time per stage of requests whose total latency is above percentile"""
+        total = self.stages["total"]
+        valid = ~np.isnan(total)
+        if not valid.any():
+            return {}
+
+        tail = valid & (total >= np.percentile(total[valid], percentile))
+        return {
+            stage: float(np.nanmean(values[tail])) if not np.isnan(values[tail]).all() else np.nan
+            for stage, values in self.stages.items()
+        }
+
+    def report(self, percentiles: tuple[float, ...] = (50, 90, 99)) -> str:
+        columns = ["mean", *(f"p{q:g}" for q in percentiles)]
+        lines = [f"{'stage (us)':<16}" + "".join(f"{column:>12}" for column in columns)]
+        for stage, values in self.summary(percentiles).items():
+            lines.append(f"{stage:<16}" + "".join(f"{values[column]:>12.1f}" for column in columns))
+        return "\n".join(lines)
@@ -0,0 +1,379 @@
+"""
+This module contains recording of inference traffic to disk and its replay
+against running tritonserver at original or scaled rate.
+
+Requests are recorded either explicitly with `TrafficRecorder.record` or
+as they are sent through `RecordingClient` wrapping tritonclient.
+
+Recording is a directory with `requests.jsonl`, one request per line, and one
+`.npy` file per datatype with flattened tensors of all requests, which is
+memory-mapped on read.
+"""
+import json
+import time
+import logging
+import pathlib
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, BinaryIO
+
+import numpy as np
+from tritonclient.utils import (
+    np_to_triton_dtype,
+    triton_to_np_dtype,
+    serialize_byte_tensor,
+    deserialize_bytes_tensor,
+)
+
+logger = logging.getLogger("triton_testcontainer")
+
+REQUESTS_FILE = "requests.jsonl"
+
+# .npy header is reserved upfront with fixed size and rewritten on close,
+# so that tensors are appended without knowing total length
+_NPY_HEADER_SIZE = 128
+
+
+def _npy_header(dtype: np.dtype, length: int) -> bytes:
+    header = repr({"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (length,)})
+    prefix = np.lib.format.magic(1, 0)
+    header_length = _NPY_HEADER_SIZE - len(prefix) - 2
+    return prefix + header_length.to_bytes(2, "little") + header.ljust(header_length - 1).encode("latin1") + b"\n"
+
+
+class _TensorStream:
+    def __init__(self, path: pathlib.Path, dtype: np.dtype) -> None:
+        self.dtype = dtype
+        self.length = 0
+        self._file: BinaryIO = open(path, "wb")
+        self._file.write(_npy_header(dtype, 0))
+
+    def append(self, array: np.ndarray) -> int:
+        offset = self.length
+        self._file.write(np.ascontiguousarray(array, dtype=self.dtype).tobytes())
+        self.length += array.size
+        return offset
+
+    def close(self) -> None:
+        self._file.seek(0)
+        self._file.write(_npy_header(self.dtype, self.length))
+        self._file.close()
+
+
+def _serialize_bytes(array: np.ndarray) -> bytes:
+    """
+    BYTES tensor in wire format of inference protocol
+
+    >>> _serialize_bytes(np.array([b"ab"], dtype=np.object_)), _serialize_bytes(np.array([], dtype=np.object_))
+    (b'\\x02\\x00\\x00\\x00ab', b'')
+    """
+    serialized = serialize_byte_tensor(array)
+    # empty tensor is serialized into empty array instead of empty bytes
+    return serialized.item() if serialized.size else b""
+
+
+@dataclass
+class RecordedRequest:
+    arrival: float
+    model_name: str
+    model_version: str
+    inputs: dict[str, np.ndarray]
+    outputs: list[str] | None
+
+
+class TrafficRecorder:
+    """
+    Record inference requests into directory.
+
+    Example:
+        with TrafficRecorder("traffic/") as recorder:
+            recorder.record("simple", {"INPUT0": input0, "INPUT1": input1}, outputs=["OUTPUT0"])
+    """
+
+    def __init__(self, path: str | pathlib.Path) -> None:
+        self.path = pathlib.Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._requests = open(self.path / REQUESTS_FILE, "w", encoding="utf-8")
+        self._streams: dict[str, _TensorStream] = {}
+        self._lock = threading.Lock()
+        self._first_arrival: float | None = None
+
+    def record(
+            self,
+            model_name: str,
+            inputs: dict[str, np.ndarray],
+            outputs: list[str] | None = None,
+            model_version: str = "",
+            timestamp: float | None = None,
+    ) -> None:
+        """Record single request, `timestamp` defaults to `time.monotonic()`"""
+        timestamp = time.monotonic() if timestamp is None else timestamp
+
+        with self._lock:
+            if self._first_arrival is None:
+                self._first_arrival = timestamp
+
+            tensors = []
+            for name, array in inputs.items():
+                datatype = np_to_triton_dtype(array.dtype)
+                data = np.frombuffer(_serialize_bytes(array), np.uint8) if datatype == "BYTES" else array
+
+                stream = self._streams.get(datatype)
+                if stream is None:
+                    stream = _TensorStream(self.path / f"{datatype}.npy", data.dtype)
+                    self._streams[datatype] = stream
+
+                offset = stream.append(data)
+                tensors.append({
+                    "name": name, "datatype": datatype, "shape": list(array.shape), "offset": offset, "size": data.size
+                })
+
+            self._requests.write(json.dumps({
+                "arrival": timestamp - self._first_arrival,
+                "model_name": model_name,
+                "model_version": model_version,
+                "inputs": tensors,
+                "outputs": outputs,
+            }) + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            for stream in self._streams.values():
+                stream.close()
+            self._streams.clear()
+            self._requests.close()
+
+    def __enter__(self) -> "TrafficRecorder":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def _input_array(infer_input) -> np.ndarray | None:
+    """Data of `tritonclient.http.InferInput` as numpy array, None for inputs in shared memory"""
+    datatype, shape = infer_input.datatype(), infer_input.shape()
+
+    raw = infer_input._get_binary_data()
+    if raw is not None:
+        if datatype == "BYTES":
+            return deserialize_bytes_tensor(raw).reshape(shape)
+        return np.frombuffer(raw, triton_to_np_dtype(datatype)).reshape(shape)
+
+    data = infer_input._get_tensor().get("data")
+    if data is None:
+        return None
+    if datatype == "BYTES":
+        return np.array([item.encode("utf-8") if isinstance(item, str) else item for item in data],
+                        dtype=np.object_).reshape(shape)
+    return np.array(data, dtype=triton_to_np_dtype(datatype)).reshape(shape)
+
+
+class RecordingClient:
+    """
+    Wraps `tritonclient.http.InferenceServerClient`, requests of `infer` and
+    `async_infer` are recorded with `recorder` as they are sent. Other methods
+    are delegated. Requests with inputs in shared memory are not recorded.
+
+    Example:
+        with TrafficRecorder("traffic/") as recorder:
+            triton_client = RecordingClient(triton.get_client(), recorder)
+            triton_client.infer("simple", inputs)
+    """
+
+    def __init__(self, client, recorder: TrafficRecorder) -> None:
+        self._client = client
+        self._recorder = recorder
+
+    @property
+    def client(self):
+        return self._client
+
+    def _record(self, model_name: str, inputs: list, model_version: str, outputs: list | None) -> None:
+        arrays = {}
+        for infer_input in inputs:
+            array = _input_array(infer_input)
+            if array is None:
+                logger.debug(f"Request of model {model_name} is not recorded, "
+                             f"input {infer_input.name()} is in shared memory")
+                return
+            arrays[infer_input.name()] = array
+
+        self._recorder.record(
+            model_name,
+            arrays,
+            outputs=[output.name() for output in outputs] if outputs is not None else None,
+            model_version=model_version,
+        )
+
+    def infer(self, model_name: str, inputs: list, model_version: str = "", outputs: list | None = None, **kwargs):
+        self._record(model_name, inputs, model_version, outputs)
+        return self._client.infer(model_name, inputs, model_version=model_version, outputs=outputs, **kwargs)
+
+    def async_infer(
+            self, model_name: str, inputs: list, model_version: str = "", outputs: list | None = None, **kwargs
+    ):
+        self._record(model_name, inputs, model_version, outputs)
+        return self._client.async_infer(model_name, inputs, model_version=model_version, outputs=outputs, **kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+
+class TrafficRecording:
+    """Read recording made by TrafficRecorder, tensors are memory-mapped"""
+
+    def __init__(self, path: str | pathlib.Path) -> None:
+        self.path = pathlib.Path(path)
+        with open(self.path / REQUESTS_FILE, encoding="utf-8") as file:
+            self._requests = [json.loads(line) for line in file]
+        self._streams = {
+            file.stem: np.load(file, mmap_mode="r") for file in self.path.glob("*.npy")
+        }
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def __iter__(self) -> Iterator[RecordedRequest]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> RecordedRequest:
+        request = self._requests[index]
+
+        inputs = {}
+        for tensor in request["inputs"]:
+            datatype = tensor["datatype"]
+            data = self._streams[datatype][tensor["offset"]:tensor["offset"] + tensor["size"]]
+            if datatype == "BYTES":
+                data = deserialize_bytes_tensor(data.tobytes())
+            inputs[tensor["name"]] = data.reshape(tensor["shape"])
+
+        return RecordedRequest(
+            arrival=request["arrival"],
+            model_name=request["model_name"],
+            model_version=request["model_version"],
+            inputs=inputs,
+            outputs=request["outputs"],
+        )
+
+    @property
+    def duration(self) -> float:
+        return self._requests[-1]["arrival"] if self._requests else 0.0
+
+
+@dataclass
+class ReplayReport:
+    """Per-request measurements of replay, times are in seconds"""
+    models: list[str]
+    scheduled: np.ndarray
+    send_lag: np.ndarray
+    latency: np.ndarray
+    errors: list[str | None]
+    duration: float
+    speed: float
+    percentiles: tuple[float, ...] = field(default=(50, 90, 95, 99))
+
+    @property
+    def error_count(self) -> int:
+        return sum(error is not None for error in self.errors)
+
+    @property
+    def throughput(self) -> float:
+        return len(self.models) / self.duration if self.duration else 0.0
+
+    def latency_percentiles(self, model_name: str | None = None) -> dict[str, float]:
+        mask = np.array([error is None and (model_name is None or model == model_name)
+                         for model, error in zip(self.models, self.errors)], dtype=bool)
+        latency = self.latency[mask]
+        if latency.size == 0:
+            return {}
+        return {f"p{q:g}": float(value) for q, value in zip(self.percentiles, np.percentile(latency, self.percentiles))}
+
+    def summary(self) -> str:
+        lines = [
+            f"requests: {len(self.models)}, errors: {self.error_count}, speed: x{self.speed:g}, "
+            f"throughput: {self.throughput:.1f} infer/sec, max send lag: {self.send_lag.max(initial=0) * 1000:.2f} ms"
+        ]
+        for model_name in sorted(set(self.models)):
+            latency = ", ".join(f"{key}={value * 1000:.2f} ms"
+                                for key, value in self.latency_percentiles(model_name).items())
+            lines.append(f"{model_name}: {latency}")
+        return "\n".join(lines)
+
+
+def replay(
+        recording: TrafficRecording,
+        server,
+        speed: float = 1.0,
+        concurrency: int = 8,
+        binary_data: bool = True,
+) -> ReplayReport:
+    """
+    Replay recorded requests against `server` (e.g. TritonContainer) keeping
+    recorded inter-arrival times scaled by `speed`.
+
+    `send_lag` in report shows how late requests were sent comparing to schedule,
+    growing lag means that `concurrency` is not sufficient to keep the rate.
+    """
+    import tritonclient.http as tritonhttpclient
+
+    local = threading.local()
+    count = len(recording)
+    scheduled = np.zeros(count)
+    send_lag = np.zeros(count)
+    latency = np.zeros(count)
+    errors: list[str | None] = [None] * count
+    models: list[str] = [""] * count
+
+    def send(index: int, request: RecordedRequest, start: float) -> None:
+        if not hasattr(local, "client"):
+            local.client = server.get_client()
+
+        inputs = []
+        for name, array in request.inputs.items():
+            infer_input = tritonhttpclient.InferInput(name, list(array.shape), np_to_triton_dtype(array.dtype))
+            infer_input.set_data_from_numpy(np.asarray(array), binary_data=binary_data)
+            inputs.append(infer_input)
+
+        outputs = None
+        if request.outputs is not None:
+            outputs = [tritonhttpclient.InferRequestedOutput(name, binary_data=binary_data)
+                       for name in request.outputs]
+
+        sent = time.perf_counter()
+        send_lag[index] = max(0.0, sent - start - scheduled[index])
+        try:
+            local.client.infer(request.model_name, inputs, model_version=request.model_version, outputs=outputs)
+        except Exception as error:
+            errors[index] = str(error)
+        latency[index] = time.perf_counter() - sent
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        start = time.perf_counter()
+        futures = []
+        for index, request in enumerate(recording):
+            scheduled[index] = request.arrival / speed
+            models[index] = request.model_name
+
+            delay = start + scheduled[index] - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+            futures.append(executor.submit(send, index, request, start))
+
+        for future in futures:
+            future.result()
+
+        duration = time.perf_counter() - start
+
+    return ReplayReport(
+        models=models,
+        scheduled=scheduled,
+        send_lag=send_lag,
+        latency=latency,
+        errors=errors,
+        duration=duration,
+        speed=speed,
+    )
@@ -1,15 +1,36 @@
-from typing import TypedDict, Literal
+import io
+import os
+import re
+import shutil
+import socket
+import tarfile
+import itertools
+import pathlib
+import posixpath
+from typing import Iterable, TypedDict, Literal, TYPE_CHECKING
 from typing_extensions import NotRequired
 
 import docker.types
-import geventhttpclient
-
-import tritonclient.http as tritonhttpclient
+import docker.errors
 
 from testcontainers.core.container import DockerContainer
+from testcontainers.core.config import testcontainers_config
 from testcontainers.core.waiting_utils import wait_container_is_ready
 
 from .command import TritonCommand
+from .logs import LogFollower
+from .stats import StatisticsProfiler
+from .monitor import ResourceMonitor
+from .readiness import ModelReadiness
+from .watcher import RepositoryWatcher
+from .reset import ServerState, capture_state, reset_server
+from .client import ModelLoader, LazyLoadingClient
+from .docker_session import get_docker_client
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    import tritonclient.http as tritonhttpclient
 
 TRITON_HTTP_PORT = 8000
 TRITON_GRPC_PORT = 8001
@@ -26,6 +47,139 @@ class VolumeMapping(TypedDict):
     mode: NotRequired[str]
 
 
+class ResourceLimits(TypedDict, total=False):
+    shm_size: str | int
+    ulimits: dict[str, int | tuple[int, int]]
+    cpuset_cpus: str
+    mem_limit: str | int
+    memswap_limit: str | int
+    ipc_mode: str
+
+
+ResourcePreset = Literal["ci-small", "benchmark-pinned"]
+
+# Settings recommended by Nvidia for running tritonserver
+# (`--shm-size=1g --ulimit memlock=-1 --ulimit stack=67108864`),
+# scaled down for shared CI runners or pinned for benchmarking.
+# Pinned presets get `cpuset_cpus` of CPUs the calling process may run on,
+# so that runs pinned to different CPUs (e.g. with taskset) don't collide.
+RESOURCE_PRESETS: dict[str, ResourceLimits] = {
+    "ci-small": {
+        "shm_size": "256m",
+        "ulimits": {"memlock": -1, "stack": 67_108_864},
+        "mem_limit": "4g",
+        "memswap_limit": "4g",
+        "ipc_mode": "private",
+    },
+    "benchmark-pinned": {
+        "shm_size": "1g",
+        "ulimits": {"memlock": -1, "stack": 67_108_864},
+        "ipc_mode": "host",
+    },
+}
+
+PINNED_PRESETS = {"benchmark-pinned"}
+
+
+def format_cpuset(cpus: set[int]) -> str:
+    """
+    CPU list in format of `--cpuset-cpus`
+
+    >>> format_cpuset({0, 1, 2, 3, 6, 8, 9})
+    '0-3,6,8-9'
+    """
+    ranges: list[list[int]] = []
+    for cpu in sorted(cpus):
+        if ranges and ranges[-1][1] == cpu - 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(str(first) if first == last else f"{first}-{last}" for first, last in ranges)
+
+
+def affinity_cpuset() -> str | None:
+    """CPUs the calling process may run on, None where affinity is not available (e.g. macOS)"""
+    if not hasattr(os, "sched_getaffinity"):
+        return None
+    return format_cpuset(os.sched_getaffinity(0))
+
+
+def resolve_resource_limits(preset: ResourcePreset | None = None, **overrides) -> ResourceLimits:
+    """
+    Merge limits of named preset with explicitly given limits.
+    Explicit limits that are not None take precedence over preset ones.
+    """
+    if preset is not None and preset not in RESOURCE_PRESETS:
+        raise ValueError(f"Unknown resource preset {preset}")
+
+    limits: ResourceLimits = dict(RESOURCE_PRESETS[preset]) if preset else {}
+
+    for key, value in overrides.items():
+        if key not in ResourceLimits.__annotations__:
+            raise TypeError(f"Unsupported resource limit {key}")
+        if value is not None:
+            limits[key] = value
+
+    # without swap limit docker allows to use twice as much memory
+    if overrides.get("mem_limit") is not None and overrides.get("memswap_limit") is None:
+        limits["memswap_limit"] = overrides["mem_limit"]
+
+    if preset in PINNED_PRESETS and "cpuset_cpus" not in limits:
+        cpuset = affinity_cpuset()
+        if cpuset is not None:
+            limits["cpuset_cpus"] = cpuset
+
+    return limits
+
+
+def find_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("", 0))
+        return sock.getsockname()[1]
+
+
+def assign_ports(command: str | TritonCommand, ports: dict[int, int]) -> str:
+    """
+    Make tritonserver listen on given host ports instead of default ones
+
+    >>> assign_ports("tritonserver --model-repository=/home", {8000: 1, 8001: 2, 8002: 3})
+    'tritonserver --model-repository=/home --http-port=1 --grpc-port=2 --metrics-port=3'
+    """
+    fields = {
+        "http_port": ports[TRITON_HTTP_PORT],
+        "grpc_port": ports[TRITON_GRPC_PORT],
+        "metrics_port": ports[TRITON_METRICS_PORT],
+    }
+
+    if isinstance(command, TritonCommand):
+        return command.model_copy(update=fields).build()
+
+    options = " ".join(f"--{name.replace('_', '-')}={value}" for name, value in fields.items())
+    return f"{command} {options}"
+
+
+class _ChunkStream(io.RawIOBase):
+    """Readable file over iterable of byte chunks, e.g. response of `get_archive`"""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = chunk
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
 class TritonContainer(DockerContainer):
     """
     Triton Container
@@ -38,15 +192,67 @@ class TritonContainer(DockerContainer):
             name: str = "tritonserver",
             with_gpus: bool = True,
             volume_mapping: list[VolumeMapping] | None = None,
-            command: str = DEFAULT_TRITON_CONTAINER_COMMAND,
+            command: str | TritonCommand = DEFAULT_TRITON_CONTAINER_COMMAND,
+            host_network: bool = False,
+            preset: ResourcePreset | None = None,
+            shm_size: str | int | None = None,
+            ulimits: dict[str, int | tuple[int, int]] | None = None,
+            cpuset_cpus: str | None = None,
+            mem_limit: str | int | None = None,
+            memswap_limit: str | int | None = None,
+            ipc_mode: str | None = None,
+            log_follower: LogFollower | None = None,
+            trace_output: str | None = None,
+            memory_budget: int | None = None,
             **kwargs
     ) -> None:
         image = f"{repository}:{tag}"
 
+        # process-wide docker client is reused unless `docker_client_kw` is given,
+        # known api version keeps throwaway client of base class from querying daemon
+        self._shared_docker = not kwargs.get("docker_client_kw")
+        if self._shared_docker:
+            shared_docker = get_docker_client()
+            kwargs["docker_client_kw"] = {"version": shared_docker.client.api.api_version}
+
         super().__init__(image, **kwargs)
-        self.with_exposed_ports(TRITON_HTTP_PORT, TRITON_GRPC_PORT, TRITON_METRICS_PORT)
+
+        if self._shared_docker:
+            self._docker = shared_docker
+
+        # host networking bypasses docker-proxy, tritonserver listens on free host ports directly
+        self.host_network = host_network
+        self._host_ports: dict[int, int] = {}
+
+        if host_network:
+            self._host_ports = {
+                port: find_free_port() for port in (TRITON_HTTP_PORT, TRITON_GRPC_PORT, TRITON_METRICS_PORT)
+            }
+            command = assign_ports(command, self._host_ports)
+            self._update_kwargs(network_mode="host")
+        else:
+            self.with_exposed_ports(TRITON_HTTP_PORT, TRITON_GRPC_PORT, TRITON_METRICS_PORT)
+
+        if isinstance(command, TritonCommand):
+            command = command.build()
+
         self.with_command(command)
         self.with_name(name)
+        self.log_follower = log_follower
+        # lazy clients share loader, with budget least recently used models are unloaded
+        self.model_loader = ModelLoader(
+            memory_budget=memory_budget,
+            memory_probe=self.memory_usage if memory_budget is not None else None,
+        )
+
+        # trace file is copied from container to `trace_output` directory on stop
+        trace_file = re.search(r"--trace-config triton,file=(\S+)", command)
+        self.trace_file = trace_file.group(1) if trace_file else None
+        self.trace_output = trace_output
+        self.trace_files: list[pathlib.Path] = []
+        self.model_readiness: ModelReadiness | None = None
+        self.initial_state: ServerState | None = None
+        self._wait_for_models: list[str] = []
 
         if volume_mapping:
             for mapping in volume_mapping:
@@ -57,10 +263,51 @@ class TritonContainer(DockerContainer):
                 )
 
         if with_gpus:
-            self.with_kwargs(
+            self._update_kwargs(
                 device_requests=[docker.types.DeviceRequest(count=-1, capabilities=[["gpu"]])]
             )
 
+        self.resource_limits = resolve_resource_limits(
+            preset,
+            shm_size=shm_size,
+            ulimits=ulimits,
+            cpuset_cpus=cpuset_cpus,
+            mem_limit=mem_limit,
+            memswap_limit=memswap_limit,
+            ipc_mode=ipc_mode,
+        )
+        self.with_resource_limits(self.resource_limits)
+
+    def _update_kwargs(self, **kwargs) -> None:
+        # `with_kwargs` of base class replaces all keyword arguments of container run
+        self._kwargs.update(kwargs)
+
+    def with_resource_limits(self, limits: ResourceLimits) -> "TritonContainer":
+        if not limits:
+            return self
+
+        kwargs = dict(limits)
+
+        if "ulimits" in kwargs:
+            ulimits = []
+            for name, value in kwargs["ulimits"].items():
+                soft, hard = value if isinstance(value, tuple) else (value, value)
+                ulimits.append(docker.types.Ulimit(name=name, soft=soft, hard=hard))
+            kwargs["ulimits"] = ulimits
+
+        self._update_kwargs(**kwargs)
+        return self
+
+    def get_container_host_ip(self) -> str:
+        if self.host_network:
+            return self.get_docker_client().host()
+        return super().get_container_host_ip()
+
+    def get_exposed_port(self, port: int) -> int:
+        if self.host_network:
+            return self._host_ports[port]
+        return super().get_exposed_port(port)
+
     def get_url(self, port_name: Literal["http"] | Literal["grpc"] | Literal["metrics"] = "http") -> str:
 
         match port_name:
@@ -75,26 +322,225 @@ class TritonContainer(DockerContainer):
 
         return f"{self.get_container_host_ip()}:{self.get_exposed_port(port)}"
 
-    def get_client(self) -> tritonhttpclient.InferenceServerClient:
+    def get_client(
+            self, lazy_loading: bool = False, **kwargs
+    ) -> "tritonhttpclient.InferenceServerClient | LazyLoadingClient":
+        """
+        Http client of the server, with `lazy_loading` models are loaded on first inference.
+        `kwargs` are passed to client, e.g. `concurrency` for `async_infer`
+        """
+        # tritonclient pulls gevent, import is deferred until client is requested
+        import tritonclient.http as tritonhttpclient
 
         triton_host = self.get_container_host_ip()
         triton_http_port = self.get_exposed_port(TRITON_HTTP_PORT)
 
         triton_url = f"{triton_host}:{triton_http_port}"
 
-        return tritonhttpclient.InferenceServerClient(
+        client = tritonhttpclient.InferenceServerClient(
             url=triton_url,
             verbose=False,
+            **kwargs,
         )
 
-    @wait_container_is_ready(tritonhttpclient.InferenceServerException,
-                             geventhttpclient.response.HTTPConnectionClosed)
-    def readiness_probe(self):
-        triton_client = self.get_client()
-        if not triton_client.is_server_ready():
-            raise tritonhttpclient.InferenceServerException("Server not ready yet.")
+        if lazy_loading:
+            return LazyLoadingClient(client, self.model_loader)
+
+        return client
+
+    def container_stats(self) -> dict:
+        """Single sample of docker stats of the container"""
+        api = self.get_docker_client().client.api
+        return api.stats(self.get_container_id(), stream=False, one_shot=True)
+
+    def memory_usage(self) -> int:
+        """Memory used by container in bytes, page cache is excluded as in `docker stats`"""
+        memory = self.container_stats()["memory_stats"]
+        stats = memory.get("stats", {})
+        cache = stats.get("inactive_file", stats.get("total_inactive_file", 0))
+        return memory.get("usage", 0) - cache
+
+    def resource_monitor(self, interval: float = 0.5) -> ResourceMonitor:
+        """Docker stats time series of the container sampled every `interval` seconds within `with` block"""
+        return ResourceMonitor(self.container_stats, interval)
+
+    def watch_repository(self, repository: str | None = None, **kwargs) -> RepositoryWatcher:
+        """
+        Reload models whose files change in host `repository` within `with` block,
+        defaults to the only mapped volume. Server has to run in explicit model control mode.
+        """
+        if repository is None:
+            if len(self.volumes) != 1:
+                raise ValueError("repository is required when number of mapped volumes is not one")
+            repository = next(iter(self.volumes))
+        return RepositoryWatcher(self.get_client, repository, **kwargs)
+
+    def profile(self, models: list[str] | None = None) -> StatisticsProfiler:
+        """Statistics deltas of `models` (all when None) within `with` block"""
+        return StatisticsProfiler(self.get_client(), models)
+
+    def readiness_probe(self, live: bool = False):
+        """Wait until server is ready, or only live (accepts requests) with `live`"""
+        import geventhttpclient
+        import tritonclient.http as tritonhttpclient
 
-    def start(self) -> "TritonContainer":
+        @wait_container_is_ready(tritonhttpclient.InferenceServerException,
+                                 geventhttpclient.response.HTTPConnectionClosed)
+        def probe():
+            triton_client = self.get_client()
+            ready = triton_client.is_server_live() if live else triton_client.is_server_ready()
+            if not ready:
+                raise tritonhttpclient.InferenceServerException("Server not ready yet.")
+
+        probe()
+
+    def start(
+            self, wait_for_models: list[str] | None = None, min_ready: int | None = None
+    ) -> "TritonContainer":
+        """
+        Start container and wait until server is ready. With `wait_for_models`
+        server is only required to be live, readiness of each model is watched
+        at the same time and start returns once `min_ready` of them (all by
+        default) are ready, others keep loading, see `wait_for_model`.
+        """
         super().start()
-        self.readiness_probe()
+        if self.log_follower is not None:
+            self.log_follower.attach(self)
+
+        self.initial_state = None
+        self._wait_for_models = list(wait_for_models or [])
+        if not wait_for_models:
+            self.readiness_probe()
+            return self
+
+        self.readiness_probe(live=True)
+        self.model_readiness = ModelReadiness(
+            self.get_client, wait_for_models, timeout=testcontainers_config.timeout
+        ).start()
+        self.model_readiness.wait(min_ready)
         return self
+
+    def capture_state(self) -> ServerState:
+        """
+        Capture state `reset` returns to. Called by first `reset`, call it
+        right after start when tests before the first reset change server.
+        """
+        import tritonclient.http as tritonhttpclient
+
+        try:
+            state = capture_state(self.get_client())
+        except tritonhttpclient.InferenceServerException as error:
+            raise RuntimeError(f"Server state can't be captured for reset: {error}") from error
+        # models still loading are part of the state reset returns to
+        state.models.extend(model for model in self._wait_for_models if model not in state.models)
+        self.initial_state = state
+        return state
+
+    def reset(self, models: list[str] | None = None, timeout: float | None = None) -> list[str]:
+        """
+        Return server to the state right after start without restarting the
+        container: all models are unloaded, shared memory registrations are
+        cleared, trace and log settings are restored and `models` (models
+        loaded at start by default) are loaded. Server has to run in explicit
+        model control mode. Returns loaded models. State after start is
+        captured on first reset, see `capture_state`.
+        """
+        if self._container is None:
+            raise RuntimeError("Container is not started")
+        if self.initial_state is None:
+            self.capture_state()
+
+        if self.model_readiness is not None:
+            self.model_readiness.stop()
+
+        loaded = reset_server(self.get_client(), self.initial_state, models,
+                              timeout=testcontainers_config.timeout if timeout is None else timeout)
+        self.model_loader.clear()
+        return loaded
+
+    @property
+    def model_futures(self) -> "dict[str, Future]":
+        """Future of each model of `start(wait_for_models=...)`, resolved when model is ready"""
+        return self.model_readiness.futures if self.model_readiness is not None else {}
+
+    def wait_for_model(self, model_name: str, timeout: float | None = None) -> None:
+        """Block until model of `start(wait_for_models=...)` is ready"""
+        self.model_futures[model_name].result(timeout)
+
+    def collect_traces(self, destination: str) -> list[pathlib.Path]:
+        """
+        Copy trace file(s) from container, files written with `log_frequency`
+        are suffixed with index (`trace.json.0`, `trace.json.1`, ...), they are
+        copied one by one until index that does not exist.
+        """
+        if self.trace_file is None:
+            raise ValueError("Trace file is not configured, set `trace_config.file` of TritonCommand")
+
+        destination = pathlib.Path(destination)
+        destination.mkdir(parents=True, exist_ok=True)
+
+        collected = []
+        for path in itertools.chain([self.trace_file], (f"{self.trace_file}.{index}" for index in itertools.count())):
+            try:
+                collected.extend(self._copy_file(path, destination))
+            except docker.errors.NotFound:
+                if path != self.trace_file:
+                    break
+
+        self.trace_files = collected
+        return collected
+
+    def _copy_file(self, path: str, destination: pathlib.Path) -> list[pathlib.Path]:
+        """Copy single file from container, tar archive of it is streamed rather than buffered"""
+        bits, _ = self.get_wrapped_container().get_archive(path)
+
+        copied = []
+        with tarfile.open(fileobj=_ChunkStream(bits), mode="r|") as archive:
+            for member in archive:
+                if member.isfile():
+                    copied_path = destination / posixpath.basename(member.name)
+                    with copied_path.open("wb") as file:
+                        shutil.copyfileobj(archive.extractfile(member), file)
+                    copied.append(copied_path)
+        return copied
+
+    def _before_remove(self) -> None:
+        if self.model_readiness is not None:
+            self.model_readiness.stop()
+
+        if self.trace_output and self.trace_file and self._container:
+            # graceful stop lets tritonserver flush traces before they are copied
+            self._container.stop()
+            self.collect_traces(self.trace_output)
+
+    def release(self) -> None:
+        """
+        Run side effects of `stop` (readiness polling, trace collection, log
+        follower) but leave removal of container to the caller, e.g. background
+        reaper of TeardownManager. Container is forgotten afterwards.
+        """
+        try:
+            self._before_remove()
+        finally:
+            self._container = None
+            if not self._shared_docker:
+                self.get_docker_client().client.close()
+            if self.log_follower is not None:
+                # log stream ends only when container is removed, it is not waited for
+                self.log_follower.stop(timeout=0)
+
+    def stop(self, force: bool = True, delete_volume: bool = True) -> None:
+        try:
+            self._before_remove()
+        finally:
+            # container is removed even when traces can't be collected, collection error is raised afterwards
+            try:
+                if self._shared_docker:
+                    # shared client stays open for other containers and builders
+                    if self._container:
+                        self._container.remove(force=force, v=delete_volume)
+                else:
+                    super().stop(force, delete_volume)
+            finally:
+                if self.log_follower is not None:
+                    self.log_follower.stop()
@@ -0,0 +1,284 @@
+"""
+This module contains the class RepositoryWatcher that watches host directory
+of model repository mapped into container and reloads only changed models
+through repository API, for servers started in explicit model control mode.
+
+Changes are read with inotify (through ctypes) on Linux, repository is
+polled for modification times elsewhere.
+"""
+import os
+import time
+import ctypes
+import struct
+import select
+import logging
+import pathlib
+import threading
+from typing import Callable, Literal
+from dataclasses import dataclass
+
+logger = logging.getLogger("triton_testcontainer")
+
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (_IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+               | _IN_DELETE_SELF | _IN_MOVE_SELF)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Recursive inotify watch of directory tree, raises OSError where inotify is not available"""
+
+    def __init__(self, root: pathlib.Path) -> None:
+        try:
+            self._libc = ctypes.CDLL(None, use_errno=True)
+            self._libc.inotify_init1.argtypes = [ctypes.c_int]
+            self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        except (OSError, AttributeError) as error:
+            raise OSError(f"inotify is not available: {error}") from error
+
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._paths: dict[int, pathlib.Path] = {}
+        self.add_tree(root)
+
+    def add_tree(self, root: pathlib.Path) -> None:
+        for directory, _, _ in os.walk(root):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+            if wd >= 0:
+                self._paths[wd] = pathlib.Path(directory)
+
+    def read(self, timeout: float) -> list[pathlib.Path] | None:
+        """Changed paths, None when events were lost and everything has to be rescanned"""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+
+        try:
+            buffer = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        changed, offset = [], 0
+        while offset < len(buffer):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+            name = buffer[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length].rstrip(b"\0")
+            offset += _EVENT_HEADER.size + length
+
+            if mask & _IN_Q_OVERFLOW:
+                return None
+            if mask & _IN_IGNORED:
+                self._paths.pop(wd, None)
+                continue
+
+            directory = self._paths.get(wd)
+            if directory is None:
+                continue
+            path = directory / os.fsdecode(name) if name else directory
+            if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                # inotify is not recursive, new directories are watched as they appear
+                self.add_tree(path)
+            changed.append(path)
+
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def _changed(previous: dict[str, tuple[int, int]], current: dict[str, tuple[int, int]]) -> list[str]:
+    """
+    Paths added, removed or modified between two snapshots
+
+    >>> _changed({"a/1": (1, 1), "b/1": (1, 1)}, {"a/1": (2, 1), "c/1": (1, 1), "b/1": (1, 1)})
+    ['a/1', 'c/1']
+    """
+    return sorted(set(previous) ^ set(current) | {path for path in previous.keys() & current.keys()
+                                                  if previous[path] != current[path]})
+
+
+def _snapshot(root: pathlib.Path) -> dict[str, tuple[int, int]]:
+    snapshot = {}
+    for directory, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            snapshot[os.path.relpath(path, root)] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+@dataclass
+class ReloadEvent:
+    """Reload of model: `latency` is duration of repository API call, `delay` is from first change to reload done"""
+    model: str
+    action: Literal["load", "unload"]
+    changed_at: float
+    latency: float
+    delay: float
+    error: str | None = None
+
+
+class RepositoryWatcher:
+    """
+    Watch host directory of model repository, changes are debounced for
+    `debounce` seconds of quiet and mapped to model directories, changed
+    models are (re)loaded, removed ones unloaded. Each thread uses its own
+    client from `client_factory`, as in `readiness.ModelReadiness`.
+
+    Example:
+        with triton.watch_repository() as watcher:
+            edit_model()
+            watcher.wait_for_reload("simple")
+        print(watcher.reloads)
+    """
+
+    def __init__(
+            self,
+            client_factory: Callable[[], object],
+            repository: str | pathlib.Path,
+            debounce: float = 0.2,
+            poll_interval: float = 0.5,
+            use_inotify: bool = True,
+            on_reload: Callable[[ReloadEvent], None] | None = None,
+    ) -> None:
+        self.client_factory = client_factory
+        self.repository = pathlib.Path(repository).resolve()
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.on_reload = on_reload
+        self.reloads: list[ReloadEvent] = []
+        self.inotify = False
+        self._models = {path.name for path in self.repository.iterdir() if path.is_dir()}
+        # model -> (first change, last change)
+        self._pending: dict[str, tuple[float, float]] = {}
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "RepositoryWatcher":
+        self._stop.clear()
+        inotify = None
+        if self.use_inotify:
+            try:
+                inotify = _Inotify(self.repository)
+            except OSError as error:
+                logger.info(f"Repository watcher falls back to polling: {error}")
+        self.inotify = inotify is not None
+
+        # taken before start returns, so that changes made right after it are not missed
+        snapshot = _snapshot(self.repository)
+        self._thread = threading.Thread(target=self._run, args=(inotify, snapshot), name="repository-watcher",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "RepositoryWatcher":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def _model_of(self, path: pathlib.Path | str) -> str | None:
+        path = pathlib.Path(path)
+        parts = (path.relative_to(self.repository) if path.is_absolute() else path).parts
+        return parts[0] if parts else None
+
+    def _mark(self, models: set[str]) -> None:
+        now = time.monotonic()
+        for model in models:
+            first, _ = self._pending.get(model, (now, now))
+            self._pending[model] = (first, now)
+
+    def _run(self, inotify: _Inotify | None, snapshot: dict[str, tuple[int, int]]) -> None:
+        client = self.client_factory()
+
+        try:
+            while not self._stop.is_set():
+                timeout = min(self.debounce if self._pending else self.poll_interval, self.poll_interval)
+                if inotify is not None:
+                    changed = inotify.read(timeout)
+                else:
+                    self._stop.wait(timeout)
+                    changed = None
+
+                if changed is None:
+                    # polling, or inotify event queue overflowed and events are lost
+                    current = _snapshot(self.repository)
+                    changed = _changed(snapshot, current)
+                    snapshot = current
+
+                self._mark({model for model in map(self._model_of, changed) if model})
+                self._flush(client)
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def _flush(self, client) -> None:
+        now = time.monotonic()
+        ready = [model for model, (_, last) in self._pending.items() if now - last >= self.debounce]
+
+        for model in ready:
+            first, _ = self._pending.pop(model)
+            if (self.repository / model).is_dir():
+                action = "load"
+                self._models.add(model)
+            elif model in self._models:
+                action = "unload"
+                self._models.discard(model)
+            else:
+                # file in repository root, not a model
+                continue
+
+            started, error = time.monotonic(), None
+            try:
+                if action == "load":
+                    client.load_model(model)
+                else:
+                    client.unload_model(model)
+            except Exception as exception:
+                error = str(exception)
+            finished = time.monotonic()
+
+            event = ReloadEvent(model=model, action=action, changed_at=first, latency=finished - started,
+                                delay=finished - first, error=error)
+            with self._condition:
+                self.reloads.append(event)
+                self._condition.notify_all()
+            if self.on_reload is not None:
+                self.on_reload(event)
+
+    def wait_for_reload(self, model: str, timeout: float | None = None, after: int = 0) -> ReloadEvent:
+        """Block until reload of `model` with index in `reloads` not less than `after`"""
+        def find() -> ReloadEvent | None:
+            return next((event for event in self.reloads[after:] if event.model == model), None)
+
+        with self._condition:
+            if not self._condition.wait_for(lambda: find() is not None, timeout):
+                raise TimeoutError(f"Model {model} was not reloaded")
+            return find()